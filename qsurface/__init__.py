@@ -4,5 +4,12 @@ from . import errors
 from . import plot
 from . import main
 from . import threshold
+from . import pipeline
+from . import lattice
+from . import distributed
+from . import compare
+from . import importance
+from . import records
+from . import datasets
 
 __version__ = "0.1.5"
@@ -1,5 +1,6 @@
 from qsurface.main import BenchmarkDecoder, run, run_multiprocess, initialize
-from qsurface.threshold import run_many, ThresholdFit, read_csv
+from qsurface.threshold import run_many, run_adaptive, ThresholdFit, read_csv
+from qsurface.distributed import Coordinator, run_workers
 from collections import defaultdict
 import argparse
 import sys
@@ -25,6 +26,14 @@ def _get_kwargs(parsed_args, arg_group):
     return {arg[1][2:]: parsed_args.get(arg[1][2:]) for arg in arg_group}
 
 
+def _parse_address(address):
+    """
+    helper function to parse an address host:port to a tuple
+    """
+    host, port = address.rsplit(":", 1)
+    return host, int(port)
+
+
 def cli(args):
 
     parser = argparse.ArgumentParser(
@@ -93,6 +102,22 @@ def cli(args):
             "number of threads (defaults to available # logical cores) - int",
             dict(type=int, default=1),
         ],
+        [
+            "-tf",
+            "--target_failures",
+            "store",
+            "stop after number of logical errors, iterations is the maximum - int",
+            dict(type=int),
+        ],
+        [
+            "-ci",
+            "--ci_width",
+            "store",
+            "stop if confidence interval of success rate is narrower, iterations is the maximum - float",
+            dict(type=float),
+        ],
+        ["-ck", "--checkpoint", "store", "checkpoint file to save and resume the simulation", dict(type=str)],
+        ["-rc", "--records", "store", "file to append the per-shot records to", dict(type=str)],
     ]
     error_arguments = [
         ["-px", "--p_bitflip", "store", "Bitflip rate - float {0,1}", dict(type=float, default=0)],
@@ -168,6 +193,25 @@ def cli(args):
             "number of multiprocessing threads",
             dict(type=int, default=1),
         ],
+        [
+            "-co",
+            "--coordinator",
+            "store",
+            "serve simulations to worker agents at address host:port",
+            dict(type=str),
+        ],
+        ["-k", "--authkey", "store", "key to authenticate worker agents, required for non-loopback hosts", dict(type=str)],
+        ["-ck", "--checkpoint", "store", "checkpoint file to save and resume the series", dict(type=str)],
+        ["-st", "--store", "store", "directory of stored results to reuse and top up", dict(type=str)],
+        ["-cp", "--coupled", "store_true", "couple the samples of all error rates by a shared seed", dict()],
+        ["-s", "--seed", "store", "seed from which the seeds of coupled sizes are derived - int", dict(type=int)],
+        [
+            "-ad",
+            "--adaptive",
+            "store",
+            "rounds of adaptive search for the threshold between the two rates of a single error",
+            dict(type=int),
+        ],
         ["-fc", "--fit_column", "store", "fit threshold of column", dict(type=str)],
         ["-pc", "--plot_column", "store", "plot threshold of column", dict(type=str)],
         [
@@ -216,6 +260,22 @@ def cli(args):
     thres_bench_parser = thres_sub_parsers.add_parser("benchmark", help="do benchmark")
     _add_kwargs(thres_bench_parser, benchmark_arguments)
 
+    ### Worker
+
+    worker_parser = subparsers.add_parser("worker", help="run worker agents of a threshold coordinator")
+    worker_arguments = [
+        ["-a", "--address", "store", "address of the coordinator host:port", dict(type=str, required=True)],
+        [
+            "-mp",
+            "--processes",
+            "store",
+            "number of agents (defaults to available # logical cores) - int",
+            dict(type=int),
+        ],
+        ["-k", "--authkey", "store", "key to authenticate with the coordinator, required for non-loopback hosts", dict(type=str)],
+    ]
+    _add_kwargs(worker_parser, worker_arguments, "worker", "arguments for worker agents")
+
     ###
 
     parsed_args = vars(parser.parse_args(args))
@@ -248,6 +308,9 @@ def cli(args):
         fit_column = init_kwargs.pop("fit_column")
         plot_column = init_kwargs.pop("plot_column")
         file = init_kwargs.pop("input")
+        coordinator = init_kwargs.pop("coordinator")
+        authkey = init_kwargs.pop("authkey")
+        adaptive = init_kwargs.pop("adaptive")
 
         if file:
             data = read_csv(file)
@@ -269,13 +332,44 @@ def cli(args):
             else:
                 methods_to_benchmark = {}
 
-            data = run_many(
-                init_kwargs.pop("Code"),
-                init_kwargs.pop("Decoder"),
-                error_rates=error_rates,
-                methods_to_benchmark=methods_to_benchmark,
-                **init_kwargs
-            )
+            pool = None
+            if coordinator:
+                pool = Coordinator(
+                    init_kwargs["Code"],
+                    init_kwargs["Decoder"],
+                    address=_parse_address(coordinator),
+                    authkey=authkey,
+                    enabled_errors=init_kwargs["enabled_errors"],
+                    faulty_measurements=init_kwargs["faulty_measurements"],
+                )
+                print(f"Waiting for worker agents at {coordinator}.")
+
+            if adaptive:
+                if len(error_lists) != 1 or len(iterated_lists) != 2:
+                    raise ValueError("Adaptive search requires the lowest and highest rate of a single error.")
+                (rate, bracket), = error_lists.items()
+                data, _ = run_adaptive(
+                    init_kwargs.pop("Code"),
+                    init_kwargs.pop("Decoder"),
+                    rate=rate,
+                    bracket=tuple(bracket),
+                    rounds=adaptive,
+                    methods_to_benchmark=methods_to_benchmark,
+                    pool=pool,
+                    **init_kwargs
+                )
+            else:
+                data = run_many(
+                    init_kwargs.pop("Code"),
+                    init_kwargs.pop("Decoder"),
+                    error_rates=error_rates,
+                    methods_to_benchmark=methods_to_benchmark,
+                    pool=pool,
+                    **init_kwargs
+                )
+
+            if pool is not None:
+                pool.close()
 
         print(data)
 
@@ -286,6 +380,11 @@ def cli(args):
             if plot_column:
                 fitter.plot_data(data, plot_column)
 
+    elif parsed_args["sub"] == "worker":
+
+        worker_kwargs = _get_kwargs(parsed_args, worker_arguments)
+        run_workers(_parse_address(worker_kwargs.pop("address")), **worker_kwargs)
+
 
 if __name__ == "__main__":
 
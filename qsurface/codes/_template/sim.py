@@ -5,6 +5,7 @@ from ...errors._template import Sim as Error
 from typing import Any, List, Optional, Union, Tuple
 from collections import defaultdict
 import importlib
+import numpy
 
 
 class PerfectMeasurements(ABC):
@@ -18,6 +19,8 @@ class PerfectMeasurements(ABC):
     ----------
     size : int or tuple
         Size of the surface code in single dimension or two dimensions ``(x,y)``.
+    seed : int or `~numpy.random.SeedSequence`, optional
+        Seed for the random number generator ``self.rng``.
 
     Attributes
     ----------
@@ -46,7 +49,13 @@ class PerfectMeasurements(ABC):
         Property for whether all ancillas are trivial. Usefull for checking if decoding has been successfull.
 
     instance : float
-        Time stamp that is renewed every time `random_errors` is called. Helps with identifying a 'round' of simulation when using class attributes.
+        Time stamp that is renewed every time `random_errors` is called. Helps with identifying a 'round' of simulation when using class attributes. For faulty measurements, the time stamp is renewed only at the first layer, such that all layers of a round share the same instance.
+
+    error_rates : dict
+        Overriding error rates of the last call to `random_errors`. Used by decoders to derive edge weights with `edge_probability`.
+
+    rng : `~numpy.random.Generator`
+        Random number generator for all errors, measurements and random initial states of the qubits of the code. Replaced by `~.main.run` for every iteration of a simulation.
     """
 
     _DataQubit = DataQubit
@@ -61,8 +70,10 @@ class PerfectMeasurements(ABC):
     def __init__(
         self,
         size: Union[int, Tuple[int, int]],
+        seed: Optional[Union[int, numpy.random.SeedSequence]] = None,
         **kwargs,
     ):
+        self.rng = numpy.random.default_rng(seed)
         self.layer = 0
         self.layers = 1
         self.decode_layer = 0
@@ -74,6 +85,7 @@ class PerfectMeasurements(ABC):
         self.errors = {}
         self.logical_operators = {}
         self.instance = time.time()
+        self.error_rates = {}
 
     @property
     def logical_state(self) -> Tuple[List[bool], bool]:
@@ -190,8 +202,8 @@ class PerfectMeasurements(ABC):
             Initial state for the data-qubit.
         """
         data_qubit = self._DataQubit(loc, z, **kwargs)
-        data_qubit.edges["x"] = self._Edge(data_qubit, "x", initial_state=initial_states[0], **kwargs)
-        data_qubit.edges["z"] = self._Edge(data_qubit, "z", initial_state=initial_states[1], **kwargs)
+        data_qubit.edges["x"] = self._Edge(data_qubit, "x", initial_state=initial_states[0], rng=self.rng, **kwargs)
+        data_qubit.edges["z"] = self._Edge(data_qubit, "z", initial_state=initial_states[1], rng=self.rng, **kwargs)
         self.data_qubits[z][loc] = data_qubit
         return data_qubit
 
@@ -264,7 +276,9 @@ class PerfectMeasurements(ABC):
             Measure ancilla qubits after errors have been simulated.
 
         """
-        self.instance = time.time()
+        if self.layer == 0:
+            self.instance = time.time()
+            self.error_rates = dict(kwargs)
         ordered_errors = [self.errors[name] for name in apply_order] if apply_order else self.errors.values()
         for error_class in ordered_errors:
             for qubit in self.data_qubits[self.layer].values():
@@ -273,6 +287,22 @@ class PerfectMeasurements(ABC):
             for ancilla in self.ancilla_qubits[self.layer].values():
                 ancilla.measure()
 
+    def edge_probability(self, edge: Edge, **kwargs) -> float:
+        """Returns the probability that the state of ``edge`` is flipped during a round of errors.
+
+        The probabilities of all error modules loaded in ``self.errors`` are obtained by `~.errors._template.Sim.edge_probability` and combined as independent flips. Additionally, any error rate can be set by supplying the rate as a keyword argument e.g. ``p_bitflip = 0.1``, similar to `random_errors`.
+
+        Parameters
+        ----------
+        edge
+            Edge of the decoding graph.
+        """
+        probability = 0
+        for error_class in self.errors.values():
+            p_error = error_class.edge_probability(edge, **kwargs)
+            probability += p_error - 2 * probability * p_error
+        return probability
+
     @staticmethod
     def _parse_boundary_coordinates(size, *args: float) -> List[float]:
         """Parse two locations on the lattice.
@@ -416,6 +446,7 @@ class FaultyMeasurements(PerfectMeasurements):
         self.layer = self.layers - 1
         self.random_errors_layer(**kwargs)
         self.random_measure_layer()
+        self.error_rates.update(p_bitflip_plaq=p_bitflip_plaq, p_bitflip_star=p_bitflip_star)
 
     def random_errors_layer(self, **kwargs):
         """Applies a layer of random errors loaded in ``self.errors``.
@@ -441,5 +472,33 @@ class FaultyMeasurements(PerfectMeasurements):
         """
         for ancilla in self.ancilla_qubits[self.layer].values():
             previous_ancilla = self.ancilla_qubits[(ancilla.z - 1) % self.layers][ancilla.loc]
-            measured_state = ancilla.measure(**kwargs)
+            measured_state = ancilla.measure(rng=self.rng, **kwargs)
             ancilla.syndrome = measured_state != previous_ancilla.measured_state
+
+    def edge_probability(
+        self,
+        edge: Edge,
+        p_bitflip_plaq: Optional[float] = None,
+        p_bitflip_star: Optional[float] = None,
+        **kwargs,
+    ) -> float:
+        """Returns the probability that the state of ``edge`` is flipped during a round of errors.
+
+        A vertical `~.codes.elements.PseudoEdge` between two layers is flipped by a faulty measurement on the plaquette or star operator. See `.codes._template.sim.PerfectMeasurements.edge_probability` for all other edges.
+
+        Parameters
+        ----------
+        edge
+            Edge of the decoding graph.
+        p_bitflip_plaq : int or float, optional
+            Probability of a bitflip during a parity check measurement on plaquette operators (XXXX).
+        p_bitflip_star : int or float, optional
+            Probability of a bitflip during a parity check measurement on star operators (ZZZZ).
+        """
+        if edge.edge_type == "pseudo":
+            if p_bitflip_plaq is None:
+                p_bitflip_plaq = self.default_faulty_measurements["p_bitflip_plaq"]
+            if p_bitflip_star is None:
+                p_bitflip_star = self.default_faulty_measurements["p_bitflip_star"]
+            return p_bitflip_plaq if edge.state_type == "x" else p_bitflip_star
+        return super().edge_probability(edge, **kwargs)
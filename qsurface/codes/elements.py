@@ -1,9 +1,12 @@
 from abc import ABC
-import random
+import numpy
 from typing import Optional, Tuple, Union
 from collections import defaultdict
 
 
+default_rng = numpy.random.default_rng()
+
+
 class Qubit(ABC):
     """General type qubit object.
 
@@ -128,7 +131,13 @@ class AncillaQubit(Qubit):
     def state(self):
         return self.measure()
 
-    def measure(self, p_bitflip_plaq: float = 0, p_bitflip_star: float = 0, **kwargs) -> bool:
+    def measure(
+        self,
+        p_bitflip_plaq: float = 0,
+        p_bitflip_star: float = 0,
+        rng: Optional[numpy.random.Generator] = None,
+        **kwargs,
+    ) -> bool:
         """Applies a parity measurement on the ancilla.
 
         The functions loops over all the data qubits in ``self.parity_qubits``. For every edge associated with the entangled state on the data qubit, the value of a ``parity`` boolean is flipped.
@@ -139,6 +148,8 @@ class AncillaQubit(Qubit):
             Bitflip rate for plaquette (XXXX) operators.
         p_bitflip_star : float
             Bitflip rate for star (ZZZZ) operators.
+        rng : `~numpy.random.Generator`, optional
+            Random number generator for the measurement errors.
         """
         parity = False
         for data_qubit in self.parity_qubits.values():
@@ -146,7 +157,7 @@ class AncillaQubit(Qubit):
                 parity = not parity
 
         p_measure = p_bitflip_plaq if self.state_type == "x" else p_bitflip_star
-        self.measurement_error = p_measure != 0 and random.random() < p_measure
+        self.measurement_error = p_measure != 0 and (rng or default_rng).random() < p_measure
         if self.measurement_error:
             parity = not parity
 
@@ -169,6 +180,8 @@ class Edge(object):
         Error type associated with the current edge.
     initial_state
         State of the object after initialization.
+    rng
+        Random number generator for the random initial state if ``initial_state`` is not set.
 
     Attributes
     ----------
@@ -185,16 +198,17 @@ class Edge(object):
         qubit: DataQubit,
         state_type: str = "",
         initial_state: Optional[bool] = None,
+        rng: Optional[numpy.random.Generator] = None,
         **kwargs,
     ):
         # fixed parameters
         self.qubit = qubit
         self.state_type = state_type
         self._nodes = []
-        self.state = random.random() > 0.5 if initial_state is None else initial_state
+        self._reinitialize(initial_state, rng)
 
-    def _reinitialize(self, initial_state: Optional[bool] = None, **kwargs):
-        self.state = random.random() > 0.5 if initial_state is None else initial_state
+    def _reinitialize(self, initial_state: Optional[bool] = None, rng: Optional[numpy.random.Generator] = None, **kwargs):
+        self.state = (rng or default_rng).random() > 0.5 if initial_state is None else initial_state
 
     def __call__(self):
         return self.state
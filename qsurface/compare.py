@@ -0,0 +1,131 @@
+"""
+Paired comparisons of decoders with common random numbers. Instead of running separate simulations with independent errors for each decoder, `compare_decoders` samples the errors of every iteration once, and decodes the same syndrome with each decoder on its own copy of the lattice. The differences between the decoders are then only due to the decoders themselves, and are counted per iteration as paired outcomes, such that small differences in the success rates are detected with orders of magnitude fewer iterations than by comparing independent simulations.
+"""
+from __future__ import annotations
+from typing import List, Optional
+from itertools import combinations
+import timeit
+import numpy
+from scipy import stats
+from .main import initialize, iteration_rng, module_or_name, size_type, errors_type, seed_type
+from .pipeline import ShotLayout
+
+
+def compare_decoders(
+    size: size_type,
+    Code: module_or_name,
+    Decoders: List[module_or_name],
+    enabled_errors: errors_type = [],
+    faulty_measurements: bool = False,
+    error_rates: dict = {},
+    iterations: int = 1,
+    seed: Optional[seed_type] = None,
+    **kwargs,
+) -> dict:
+    """Compares decoders on identical errors.
+
+    A code is initialized for each decoder in ``Decoders`` with the same arguments, such that all codes share the same `.pipeline.ShotLayout`. For every iteration, the errors are applied once from the zero state of the first code with the stream `~.main.iteration_rng` of the iteration, and the resulting syndrome and erasures are loaded onto the code of each decoder and decoded. As the errors of each iteration are drawn exactly as in `~.main.run`, the number of successful iterations of each decoder is equal to the result of `~.main.run` with the same seed.
+
+    The paired outcomes of every pair of decoders ``A/B`` are counted as the number of iterations where both decoders fail, where only ``A`` fails, where only ``B`` fails, and where neither fails. Only the iterations where a single decoder fails carry information on the difference between the decoders, which is tested by the exact McNemar test, the two-sided binomial test of ``only_A`` out of ``only_A + only_B`` with probability 1/2.
+
+    Parameters
+    ----------
+    size
+        The size of the surface.
+    Code
+        Any surface code module or module name from codes.
+    Decoders
+        Decoder modules or module names from decoders to compare.
+    enabled_errors
+        List of error modules from `.errors`.
+    faulty_measurements
+        Enable faulty measurements (decode in a 3D lattice).
+    error_rates
+        Dictionary of error rates (see `~qsurface.errors`).
+    iterations
+        Number of iterations to run.
+    seed
+        Entropy of the `~numpy.random.SeedSequence` of the simulation.
+    kwargs
+        Keyword arguments are passed on to `~.main.initialize` for every decoder.
+
+    Returns
+    -------
+    dict
+        The number of successful iterations of each decoder under ``"no_error"``, the mean and standard deviation of the decoding time of each decoder in seconds under ``"duration"``, and the paired outcomes and McNemar p-value of each pair of decoders under ``"paired"``.
+
+    Examples
+    --------
+        >>> compare_decoders(8, "toric", ["mwpm", "unionfind"], enabled_errors=["pauli"], error_rates={"p_bitflip": 0.1}, iterations=10000)
+        {'iterations': 10000,
+        'seed': 241654735167473412735617830170356441913,
+        'no_error': {'mwpm': 7695, 'unionfind': 7571},
+        'duration': {'mwpm': {'mean': 0.00411, 'std': 0.00097}, 'unionfind': {'mean': 0.00094, 'std': 0.00021}},
+        'paired': {'mwpm/unionfind': {'both_fail': 2239, 'only_mwpm': 66, 'only_unionfind': 190, 'neither': 7505, 'mcnemar_p': 8.1e-15}}}
+    """
+    labels = [Decoder.__name__.split(".")[-1] if not isinstance(Decoder, str) else Decoder for Decoder in Decoders]
+    if len(set(labels)) != len(labels):
+        raise ValueError("Decoders must be unique.")
+    if seed is None:
+        seed = numpy.random.SeedSequence().entropy
+
+    instances = []
+    for Decoder in Decoders:
+        code, decoder = initialize(size, Code, Decoder, enabled_errors, faulty_measurements, **kwargs)
+        code.random_errors(**error_rates)  # Loads the error rates for the edge weights of the decoder
+        instances.append((code, decoder, ShotLayout(code)))
+    sampler, _, sampler_layout = instances[0]
+    record = numpy.zeros(sampler_layout.size, dtype=numpy.uint8)
+
+    failures = numpy.zeros((iterations, len(labels)), dtype=bool)
+    durations = numpy.zeros((iterations, len(labels)))
+    for iteration in range(iterations):
+        print(f"Running iteration {iteration+1}/{iterations}", end="\r")
+        sampler.rng = iteration_rng(seed, iteration)
+        sampler_layout.sample(sampler, record, error_rates)
+        for index, (code, decoder, layout) in enumerate(instances):
+            layout.load(code, record)
+            start = timeit.default_timer()
+            decoder.decode()
+            durations[iteration, index] = timeit.default_timer() - start
+            failures[iteration, index] = not layout.no_error(code, record)
+    print()  # for newline after /r
+
+    output = {
+        "iterations": iterations,
+        "seed": seed,
+        "no_error": {label: iterations - int(failures[:, i].sum()) for i, label in enumerate(labels)},
+        "duration": {
+            label: {"mean": float(durations[:, i].mean()), "std": float(durations[:, i].std())}
+            for i, label in enumerate(labels)
+        },
+        "paired": {},
+    }
+    for (i, a), (j, b) in combinations(enumerate(labels), 2):
+        only_a = int((failures[:, i] & ~failures[:, j]).sum())
+        only_b = int((failures[:, j] & ~failures[:, i]).sum())
+        both = int((failures[:, i] & failures[:, j]).sum())
+        output["paired"][f"{a}/{b}"] = {
+            "both_fail": both,
+            f"only_{a}": only_a,
+            f"only_{b}": only_b,
+            "neither": iterations - both - only_a - only_b,
+            "mcnemar_p": mcnemar_p(only_a, only_b),
+        }
+    return output
+
+
+def mcnemar_p(only_a: int, only_b: int) -> float:
+    """Returns the p-value of the exact two-sided McNemar test.
+
+    Parameters
+    ----------
+    only_a
+        Number of iterations where only the first decoder fails.
+    only_b
+        Number of iterations where only the second decoder fails.
+    """
+    discordant = only_a + only_b
+    if discordant == 0:
+        return 1.0
+    return min(1.0, 2 * float(stats.binom.cdf(min(only_a, only_b), discordant, 0.5)))
@@ -0,0 +1,232 @@
+"""
+Syndrome datasets on disk. Instead of sampling new errors for every simulation, `write_syndromes` samples the syndromes of a number of iterations once and writes them to a file, which can be decoded any number of times by `decode_syndromes`, for example by different decoders or versions of a decoder.
+
+Every iteration is stored as a row of bits, which contains the syndrome of all ancilla-qubits of all layers, followed by the parity of the applied errors on each logical operator, in the order of `~.pipeline.ShotLayout`. A dataset is thus only valid for codes that are initialized with the same arguments. Three file formats are supported, which are selected by the suffix of the file name:
+
+=========  ===========================================================================================
+Suffix     Format
+=========  ===========================================================================================
+``.npy``   Bit-packed rows as a two-dimensional ``numpy.uint8`` array in the NumPy format.
+``.b8``    Bit-packed rows without header, where every row is padded to a whole number of bytes.
+``.01``    Text with a line of ``0`` and ``1`` characters per row.
+=========  ===========================================================================================
+
+The bits of the packed formats are in little-endian order within each byte, such that the ``.b8`` and ``.01`` formats are the dense layouts of detection events with appended observables of other simulation tools. All formats are read as a `~numpy.memmap` by `SyndromeDataset`, such that datasets that do not fit in memory are decoded in batches.
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Iterator, Optional, Union
+import numpy
+from .main import code_type, decoder_type, seed_type, iteration_rng
+from .pipeline import ShotLayout
+
+FORMATS = [".npy", ".b8", ".01"]
+
+
+def dataset_bits(code: code_type) -> int:
+    """Returns the number of bits of a row of a syndrome dataset of ``code``."""
+    layout = ShotLayout(code)
+    return len(layout.ancillas) + len(layout.logical_keys)
+
+
+def _format(file: Union[str, Path]) -> str:
+    """Returns the format of ``file`` by its suffix."""
+    suffix = Path(file).suffix
+    if suffix not in FORMATS:
+        raise ValueError(f"Unknown dataset format {suffix}, use one of {', '.join(FORMATS)}.")
+    return suffix
+
+
+def write_syndromes(
+    code: code_type,
+    file: Union[str, Path],
+    iterations: int = 1,
+    error_rates: dict = {},
+    seed: Optional[seed_type] = None,
+    iteration_offset: int = 0,
+    batch_size: int = 4096,
+) -> seed_type:
+    """Samples the syndromes of a number of iterations and writes them to a dataset file.
+
+    The errors of every iteration are applied from the zero state of ``code`` with the stream `~.main.iteration_rng` of the iteration, exactly as in `~.main.run`, such that decoding the dataset by `decode_syndromes` gives the same number of successful iterations as `~.main.run` with the same seed. Rows are written in batches of ``batch_size`` iterations, such that the dataset is never held in memory. Erasures are not stored, such that codes with the erasure error module are not supported.
+
+    Parameters
+    ----------
+    code
+        A surface code instance (see `~.main.initialize`).
+    file
+        Path of the dataset, whose suffix selects the format.
+    iterations
+        Number of iterations to sample.
+    error_rates
+        Dictionary of error rates (see `~qsurface.errors`).
+    seed
+        Entropy of the `~numpy.random.SeedSequence` of the dataset.
+    iteration_offset
+        Index of the first iteration in the streams of the ``seed``.
+    batch_size
+        Number of rows per write.
+
+    Returns
+    -------
+    int
+        The entropy of the seed of the dataset.
+
+    Examples
+    --------
+    Sample a dataset once and decode it with two decoders:
+
+        >>> code, decoder = initialize((8,8), "toric", "unionfind", enabled_errors=["pauli"])
+        >>> write_syndromes(code, "toric8.b8", iterations=100000, error_rates={"p_bitflip": 0.1})
+        >>> decode_syndromes(code, decoder, "toric8.b8", error_rates={"p_bitflip": 0.1})
+        {'no_error': 76120, 'iterations': 100000}
+        >>> code, decoder = initialize((8,8), "toric", "mwpm", enabled_errors=["pauli"])
+        >>> decode_syndromes(code, decoder, "toric8.b8", error_rates={"p_bitflip": 0.1})
+        {'no_error': 77018, 'iterations': 100000}
+    """
+    if "erasure" in code.errors:
+        raise ValueError("Erasures cannot be stored in a syndrome dataset.")
+    suffix = _format(file)
+    if seed is None:
+        seed = numpy.random.SeedSequence().entropy
+
+    layout = ShotLayout(code)
+    bits = len(layout.ancillas) + len(layout.logical_keys)
+    record = numpy.zeros(layout.size, dtype=numpy.uint8)
+    if suffix == ".npy":
+        output = numpy.lib.format.open_memmap(file, mode="w+", dtype=numpy.uint8, shape=(iterations, (bits + 7) // 8))
+    else:
+        output = open(file, "wb")
+
+    for start in range(0, iterations, batch_size):
+        rows = numpy.zeros((min(batch_size, iterations - start), bits), dtype=numpy.uint8)
+        for index, row in enumerate(rows):
+            print(f"Sampling iteration {start+index+1}/{iterations}", end="\r")
+            code.rng = iteration_rng(seed, iteration_offset + start + index)
+            layout.sample(code, record, error_rates)
+            row[: len(layout.ancillas)] = record[: layout.erasures.start]
+            row[len(layout.ancillas) :] = record[layout.logicals]
+        if suffix == ".01":
+            text = numpy.full((len(rows), bits + 1), ord("\n"), dtype=numpy.uint8)
+            text[:, :bits] = rows + ord("0")
+            output.write(text.tobytes())
+        else:
+            packed = numpy.packbits(rows, axis=1, bitorder="little")
+            if suffix == ".npy":
+                output[start : start + len(rows)] = packed
+            else:
+                output.write(packed.tobytes())
+    print()  # for newline after /r
+
+    if suffix == ".npy":
+        output.flush()
+        del output
+    else:
+        output.close()
+    return seed
+
+
+class SyndromeDataset(object):
+    """Memory-mapped reader of a syndrome dataset.
+
+    The file is mapped into memory without reading it, and rows are only unpacked when they are accessed by index or by `batches`.
+
+    Parameters
+    ----------
+    file
+        Path of the dataset, whose suffix selects the format.
+    bits
+        Number of bits per row, see `dataset_bits`.
+
+    Attributes
+    ----------
+    data : numpy.memmap
+        Packed rows of the ``.npy`` and ``.b8`` formats, or the characters of the rows of the ``.01`` format.
+    """
+
+    def __init__(self, file: Union[str, Path], bits: int):
+        self.path = Path(file)
+        self.bits = bits
+        self.format = _format(file)
+        if self.format == ".npy":
+            self.data = numpy.load(file, mmap_mode="r")
+            width = self.data.shape[1] if self.data.ndim == 2 else None
+        else:
+            width = (bits + 7) // 8 if self.format == ".b8" else bits + 1
+            size = self.path.stat().st_size
+            if size % width:
+                raise ValueError(f"The size of {file} is not a multiple of rows of {bits} bits.")
+            self.data = numpy.memmap(file, dtype=numpy.uint8, mode="r", shape=(size // width, width)) if size else None
+        if self.format != ".01" and width not in (None, (bits + 7) // 8):
+            raise ValueError(f"The rows of {file} do not have {bits} bits.")
+
+    def __repr__(self):
+        return f"SyndromeDataset({self.path}, {len(self)} rows of {self.bits} bits)"
+
+    def __len__(self):
+        return 0 if self.data is None else len(self.data)
+
+    def __getitem__(self, index) -> numpy.ndarray:
+        """Returns the unpacked rows at ``index`` as a ``numpy.uint8`` array."""
+        if self.data is None:
+            raise IndexError("The dataset is empty.")
+        rows = self.data[index]
+        if self.format == ".01":
+            return rows[..., : self.bits] - numpy.uint8(ord("0"))
+        return numpy.unpackbits(rows, axis=-1, count=self.bits, bitorder="little")
+
+    def batches(self, batch_size: int = 4096) -> Iterator[numpy.ndarray]:
+        """Yields the unpacked rows of the dataset in batches of ``batch_size`` rows."""
+        for start in range(0, len(self), batch_size):
+            yield self[start : start + batch_size]
+
+
+def decode_syndromes(
+    code: code_type,
+    decoder: decoder_type,
+    file: Union[str, Path],
+    error_rates: dict = {},
+    batch_size: int = 4096,
+    **kwargs,
+) -> dict:
+    """Decodes all rows of a syndrome dataset.
+
+    The dataset is read by a `SyndromeDataset` in batches of ``batch_size`` rows. The ``error_rates`` of the dataset are loaded onto ``code`` before decoding, as in `~.main.run`, such that decoders that derive edge weights from the error rates use the same weights as in a simulation. For every row, the syndrome is loaded onto the zero state of ``code`` as a new instance, which is decoded by ``decoder``. The iteration succeeds if the parity of the correction on each logical operator equals the parity of the errors in the row.
+
+    Parameters
+    ----------
+    code
+        A surface code instance that is initialized with the same arguments as the code of the dataset.
+    decoder
+        A decoder instance of ``code``.
+    file
+        Path of the dataset, whose suffix selects the format.
+    error_rates
+        Dictionary of error rates with which the dataset was sampled.
+    batch_size
+        Number of rows that are unpacked at a time.
+    kwargs
+        Keyword arguments are passed on to `~.decoders._template.Sim.decode`.
+
+    Returns
+    -------
+    dict
+        The number of successful iterations under ``"no_error"`` and the number of rows under ``"iterations"``.
+    """
+    layout = ShotLayout(code)
+    ancillas = len(layout.ancillas)
+    dataset = SyndromeDataset(file, ancillas + len(layout.logical_keys))
+    record = numpy.zeros(layout.size, dtype=numpy.uint8)
+    code.random_errors(**error_rates)  # Loads the error rates for the edge weights of the decoder
+
+    output = {"no_error": 0, "iterations": len(dataset)}
+    for start, rows in zip(range(0, len(dataset), batch_size), dataset.batches(batch_size)):
+        for index, row in enumerate(rows):
+            print(f"Decoding iteration {start+index+1}/{len(dataset)}", end="\r")
+            record[:ancillas] = row[:ancillas]
+            record[layout.logicals] = row[ancillas:]
+            layout.load(code, record)
+            decoder.decode(**kwargs)
+            output["no_error"] += layout.no_error(code, record)
+    print()  # for newline after /r
+    return output
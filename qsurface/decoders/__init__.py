@@ -2,5 +2,6 @@ from . import _template
 from . import mwpm
 from . import unionfind
 from . import ufns
+from . import peeling
 
-DECODERS = ["mwpm", "unionfind", "ufns"]
+DECODERS = ["mwpm", "unionfind", "ufns", "peeling"]
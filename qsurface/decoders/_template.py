@@ -1,10 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Tuple, Union
+from typing import Callable, List, Optional, Tuple, Union
 from collections import defaultdict
+from functools import wraps
 from matplotlib.lines import Line2D
 from pathlib import Path
 import configparser
 import ast
+import json
 import os
 from ..codes._template.sim import PerfectMeasurements
 from ..codes.elements import AncillaQubit, Edge, PseudoQubit
@@ -117,6 +119,46 @@ def init_config(ini_file, write: bool = False, **kwargs):
     return config_dict
 
 
+class Printer(object):
+    """Decoder hook that prints every traced event to the console.
+
+    Each event is printed on a single line as its name followed by the string representations of its arguments. List arguments, such as the union list passed between growth steps, are omitted.
+    """
+
+    def __repr__(self):
+        return "Printer()"
+
+    def __call__(self, event: str, *args, **kwargs):
+        print(f"{event}: " + ", ".join(str(arg) for arg in args if not isinstance(arg, list)))
+
+
+class TraceFile(object):
+    """Decoder hook that writes every traced event to a file.
+
+    Events are appended to the file at ``path`` as JSON lines of the form ``{"event": ..., "args": [...]}``, where all arguments except lists are stored by their string representations.
+
+    Parameters
+    ----------
+    path
+        Path of the trace file.
+    """
+
+    def __init__(self, path: Union[str, Path], **kwargs):
+        self.path = Path(path)
+        self.file = open(self.path, "a")
+
+    def __repr__(self):
+        return f"TraceFile({self.path})"
+
+    def __call__(self, event: str, *args, **kwargs):
+        args = [str(arg) for arg in args if not isinstance(arg, list)]
+        self.file.write(json.dumps({"event": event, "args": args}) + "\n")
+
+    def close(self):
+        """Closes the trace file."""
+        self.file.close()
+
+
 class Sim(ABC):
     """
     Decoder simulation class template.
@@ -127,6 +169,8 @@ class Sim(ABC):
         A ``PerfectMeasurements`` or ``FaultyMeasurements`` class from the `sim` module of :doc:`../codes/index`.
     check_compatibility
         Checks compatibility of the decoder with the code class and loaded errors by `check_compatibility`.
+    hooks
+        Callables that receive the traced events of the decoder, see `add_hook`. If the decoder configuration has ``print_steps`` enabled, a `Printer` hook is added.
 
     Attributes
     ----------
@@ -134,6 +178,10 @@ class Sim(ABC):
         Compatibility with perfect or faulty measurements.
     compatibility_errors : dict
         Compatibility with the various error modules in :doc:`../errors/index`.
+    trace_events : dict
+        Names of the methods that are traced if hooks are attached, mapped to the names of their events.
+    hooks : list
+        Attached hooks.
 
     """
 
@@ -148,20 +196,71 @@ class Sim(ABC):
         pauli=True,
         erasure=True,
     )
+    trace_events = {}
 
-    def __init__(self, code: PerfectMeasurements, check_compatibility: bool = False, **kwargs):
+    def __init__(
+        self,
+        code: PerfectMeasurements,
+        check_compatibility: bool = False,
+        hooks: Optional[List[Callable]] = None,
+        **kwargs,
+    ):
 
         self.code = code
         self.config_file = Path(__file__).resolve().parent / "decoders.ini"
         self.config = init_config(self.config_file)[self.short]
         self.config.update(kwargs)
 
+        self.hooks = []
+        for hook in hooks or []:
+            self.add_hook(hook)
+        if self.config.get("print_steps"):
+            self.add_hook(Printer())
+
         if check_compatibility:
             self.check_compatibility()
 
     def __repr__(self):
         return "<{} decoder ({})>".format(self.name, self.__class__.__name__)
 
+    def add_hook(self, hook: Callable):
+        """Attaches a hook that receives the traced events of the decoder.
+
+        The decoder is specialized at the attachment of its first hook, where every method in ``trace_events`` is replaced on the instance by a wrapper that calls all hooks after the method has returned. Without hooks, the decoder methods are not wrapped and tracing has no cost at all.
+
+        Parameters
+        ----------
+        hook
+            Callable with signature ``hook(event, *args, output=None)``, where ``args`` are the positional arguments of the traced method and ``output`` its return value.
+
+        Examples
+        --------
+        Collect the names of all events during decoding.
+
+            >>> events = []
+            >>> decoder.add_hook(lambda event, *args, **kwargs: events.append(event))
+            >>> decoder.decode()
+            >>> events[:3]
+            ['bucket', 'grow', 'grow']
+        """
+        if not self.hooks:
+            for name, event in self.trace_events.items():
+                setattr(self, name, self._trace_method(getattr(self, name), event))
+        self.hooks.append(hook)
+
+    def _trace_method(self, method: Callable, event: str) -> Callable:
+        """Wraps ``method`` to call all hooks with ``event`` after every call."""
+        hooks = self.hooks
+
+        @wraps(method)
+        def traced(*args, **kwargs):
+            output = method(*args, **kwargs)
+            for hook in hooks:
+                hook(event, *args, output=output)
+            return output
+
+        return traced
+
     def check_compatibility(self):
         """Checks compatibility of the decoder with the code class and loaded errors."""
         compatible, unspecified = True, False
@@ -0,0 +1,8 @@
+"""
+Over the quantum erasure channel, the locations of the errors are known to the decoder. Every erased qubit is replaced by a maximally mixed state, such that the only unknown is which of the erased edges carry a Pauli error. The peeling decoder [delfosse2017linear]_ finds this error in linear time in the number of erased edges, and is a maximum likelihood decoder for the erasure channel. 
+
+First, a spanning forest is constructed within the subgraph of erased edges. Then, the leaves of each spanning tree are peeled one by one. If the pendant ancilla of a leaf edge is non-trivial, the edge is added to the correction and the syndrome of the other ancilla of the edge is flipped. As the syndrome of each tree has even parity, or the tree is rooted on the boundary of the lattice, all non-trivial ancillas are resolved when the tree is fully peeled. Since the decoder only operates on erased edges, it can only decode codes with erasure errors.
+"""
+
+from . import sim
+from . import plot
@@ -0,0 +1,38 @@
+from .sim import Toric as SimToric, Planar as SimPlanar, Rotated as SimRotated
+from .._template import Plot
+
+
+class Toric(Plot, SimToric):
+    """Plot peeling decoder for the toric code.
+
+    Parameters
+    ----------
+    args, kwargs
+        Positional and keyword arguments are passed on to `.decoders._template.Plot` and `.decoders.peeling.sim.Toric`.
+    """
+
+    pass
+
+
+class Planar(Toric, SimPlanar):
+    """Plot peeling decoder for the planar code.
+
+    Parameters
+    ----------
+    args, kwargs
+        Positional and keyword arguments are passed on to `~.decoders.peeling.plot.Toric` and `.decoders.peeling.sim.Planar`.
+    """
+
+    pass
+
+
+class Rotated(Planar, SimRotated):
+    """Plot peeling decoder for the rotated code.
+
+    Parameters
+    ----------
+    args, kwargs
+        Positional and keyword arguments are passed on to `~.decoders.peeling.plot.Planar` and `.decoders.peeling.sim.Rotated`.
+    """
+
+    pass
@@ -0,0 +1,143 @@
+from typing import Dict, List, Tuple
+from ...codes.elements import AncillaQubit, DataQubit, Edge, PseudoQubit
+from .._template import Sim
+from collections import deque
+from itertools import chain
+
+
+LE = List[Tuple[AncillaQubit, AncillaQubit, Edge]]
+
+
+class Toric(Sim):
+    """Peeling decoder for the toric lattice.
+
+    The decoder only considers the edges of erased data-qubits, which are found by `find_erased_qubits`. A spanning forest of these edges is constructed by `spanning_forest` and peeled by `peel_forest`. The decoder can thus only correct errors that lie within the erased edges, and is not compatible with Pauli errors or faulty measurements that are not erasures. Note that the initial state of the data-qubits must be known to the decoder, e.g. by initializing the code with ``initial_states=(0, 0)``.
+
+    For faulty measurements, erasures are decoded for each layer separately, as the erasures on a layer only cause syndromes within the same layer. All corrections are applied to the decode layer.
+
+    Parameters
+    ----------
+    args, kwargs
+        Positional and keyword arguments are passed on to `.decoders._template.Sim`.
+    """
+
+    name = "Peeling"
+    short = "peeling"
+
+    compatibility_measurements = dict(
+        PerfectMeasurements=True,
+        FaultyMeasurements=True,
+    )
+    compatibility_errors = dict(
+        pauli=False,
+        erasure=True,
+    )
+
+    def decode(self, **kwargs):
+        # Inherited docstring
+        adjacency = self.erased_adjacency(self.find_erased_qubits())
+        self.peel_forest(self.spanning_forest(adjacency))
+
+    def find_erased_qubits(self) -> List[DataQubit]:
+        """Returns all data-qubits that have been erased in the current simulation instance.
+
+        The erased qubits are recorded by the erasure error module (see `~.errors.erasure.Sim.erased_qubits`), such that the qubits of the lattice are not searched.
+        """
+        if "erasure" not in self.code.errors:
+            return []
+        return self.code.errors["erasure"].erased_qubits()
+
+    @staticmethod
+    def erased_adjacency(erased_qubits: List[DataQubit]) -> Dict[AncillaQubit, LE]:
+        """Constructs the adjacency lists of the subgraph of erased edges.
+
+        Parameters
+        ----------
+        erased_qubits
+            Erased data-qubits. Both edges of each data-qubit are added to the subgraph.
+
+        Returns
+        -------
+        dict
+            List of ``(ancilla, new_ancilla, edge)`` for every ancilla in the subgraph.
+        """
+        adjacency = {}
+        for data_qubit in erased_qubits:
+            for edge in data_qubit.edges.values():
+                ancilla, new_ancilla = edge.nodes
+                adjacency.setdefault(ancilla, []).append((ancilla, new_ancilla, edge))
+                adjacency.setdefault(new_ancilla, []).append((new_ancilla, ancilla, edge))
+        return adjacency
+
+    def get_roots(self, adjacency: Dict[AncillaQubit, LE]) -> List[AncillaQubit]:
+        """Returns the ancillas from which the first spanning tree is grown.
+
+        On the toric lattice, there are no boundaries and no roots are preferred.
+        """
+        return []
+
+    def spanning_forest(self, adjacency: Dict[AncillaQubit, LE]) -> LE:
+        """Constructs a spanning forest of the erased subgraph by breadth-first search.
+
+        The first tree is grown from all ancillas returned by `get_roots` at once, such that these ancillas are considered as a single vertex. All other trees are grown from an arbitrary ancilla in the tree. An edge that connects to an ancilla already in the forest closes a cycle and is not added.
+
+        Parameters
+        ----------
+        adjacency
+            Adjacency lists of the erased subgraph, see `erased_adjacency`.
+
+        Returns
+        -------
+        list
+            Edges of the forest as ``(parent, child, edge)`` in breadth-first order.
+        """
+        visited, forest = set(), []
+        for roots in chain([self.get_roots(adjacency)], ([ancilla] for ancilla in adjacency)):
+            queue = deque(root for root in roots if root not in visited)
+            visited.update(queue)
+            while queue:
+                parent = queue.popleft()
+                for (_, child, edge) in adjacency[parent]:
+                    if child not in visited:
+                        visited.add(child)
+                        forest.append((parent, child, edge))
+                        queue.append(child)
+        return forest
+
+    def peel_forest(self, forest: LE):
+        """Peels the spanning forest from its leaves.
+
+        The edges of the forest are considered in reversed breadth-first order, such that every edge is pendant when it is peeled. If the child ancilla of an edge is non-trivial, the edge is corrected by `peel_edge`. Otherwise the edge is removed.
+
+        Parameters
+        ----------
+        forest
+            Edges of the forest as ``(parent, child, edge)``, see `spanning_forest`.
+        """
+        for parent, child, edge in reversed(forest):
+            if child.syndrome:
+                self.peel_edge(parent, child, edge)
+
+    def peel_edge(self, parent: AncillaQubit, child: AncillaQubit, edge: Edge):
+        """Flips the syndromes of the ancillas connected to ``edge`` and corrects the edge on the decode layer."""
+        child.syndrome = not child.syndrome
+        parent.syndrome = not parent.syndrome
+        for key, data_qubit in child.parity_qubits.items():
+            if data_qubit is edge.qubit:
+                self.correct_edge(self.code.ancilla_qubits[self.code.decode_layer][child.loc], key)
+                break
+
+
+class Planar(Toric):
+    """Peeling decoder for the planar lattice.
+
+    All `~.codes.elements.PseudoQubit` objects in the erased subgraph are roots of the first spanning tree, such that the boundary is considered as a single vertex. As the boundary can absorb any parity, it is never peeled. See `.peeling.sim.Toric` for more information.
+    """
+
+    def get_roots(self, adjacency: Dict[AncillaQubit, LE]) -> List[AncillaQubit]:
+        # Inherited docstring
+        return [ancilla for ancilla in adjacency if type(ancilla) is PseudoQubit]
+
+
+class Rotated(Planar):
+    pass
@@ -1,9 +1,9 @@
 """
 The Union-Find Node-Suspension decoder [hu2020thesis]_ uses the potential matching weight as a heuristic to prioritize  growth in specific partitions -- the nodes -- of the Union-Find cluster (see :ref:`union-find-decoder`). The potential matching weight is approximated by levering a node-tree in the Node-Suspension Data-structure. The elements of the node-tree are descendent objects of `~.ufns.elements.Node`. 
 
-The complexity of the algorithm is determined by the calculation of the *node parity* in `~.ufns.elements.Node.ns_parity`, the *node delay* in `~.ufns.elements.Node.ns_delay`, and the growth of the cluster, which is now applied as a recursive function that inspects all nodes in the node tree (`.ufns.sim.Toric.grow_node`). During cluster mergers, additional to `~.unionfind.elements.Cluster.union`, node-trees are joined by `~.ufns.sim.Toric.join_node_trees`. 
+The complexity of the algorithm is determined by the calculation of the *node parity* in `~.ufns.elements.NodeTree.ns_parity`, the *node delay* in `~.ufns.elements.NodeTree.ns_delay`, and the growth of the cluster (`.ufns.sim.Toric.grow_node_tree`). The node-tree of each cluster is stored as a flattened `~.ufns.elements.NodeTree`, such that these calculations are linear sweeps over only the nodes of newly joined subtrees, and suspended nodes are kept in a bucket queue that is not inspected until they are resumed. During cluster mergers, additional to `~.unionfind.elements.Cluster.union`, node-trees are joined by `~.ufns.elements.NodeTree.join`. 
 
-.. todo:: Proper calculation of delay for erasures/empty nodes in the graph
+Erased edges have no weight. A non-trivial ancilla that is connected to the cluster by erased edges is therefore the primer of its own syndrome-node at zero distance from its neighboring node (`.ufns.sim.Toric._ancilla_joined`), such that the node parities and delays remain valid on erasures and on the 3D lattice of faulty measurements.
 """
 
 from . import sim
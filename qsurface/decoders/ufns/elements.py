@@ -1,6 +1,8 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Optional, Tuple
+from typing import List, Optional
+from collections import deque
+from heapq import heappop, heappush
 from ...codes.elements import AncillaQubit
 import pptree
 
@@ -26,17 +28,15 @@ class Node(ABC):
     new_bound : list
         Next boundary edges.
     neighbors : list
-        Neighboring nodes in the node-tree.
-    root_list : list
-        List of even subroots of merged node-trees.
+        Neighboring nodes in the node-tree and the distances to them.
     radius : int
         Node radius size.
     parity : {0,1}
         Node parity.
     delay : int
         Number of iterations to wait.
-    waited : int
-        Number of iterations waited.
+    index : int
+        Index of the node in its `NodeTree`.
     """
 
     short = "T"
@@ -49,11 +49,10 @@ class Node(ABC):
         self.old_bound = []
         self.new_bound = []
         self.neighbors = []
-        self.root_list = []
         self.radius = 0
         self.parity = 0
         self.delay = 0
-        self.waited = 0
+        self.index = 0
 
     def __repr__(self):
         return f"{self.short}N({self.primer.loc[0]},{self.primer.loc[1]}|{self.primer.z})"
@@ -61,84 +60,62 @@ class Node(ABC):
     @property
     def _status(self):
         parity = "o" if self.parity else "e"
-        return f"{self.radius}{parity}{self.waited}/{self.delay}"
+        return f"{self.radius}{parity}/{self.delay}"
 
     @property
     def _repr_status(self):
         return str(self) + self._status
 
     @abstractmethod
-    def ns_parity(self):
-        "Calculates and returns the parity of the current node."
-        pass
+    def ns_parity(self, children: int) -> int:
+        """Calculates and returns the parity of the current node.
 
-    def ns_delay(self, parent: Optional[Tuple[Node, int]] = None, min_delay: Optional[int] = None) -> int:
-        """Calculates the node delay.
+        Parameters
+        ----------
+        children
+            Sum of :math:`1+n_p` over all children :math:`n` of the current node, modulo 2.
+        """
+        pass
 
-        Head recursive function that calculates the delays of the current node and all its descendent nodes.
+    def ns_delay(self, parent: Node, edge: int) -> int:
+        """Calculates and returns the node delay.
 
         .. math:: n_d = m_d + \\lfloor n_r-m_r \\rfloor - (-1)^{n_p} |(n,m)|
 
-        The minimal delay ``min_delay`` in the tree is maintained as the actual delay is relative to the minimal delay value within the entire node-tree.
+        The delay is relative to the minimal delay value within the entire node-tree, see `NodeTree.ns_delay`.
 
         Parameters
         ----------
         parent
-            The parent node and the distance to the parent node.
-        min_delay
-            Minimal delay value encountered during the current calculation.
+            The parent node :math:`m`.
+        edge
+            The distance to the parent node.
         """
-        self.root_list = []
-        self.waited = 0
-
-        if parent is not None:
-            parent, edge = parent
-            self.delay = int(parent.delay + (self.radius / 2 - parent.radius / 2) % 1 - edge * (-1) ** self.parity)
-            if min_delay is None or (self.delay < min_delay):
-                min_delay = self.delay
-
-        for node, edge in self.neighbors:
-            if node is not parent:
-                min_delay = node.ns_delay((self, edge), min_delay)
-
-        return min_delay
+        self.delay = int(parent.delay + (self.radius / 2 - parent.radius / 2) % 1 - edge * (-1) ** self.parity)
+        return self.delay
 
 
 class Syndrome(Node):
     short = "S"
 
-    def ns_parity(self, parent_node: Optional[Node] = None) -> int:
+    def ns_parity(self, children: int) -> int:
         """Calculates the node parity.
 
-        Tail recursive function that calculates the parities of the current node and all its descendent nodes.
-
-        .. math:: s_p = \\big( \\sum_{n \\in \\text{ children of } s} (1+s_p) \\big) \\bmod 2
-
-        Parameters
-        ----------
-        parent_node
-            Parent node in node-tree to indicate direction.
+        .. math:: s_p = \\big( \\sum_{n \\in \\text{ children of } s} (1+n_p) \\big) \\bmod 2
         """
-        self.parity = sum([1 - node.ns_parity(self) for node, _ in self.neighbors if node is not parent_node]) % 2
+        self.parity = children
         return self.parity
 
 
 class Junction(Node):
     short = "J"
 
-    def ns_parity(self, parent_node: Optional[Node] = None) -> int:
+    def ns_parity(self, children: int) -> int:
         """Calculates the node parity.
 
-        Tail recursive function that calculates the parities of the current node and all its children.
-
         .. math:: j_p = 1 - \\big(\\sum_{n \\in \\text{ children of } j} (1+n_p) \\big) \\bmod 2.
-
-        Parameters
-        ----------
-        parent_node
-            Parent node in node-tree to indicate direction.
         """
-        self.parity = 1 - (sum([1 - node.ns_parity(self) for node, _ in self.neighbors if node is not parent_node]) % 2)
+        self.parity = 1 - children
         return self.parity
 
 
@@ -154,6 +131,149 @@ class OddNode(Node):
         return self.parity
 
 
+class NodeTree(object):
+    """Flattened node-tree of a cluster.
+
+    The nodes of the tree are stored in the list ``nodes`` in a topological order from the root node at index 0, such that every node is preceded by its parent. The index of the parent node and the distance to the parent node are stored at the same index in the lists ``parents`` and ``edges``. The node parities and delays are calculated by linear sweeps over these lists in `ns_parity` and `ns_delay`.
+
+    Node-trees are joined by `join`, which appends the nodes of the joined tree in a topological order from the node that is attached to the current tree. The appended nodes are *pending*: their parities and delays are recalculated before the next growth of the cluster.
+
+    A node :math:`n` is grown in a growth round if it has waited :math:`n_d - \\min_{x \\in \\mathcal{N}}{x_d}` rounds. Instead of counting the waited rounds of every node, the suspended nodes are stored in a bucket queue ``suspended`` under the round number in which they are resumed, which is fixed at the calculation of their delays. Nodes that are no longer suspended are stored in ``active`` and are returned by `grow` in every round. Only the pending nodes are inspected when the delays are calculated, and a suspended node is not inspected at all until it is resumed.
+
+    Parameters
+    ----------
+    root
+        Root node of the tree.
+
+    Attributes
+    ----------
+    nodes : list
+        Nodes of the tree in topological order.
+    parents : list
+        Index of the parent of each node, -1 for the root.
+    edges : list
+        Distance of each node to its parent.
+    pending : int
+        Index of the first node with pending parity and delay calculations.
+    min_delay : int
+        Minimal delay value in the tree.
+    round : int
+        Number of growth rounds of the tree.
+    active : list
+        Nodes that are grown in every round.
+    suspended : dict
+        Suspended nodes, stored under the round number offset by ``min_delay`` in which they are resumed.
+    resume_keys : list
+        Heap of the keys of ``suspended``.
+    """
+
+    def __init__(self, root: Node):
+        root.index = 0
+        self.nodes = [root]
+        self.parents = [-1]
+        self.edges = [0]
+        self.pending = 1
+        self.min_delay = 0
+        self.round = 0
+        self.active = [root]
+        self.suspended = {}
+        self.resume_keys = []
+
+    def __repr__(self):
+        return f"NodeTree({self.root}, {len(self.nodes)} nodes)"
+
+    def __len__(self):
+        return len(self.nodes)
+
+    @property
+    def root(self) -> Node:
+        """Root node of the tree."""
+        return self.nodes[0]
+
+    def join(self, parent: Node, child: Node, edge: int, pending: bool = False):
+        """Joins the node-tree of ``child`` to the current tree.
+
+        The node ``child`` must already be connected to ``parent``, a node in the current tree, by their ``neighbors`` lists. The nodes of the tree of ``child`` are appended to the current tree in the order of a breadth-first search from ``child``, which reroots the joined tree at ``child``.
+
+        Parameters
+        ----------
+        parent
+            Node in the current tree.
+        child
+            Node in the tree to join, or a junction-node between ``parent`` and the tree to join.
+        edge
+            Distance between ``parent`` and ``child``.
+        pending
+            Sets the joined nodes as pending for the parity and delay calculations. Otherwise, no node in the tree is pending after the join.
+        """
+        nodes, parents, edges = self.nodes, self.parents, self.edges
+        queue = deque([(child, parent, edge)])
+        while queue:
+            node, parent_node, parent_edge = queue.popleft()
+            node.index = len(nodes)
+            nodes.append(node)
+            parents.append(parent_node.index)
+            edges.append(parent_edge)
+            for neighbor, neighbor_edge in node.neighbors:
+                if neighbor is not parent_node:
+                    queue.append((neighbor, node, neighbor_edge))
+        if not pending:
+            self.pending = len(nodes)
+
+    def ns_parity(self):
+        """Calculates the parities of the pending nodes.
+
+        The nodes are swept in reverse order, such that the parity of every child node is known before its parent.
+        """
+        nodes, parents, pending = self.nodes, self.parents, self.pending
+        children = [0] * (len(nodes) - pending)
+        for i in range(len(nodes) - 1, pending - 1, -1):
+            parity = nodes[i].ns_parity(children[i - pending] % 2)
+            if parents[i] >= pending:
+                children[parents[i] - pending] += 1 - parity
+
+    def ns_delay(self) -> int:
+        """Calculates the delays of the pending nodes and returns the minimal delay of the tree.
+
+        The nodes are swept in order, such that the delay of every parent node is known before its children. The pending nodes are suspended until their delays are waited. If the minimal delay of the tree is decreased, all active nodes must wait the difference and are suspended as a single group. All nodes are no longer pending after the calculation.
+        """
+        nodes, parents, edges = self.nodes, self.parents, self.edges
+        min_delay = self.min_delay
+        for i in range(self.pending, len(nodes)):
+            delay = nodes[i].ns_delay(nodes[parents[i]], edges[i])
+            if delay < min_delay:
+                min_delay = delay
+
+        if min_delay < self.min_delay and self.active:
+            self.suspend(self.round + self.min_delay, self.active)
+            self.active = []
+        self.min_delay = min_delay
+        for i in range(self.pending, len(nodes)):
+            self.suspend(self.round + nodes[i].delay, [nodes[i]])
+
+        self.pending = len(nodes)
+        return min_delay
+
+    def suspend(self, key: int, nodes: List[Node]):
+        """Suspends ``nodes`` until the growth round where ``round + min_delay`` is equal to ``key``."""
+        if key in self.suspended:
+            self.suspended[key].extend(nodes)
+        else:
+            self.suspended[key] = nodes
+            heappush(self.resume_keys, key)
+
+    def grow(self) -> List[Node]:
+        """Returns the nodes to grow in the current growth round.
+
+        Suspended nodes that have waited their delays are resumed and added to the active nodes.
+        """
+        key = self.round + self.min_delay
+        while self.resume_keys and self.resume_keys[0] <= key:
+            self.active.extend(self.suspended.pop(heappop(self.resume_keys)))
+        self.round += 1
+        return self.active
+
+
 def print_tree(current_node: Node, parent_node: Optional[Node] = None):
     """Prints the node-tree of ``current_node`` and its descendents.
 
@@ -174,3 +294,12 @@ def print_tree(current_node: Node, parent_node: Optional[Node] = None):
 
     get_children(current_node, parent_node)
     pptree.print_tree(current_node, childattr="children", nameattr="_repr_status", horizontal=False)
+
+
+def print_tree_hook(event: str, *args, **kwargs):
+    """Decoder hook that prints the node-tree of every grown cluster that consists of multiple nodes.
+
+    Added to `~.ufns.sim.Toric` by the ``print_tree`` option. See `~.decoders._template.Sim.add_hook` for the hook signature.
+    """
+    if event == "grow" and len(args[0].node_tree) > 1:
+        print_tree(args[0].node_tree.root)
@@ -1,6 +1,6 @@
 from ...codes.elements import AncillaQubit, DataQubit, Edge
-from .sim import Toric as SimToric, Planar as SimPlanar
-from ..unionfind.plot import Toric as PlotToric, Planar as PlotPlanar
+from .sim import Toric as SimToric, Planar as SimPlanar, Rotated as SimRotated
+from ..unionfind.plot import Toric as PlotToric, Planar as PlotPlanar, Rotated as PlotRotated
 
 
 class Toric(PlotToric, SimToric):
@@ -24,8 +24,8 @@ class Toric(PlotToric, SimToric):
         Waits for user after every edge removed during peeling. Default is false.
     """
 
-    def _grow_node_boundary(self, node, *args, **kwargs):
-        super()._grow_node_boundary(node, *args, **kwargs)
+    def grow_node_boundary(self, node, *args, **kwargs):
+        super().grow_node_boundary(node, *args, **kwargs)
         if self.config["step_node"]:
             self._draw(f"Node {node._repr_status} grown.")
 
@@ -63,3 +63,27 @@ class Planar(Toric, PlotPlanar, SimPlanar):
     """
 
     pass
+
+
+class Rotated(Planar, PlotRotated, SimRotated):
+    """Union-Find Node-Suspension decoder for the rotated lattice with union-find plot.
+
+    Has all class attributes, methods, and nested figure classes from `.ufns.sim.Rotated`, with additional parameters below. Default values for these parameters can be supplied via a *decoders.ini* file under the section of ``[ufns]`` (see `.decoders._template.read_config`).
+
+    The plotting class initiates a `qsurface.plot` object. For its usage, see :ref:`plot-usage`.
+
+    Parameters
+    ----------
+    step_bucket : bool, optional
+        Waits for user after every occupied bucket. Default is false.
+    step_cluster : bool, optional
+        Waits for user after growth of every cluster. Default is false.
+    step_node : bool, optional
+        Waits for user after growth of every node. Default is false.
+    step_cycle : bool, optional
+        Waits for user after every edge removed due to cycle detection. Default is false.
+    step_peel : bool, optional
+        Waits for user after every edge removed during peeling. Default is false.
+    """
+
+    pass
@@ -1,8 +1,8 @@
-from typing import List, Optional, Tuple
+from typing import List, Tuple
 from ...codes.elements import AncillaQubit, Edge
-from ..unionfind.sim import Toric as UFToric, Planar as UFPlanar
+from ..unionfind.sim import Toric as UFToric, Planar as UFPlanar, Rotated as UFRotated
 from ..unionfind.elements import Cluster
-from .elements import Node, Syndrome, Junction, OddNode, print_tree
+from .elements import Node, NodeTree, Syndrome, Junction, OddNode, print_tree_hook
 
 UL = List[Tuple[AncillaQubit, Edge, AncillaQubit]]
 
@@ -12,7 +12,7 @@ class Toric(UFToric):
 
     Within the combined Union-Find and Node-Suspension data structure, every `~.unionfind.elements.Cluster` is partitioned into one or more `~.ufns.elements.Node` objectss. The ``node`` attribute is monkey-patched to the `~.codes.elements.AncillaQubit` object to assist the identification of its parent `~.ufns.elements.Node`.
 
-    The boundary of every cluster is not stored at the cluster object, but divided under its partitioned nodes. Cluster growth is initiated from the root of the node-tree. The attributes ``root_node`` and ``min_delay`` are monkey-patched to the `~.unionfind.elements.Cluster` object to assist with cluster growth in the Node-Suspension data structure. See `grow_node` for more.
+    The boundary of every cluster is not stored at the cluster object, but divided under its partitioned nodes. The node-tree of a cluster is stored as a flattened `~.ufns.elements.NodeTree`, which is monkey-patched as the attribute ``node_tree`` to the `~.unionfind.elements.Cluster` object to assist with cluster growth in the Node-Suspension data structure. See `grow_node_tree` for more.
 
     The current class inherits from `.unionfind.sim.Toric` for its application the Union-Find data structure for cluster growth and mergers. To maintain low operating complexity in UFNS, the following parameters are set of the Union-Find parent class.
 
@@ -22,6 +22,8 @@ class Toric(UFToric):
     weighted_growth     True
     weighted_union      True
     dynamic_forest      True
+    frontier_growth     False
+    edge_weights        False
     =================   =======
 
     Attributes
@@ -37,13 +39,15 @@ class Toric(UFToric):
     _Junction = Junction
     _OddNode = OddNode
 
+    trace_events = dict(UFToric.trace_events, grow_node_boundary="node")
+
     compatibility_measurements = dict(
         PerfectMeasurements=True,
-        FaultyMeasurements=False,
+        FaultyMeasurements=True,
     )
     compatibility_errors = dict(
         pauli=True,
-        erasure=False,
+        erasure=True,
     )
 
     def __init__(self, *args, **kwargs) -> None:
@@ -52,60 +56,41 @@ class Toric(UFToric):
                 "weighted_growth": True,
                 "weighted_union": True,
                 "dynamic_forest": True,
+                "frontier_growth": False,
+                "edge_weights": False,
             }
         )
         super().__init__(*args, **kwargs)
 
         self.code._AncillaQubit.node = None
-        self._Cluster.root_node = None
-        self._Cluster.min_delay = 0
+        self._Cluster.node_tree = None
         self.new_boundary = []
 
+        if self.config["print_tree"]:
+            self.add_hook(print_tree_hook)
+
     """
     ================================================================================================
                                     General helper functions
     ================================================================================================
     """
 
-    def cluster_add_ancilla(
-        self,
-        cluster: Cluster,
-        ancilla: AncillaQubit,
-        parent: Optional[AncillaQubit] = None,
-        **kwargs,
-    ):
-        """Recursively adds erased edges to ``cluster`` and finds the new boundary.
-
-        For a given ``ancilla``, this function finds the neighboring edges and ancillas that are in the the currunt cluster. If the newly found edge is erased, the edge and the corresponding ancilla will be added to the cluster, and the function applied recursively on the new ancilla. Otherwise, the neighbor is added to the new boundary ``self.new_boundary``.
+    def _ancilla_joined(self, cluster: Cluster, ancilla: AncillaQubit, parent: AncillaQubit):
+        """Adds ``ancilla``, which is connected to ``parent`` in ``cluster`` via an erased edge, to the node-tree.
 
-        Parameters
-        ----------
-        cluster
-            Current active cluster
-        ancilla
-            Ancilla from which the connected erased edges or boundary are searched.
+        The ancilla is added to the node of ``parent``. A non-trivial ancilla that is connected by erased edges to another non-trivial ancilla is the primer of a new syndrome-node instead. As erased edges have no weight, the syndrome-node is connected to the node of ``parent`` at zero distance. Every node thus contains at most a single syndrome, which the node parity calculation requires. A `~.codes.elements.PseudoQubit` is always added to the node of ``parent``, as it may be connected to more than one ancilla on the rotated lattice, and may thus be the ``new_ancilla`` of a union in `union_bucket`.
         """
-        cluster.add_ancilla(ancilla)
-        if parent:
+        if ancilla.syndrome:
+            node, parent_node = self._Syndrome(ancilla), parent.node
+            node.neighbors.append((parent_node, 0))
+            parent_node.neighbors.append((node, 0))
+            cluster.node_tree.join(parent_node, node, 0, pending=True)
+        else:
             ancilla.node = parent.node
 
-        for (new_ancilla, edge) in self.get_neighbors(ancilla).values():
-            if (
-                "erasure" in self.code.errors
-                and edge.qubit.erasure == self.code.instance
-                and new_ancilla is not parent
-                and self.support[edge] == 0
-            ):  # if edge not already traversed
-                if new_ancilla.cluster == cluster:  # cycle detected, peel edge
-                    self._edge_peel(edge, variant="cycle")
-                else:  # if no cycle detected
-                    self._OddNode(new_ancilla)
-                    self._edge_full(ancilla, edge, new_ancilla)
-                    self.cluster_add_ancilla(cluster, new_ancilla, parent=ancilla)
-
-            else:  # Make sure new bound does not lead to self
-                if new_ancilla.cluster is not cluster:
-                    self.new_boundary.append((ancilla, edge, new_ancilla))
+    def _add_boundary(self, cluster: Cluster, ancilla: AncillaQubit, edge: Edge, new_ancilla: AncillaQubit):
+        """Adds the boundary ``(ancilla, edge, new_ancilla)`` to ``self.new_boundary``, which is saved to the node of ``ancilla`` by `bound_ancilla_to_node`."""
+        self.new_boundary.append((ancilla, edge, new_ancilla))
 
     def bound_ancilla_to_node(self):
         """Saves the new boundary to their respective nodes.
@@ -138,7 +123,7 @@ class Toric(UFToric):
             if ancilla.cluster is None or ancilla.cluster.instance != self.code.instance:
                 node = self._Syndrome(ancilla)
                 cluster = self._Cluster(self.cluster_index, self.code.instance)
-                cluster.root_node = node
+                cluster.node_tree = NodeTree(node)
                 self.cluster_add_ancilla(cluster, ancilla)
                 self.cluster_index += 1
                 self.clusters.append(cluster)
@@ -146,9 +131,6 @@ class Toric(UFToric):
         self.bound_ancilla_to_node()
         self.place_bucket(self.clusters, -1)
 
-        if self.config["print_steps"]:
-            print(f"Found clusters:\n" + ", ".join(map(str, self.clusters)) + "\n")
-
     """
     ================================================================================================
                                     2(a). Grow clusters expansion
@@ -199,7 +181,7 @@ class Toric(UFToric):
     def grow_boundary(self, cluster: Cluster, union_list: UL, **kwargs):
         """Grows the boundary of the ``cluster``.
 
-        See `grow_clusters` for more information. Each element in the ``root_list`` of the root node of the ``cluster`` is a subroot of an even subtree in the node-tree. From each of these subroots, the node parity and delays are calculated by `~.ufns.elements.ns_parity` and `~ufns.elements.ns_delay`. The node-tree is then recursively grown by `grow_node`.
+        See `grow_clusters` for more information. The node-trees of even clusters that have been joined to the node-tree of the ``cluster`` since its last growth are pending in the `~.ufns.elements.NodeTree`. The parities and delays of the pending nodes are calculated by `~.ufns.elements.NodeTree.ns_parity` and `~.ufns.elements.NodeTree.ns_delay`. The node-tree is then grown by `grow_node_tree`.
 
         Parameters
         ----------
@@ -210,54 +192,31 @@ class Toric(UFToric):
         """
         cluster.support = 1 - cluster.support
 
-        if self.config["print_steps"]:
-            print(f"{cluster}, ", end="")
-
-        for node, edge, parent_node in cluster.root_node.root_list:
-            node.ns_parity(parent_node)
-            min_delay = node.ns_delay((parent_node, edge))
-            if min_delay < cluster.min_delay:
-                cluster.min_delay = min_delay
-        if cluster.root_node.root_list:
-            cluster.root_node.root_list = []
-            if self.config["print_tree"]:
-                print_tree(cluster.root_node)
+        node_tree = cluster.node_tree
+        if node_tree.pending < len(node_tree):
+            node_tree.ns_parity()
+            node_tree.ns_delay()
 
-        self.grow_node(cluster, cluster.root_node, union_list)
+        self.grow_node_tree(cluster, union_list)
 
-        if self.config["print_steps"]:
-            print("")
+    def grow_node_tree(self, cluster: Cluster, union_list: UL):
+        """Grows all nodes in the node-tree of ``cluster`` that are not suspended.
 
-    def grow_node(self, cluster: Cluster, node: Node, union_list: UL, parent_node: Optional[Node] = None):
-        """Recursive function that grows a ``node`` and its descendents.
-
-        Grows the boundary list that is stored at the current node if there the current node is not suspended. The condition required is the following:
+        Grows the boundary list that is stored at a node if the node is not suspended. The condition required is the following:
 
         .. math: n_{\\text{delay}} - n_{\\text{waited}} - \\min_{x \\in \\mathcal{N}}{n_{\\text{delay}}} = 0
 
-        where :math:`\\mathcal{N}` is the node-tree. The minimal delay value in the node-tree here stored as ``cluster.min_delay``. Fully grown edges are added to ``union_list`` to be later considered by `union_bucket`.
+        where :math:`\\mathcal{N}` is the node-tree. The nodes that satisfy this condition are maintained by the `~.ufns.elements.NodeTree` of the cluster and returned by `~.ufns.elements.NodeTree.grow`, such that suspended nodes are not inspected. Fully grown edges are added to ``union_list`` to be later considered by `union_bucket`.
 
         Parameters
         ----------
         cluster
-            Parent cluster object of ``node``.
-        node
-            Node to consider for growth.
+            Cluster to grow.
         union_list
             List of potential mergers between two cluster-distinct ancillas.
-        parent_node
-            Parent node in the node-tree to indicate recursive direction.
         """
-        if node.delay - node.waited == cluster.min_delay:
+        for node in cluster.node_tree.grow():
             self.grow_node_boundary(node, union_list)
-            if self.config["print_steps"]:
-                print(node._repr_status, end="; ")
-        else:
-            node.waited += 1
-
-        for child_node, _ in node.neighbors:
-            if child_node is not parent_node:
-                self.grow_node(cluster, child_node, union_list, node)
 
     def grow_node_boundary(self, node: Node, union_list: UL):
         """Grows the boundary of a ``node``."""
@@ -283,10 +242,9 @@ class Toric(UFToric):
         """Potentially merges two neighboring ancillas.
 
         If the check by `union_check` is passed, the clusters of ``ancilla`` and ``new_ancilla`` are merged. additionally, the node-trees either directly joined, or by the creation of a new *junction-node* which as ``new_ancilla`` as its primer. Weighted union is applied to ensure low operating complexity.
-        """
-        if union_list and self.config["print_steps"]:
-            print("Fusing clusters")
 
+        The node-trees are joined by `~.ufns.elements.NodeTree.join`. If the merged cluster has odd parity, the tree of the even cluster is joined to the tree of the odd cluster and its nodes are pending for the parity and delay calculations in `grow_boundary`. If the merged cluster has even parity, the smaller tree is joined to the larger tree.
+        """
         for ancilla, edge, new_ancilla in union_list:
             cluster = self.get_cluster(ancilla)
             new_cluster = self.get_cluster(new_ancilla)
@@ -294,12 +252,15 @@ class Toric(UFToric):
             if self.union_check(edge, ancilla, new_ancilla, cluster, new_cluster):
 
                 node, new_node = ancilla.node, new_ancilla.node
+                node_tree, new_node_tree = cluster.node_tree, new_cluster.node_tree
                 even = (cluster.parity + new_cluster.parity) % 2 == 0
 
                 if not even and new_cluster.parity % 2 == 0:
-                    root_node, parent, child = cluster.root_node, node, new_node
+                    root_tree, parent, child = node_tree, node, new_node
+                elif not even or len(new_node_tree) >= len(node_tree):
+                    root_tree, parent, child = new_node_tree, new_node, node
                 else:
-                    root_node, parent, child = new_cluster.root_node, new_node, node
+                    root_tree, parent, child = node_tree, node, new_node
 
                 if not node.radius % 2 and new_node.radius > 1:  # Connect via new junction-node
                     junction = self._Junction(new_ancilla)
@@ -308,25 +269,18 @@ class Toric(UFToric):
                     junction.neighbors = [(parent, parent_edge), (child, child_edge)]
                     parent.neighbors.append((junction, parent_edge))
                     child.neighbors.append((junction, child_edge))
-                    calc_delay = [junction, parent_edge, parent]
+                    root_tree.join(parent, junction, parent_edge, pending=not even)
                 else:  # Connect directly
                     edge = (parent.radius + child.radius) // 2
                     parent.neighbors.append((child, edge))
                     child.neighbors.append((parent, edge))
-                    calc_delay = [child, edge, parent]
-                if not even:
-                    root_node.root_list.append(calc_delay)
+                    root_tree.join(parent, child, edge, pending=not even)
 
-                string = "{}∪{}=".format(cluster, new_cluster) if self.config["print_steps"] else ""
                 if cluster.size < new_cluster.size:
                     cluster, new_cluster = new_cluster, cluster
-                cluster.union(new_cluster)
-                cluster.root_node = root_node
-                if string:
-                    print(string, cluster)
+                self.union_clusters(cluster, new_cluster)
+                cluster.node_tree = root_tree
 
-        if union_list and self.config["print_steps"]:
-            print("")
         self.bound_ancilla_to_node()
 
 
@@ -337,3 +291,12 @@ class Planar(Toric, UFPlanar):
     """
 
     pass
+
+
+class Rotated(Planar, UFRotated):
+    """Union-Find Node-Suspension decoder for the rotated lattice.
+
+    See the description of `.ufns.sim.Toric`.
+    """
+
+    pass
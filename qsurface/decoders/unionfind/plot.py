@@ -23,10 +23,16 @@ class Toric(SimToric, Plot):
         Waits for user after every edge removed due to cycle detection. Default is false.
     step_peel : bool, optional
         Waits for user after every edge removed during peeling. Default is false.
+
+    Frontier growth (see `.unionfind.sim.Toric.grow_frontier`) does not grow edges individually and is thus disabled for the plotting decoder.
     """
 
     opposite_keys = dict(n="s", s="n", e="w", w="e")
 
+    def __init__(self, *args, **kwargs) -> None:
+        kwargs["frontier_growth"] = False
+        super().__init__(*args, **kwargs)
+
     def decode(self, *args, **kwargs):
         # Inherited docstring
         params = self.code.figure.params if hasattr(self.code, "figure") else None
@@ -109,10 +115,8 @@ class Toric(SimToric, Plot):
 
     def _edge_grow(self, ancilla, edge, new_ancilla, **kwargs):
         # Inherited docsting
+        super()._edge_grow(ancilla, edge, new_ancilla, **kwargs)
         if self.support[edge] == 1:
-            self._edge_full(ancilla, edge, new_ancilla, **kwargs)
-        else:
-            self.support[edge] += 1
             self.figure._plot_half_edge(edge, ancilla, self.code.instance)
 
     def _edge_peel(self, edge, variant="", **kwargs):
@@ -4,6 +4,9 @@ from ...codes.elements import AncillaQubit, Edge, PseudoQubit
 from .elements import Cluster
 from .._template import Sim
 from collections import defaultdict
+from itertools import compress
+from operator import itemgetter
+import numpy
 
 
 class Toric(Sim):
@@ -24,8 +27,14 @@ class Toric(Sim):
         Enables weighted union, Default is true. See `union_bucket`.
     dynamic_forest : bool, optional
         Enables dynamically mainted forests. Default is true.
+    frontier_growth : bool, optional
+        Grows all odd-parity clusters synchronously, one vectorized half-edge step per round. Default is false. Overrides ``weighted_growth``. See `grow_frontier`.
+    edge_weights : bool, optional
+        Grows each edge in a number of steps proportional to its log-likelihood weight. Default is false. See `set_edge_lengths`.
+    edge_resolution : int, optional
+        Number of growth steps of the most likely edges if ``edge_weights`` is enabled. Default is 2.
     print_steps : bool, optional
-        Prints additional decoding information. Default is false.
+        Prints additional decoding information by attaching a `~.decoders._template.Printer` hook. Default is false. See `trace_events`.
     kwargs
         Keyword arguments are forwarded to `~.decoders._template.Sim`.
 
@@ -45,6 +54,12 @@ class Toric(Sim):
         -2      added to matching
         =====   ========================
 
+    edge_index : dict
+        Integer index of each edge if ``frontier_growth`` is enabled. See `grow_frontier`.
+    edge_lengths : dict
+        Number of growth steps required to fully grow each edge if ``edge_weights`` is enabled. See `set_edge_lengths`.
+    edge_growth : `~collections.defaultdict`
+        Number of growth steps applied to each edge in the current round if ``edge_weights`` is enabled.
     buckets : `~collections.defaultdict`
         Ordered dictionary (by index) for bucket growth (implementation of weighted growth). See `grow_clusters`.
     bucket_max_filled : int
@@ -53,19 +68,41 @@ class Toric(Sim):
         List of all clusters at initialization.
     cluster_index : int
         Index value for cluster differentiation.
+    trace_events : dict
+        Events emitted to the hooks of the decoder, see `~.decoders._template.Sim.add_hook`.
+
+        ==================  =======  ===========================================
+        method              event    arguments
+        ==================  =======  ===========================================
+        `grow_bucket`       bucket   bucket, bucket number
+        `grow_frontier`     bucket   bucket, bucket number
+        `grow_boundary`     grow     cluster, union list
+        `union_clusters`    union    root cluster, child cluster
+        `_edge_peel`        peel     edge, variant ("peel" or "cycle")
+        `flip_edge`         match    ancilla, edge, new ancilla
+        ==================  =======  ===========================================
     """
 
     name = "Union-Find"
     short = "unionfind"
     _Cluster = Cluster
 
+    trace_events = dict(
+        grow_bucket="bucket",
+        grow_frontier="bucket",
+        grow_boundary="grow",
+        union_clusters="union",
+        _edge_peel="peel",
+        flip_edge="match",
+    )
+
     compatibility_measurements = dict(
         PerfectMeasurements=True,
-        FaultyMeasurements=False,
+        FaultyMeasurements=True,
     )
     compatibility_errors = dict(
         pauli=True,
-        erasure=False,
+        erasure=True,
     )
 
     def __init__(self, *args, **kwargs) -> None:
@@ -94,6 +131,9 @@ class Toric(Sim):
                             self.code.ancilla_qubits[(ancilla_qubit.z + 1) % self.code.layers][ancilla_qubit.loc]
                         ]
                     ] = 0
+        if self.config["frontier_growth"]:
+            self.config["weighted_growth"] = False
+            self.edge_index = {edge: i for i, edge in enumerate(self.support)}
         if self.config["weighted_growth"]:
             self.buckets_num = self.code.size[0] * self.code.size[1] * self.code.layers * 2
         else:
@@ -102,6 +142,9 @@ class Toric(Sim):
         self.bucket_max_filled = 0
         self.clusters = []
         self.cluster_index = 0
+        self.edge_lengths = {}
+        self.edge_growth = defaultdict(int)
+        self.edge_rates = None
 
     def decode(self, **kwargs):
         """Decodes the code using the Union-Find algorithm.
@@ -112,6 +155,8 @@ class Toric(Sim):
         2.  Growing and merging these clusters.
         3.  Peeling the clusters using the Peeling algorithm.
 
+        If ``edge_weights`` is enabled, the growth lengths of the edges are updated by `set_edge_lengths` whenever the error rates of the code have changed.
+
         Parameters
         ----------
         kwargs
@@ -122,6 +167,10 @@ class Toric(Sim):
         self.cluster_index = 0
         self.clusters = []
         self.support = {edge: 0 for edge in self.support}
+        if self.config["edge_weights"]:
+            self.edge_growth = defaultdict(int)
+            if self.code.error_rates != self.edge_rates:
+                self.set_edge_lengths(**self.code.error_rates)
         self.find_clusters(**kwargs)
         self.grow_clusters(**kwargs)
         self.peel_clusters(**kwargs)
@@ -155,7 +204,7 @@ class Toric(Sim):
     ):
         """Recursively adds erased edges to ``cluster`` and finds the new boundary.
 
-        For a given ``ancilla``, this function finds the neighboring edges and ancillas that are in the the currunt cluster. If the newly found edge is erased, the edge and the corresponding ancilla will be added to the cluster, and the function applied recursively on the new ancilla. Otherwise, the neighbor is added to the new boundary ``self.new_bound``.
+        For a given ``ancilla``, this function finds the neighboring edges and ancillas that are in the the currunt cluster. If the newly found edge is erased, the edge and the corresponding ancilla will be added to the cluster, and the function applied recursively on the new ancilla. Otherwise, the neighbor is added to the new boundary by `_add_boundary`. An ancilla that is added via the erased edge from ``parent`` is passed to `_ancilla_joined`.
 
         Parameters
         ----------
@@ -163,8 +212,12 @@ class Toric(Sim):
             Current active cluster
         ancilla
             Ancilla from which the connected erased edges or boundary are searched.
+        parent
+            Ancilla from which ``ancilla`` is reached via an erased edge.
         """
         cluster.add_ancilla(ancilla)
+        if parent is not None:
+            self._ancilla_joined(cluster, ancilla, parent)
 
         for (new_ancilla, edge) in self.get_neighbors(ancilla).values():
             if (
@@ -179,17 +232,29 @@ class Toric(Sim):
                     self._edge_full(ancilla, edge, new_ancilla)
                     self.cluster_add_ancilla(cluster, new_ancilla, parent=ancilla)
             elif new_ancilla.cluster is not cluster:  # Make sure new bound does not lead to self
-                cluster.new_bound.append((ancilla, edge, new_ancilla))
+                self._add_boundary(cluster, ancilla, edge, new_ancilla)
+
+    def _ancilla_joined(self, cluster: Cluster, ancilla: AncillaQubit, parent: AncillaQubit):
+        """Hook that is called when ``ancilla`` is added to ``cluster`` via the erased edge from ``parent``."""
+        pass
+
+    def _add_boundary(self, cluster: Cluster, ancilla: AncillaQubit, edge: Edge, new_ancilla: AncillaQubit):
+        """Adds the boundary ``(ancilla, edge, new_ancilla)`` to the new boundary of ``cluster``."""
+        cluster.new_bound.append((ancilla, edge, new_ancilla))
 
     def _edge_peel(self, edge: Edge, variant: str = ""):
         """Peels or removes an edge"""
         self.support[edge] = -1
-        if self.config["print_steps"]:
-            print(f"del {edge} ({variant})")
 
     def _edge_grow(self, ancilla, edge, new_ancilla, **kwargs):
         """Grows the edge in support."""
-        if self.support[edge] == 1:
+        if self.config["edge_weights"]:
+            self.edge_growth[edge] += 1
+            if self.edge_growth[edge] >= self.edge_lengths[edge]:
+                self._edge_full(ancilla, edge, new_ancilla, **kwargs)
+            else:
+                self.support[edge] = 1
+        elif self.support[edge] == 1:
             self._edge_full(ancilla, edge, new_ancilla, **kwargs)
         else:
             self.support[edge] += 1
@@ -198,6 +263,43 @@ class Toric(Sim):
         """Fully grows an edge."""
         self.support[edge] = 2
 
+    def set_edge_lengths(self, **kwargs):
+        """Sets the number of growth steps of each edge from its log-likelihood weight.
+
+        The probability :math:`p_e` that an edge is flipped is obtained from the code by `~.codes._template.sim.PerfectMeasurements.edge_probability`, which combines the probabilities supplied by the loaded error modules and, for faulty measurements, the measurement error rates for the vertical edges. The weight of an edge is
+
+        .. math:: w_e = \\log\\frac{1-p_e}{p_e},
+
+        and its length is set to :math:`\\max(1, \\text{round}(r w_e / w_{min}))`, where :math:`r` is ``edge_resolution`` and :math:`w_{min}` the weight of the most likely edge. Edges with :math:`p_e \\geq 1/2` have length 1. Edges that are never flipped are set to the longest length of all other edges, such that clusters can still merge over these edges. If no edge can be flipped, all lengths equal the resolution. For a resolution of 2 and uniform noise, the decoder thus grows identically to the unweighted decoder.
+
+        An edge is fully grown if the number of growth steps from either side equals its length, thus clusters grow further over likely edges in the same number of steps. Erased edges are added to clusters directly by `cluster_add_ancilla` and are not affected by the length.
+
+        Parameters
+        ----------
+        kwargs
+            Error rates passed on to `~.codes._template.sim.PerfectMeasurements.edge_probability`.
+        """
+        resolution = self.config["edge_resolution"]
+        weights = {}
+        for edge in self.support:
+            probability = self.code.edge_probability(edge, **kwargs)
+            if probability >= 0.5:
+                weights[edge] = 0
+            elif probability > 0:
+                weights[edge] = numpy.log((1 - probability) / probability)
+
+        min_weight = min([weight for weight in weights.values() if weight > 0], default=None)
+        if min_weight is None:
+            lengths = {edge: resolution for edge in weights}
+        else:
+            lengths = {edge: max(1, int(round(resolution * weight / min_weight))) for edge, weight in weights.items()}
+        max_length = max(lengths.values(), default=resolution)
+
+        self.edge_lengths = {edge: lengths.get(edge, max_length) for edge in self.support}
+        self.edge_rates = dict(kwargs)
+        if self.config["weighted_growth"]:
+            self.buckets_num = self.code.size[0] * self.code.size[1] * self.code.layers * max(max_length, 2)
+
     """
     -------------------------------------------------------------------------------------------
                                     1. Find clusters
@@ -221,9 +323,6 @@ class Toric(Sim):
 
         self.place_bucket(self.clusters, -1)
 
-        if self.config["print_steps"]:
-            print(f"Found clusters:\n" + ", ".join(map(str, self.clusters)) + "\n")
-
     """
     -------------------------------------------------------------------------------------------
                                     2(a). Grow clusters expansion
@@ -252,7 +351,7 @@ class Toric(Sim):
 
         For clusters with ``cluster.support==1`` or with half-grown edges at the boundary, the new boundary at ``clusters.new_bound`` consists of the same half-grown edges. For clusters with ``cluster.support==0``, the new boundary is found by ``cluster_add_ancilla``.
 
-        If *weighted_growth* is disabled, odd-parity clusters are always placed in ``self.buckets[0]``. The same checks for ``cluster.bucket`` and ``cluster.support`` are applied to ensure clusters growth is valid.
+        If *weighted_growth* is disabled, odd-parity clusters are always placed in ``self.buckets[0]``. The same checks for ``cluster.bucket`` and ``cluster.support`` are applied to ensure clusters growth is valid. If *frontier_growth* is enabled, the clusters in ``self.buckets[0]`` are grown together by `grow_frontier` instead of `grow_bucket`.
         """
         if self.config["weighted_growth"]:
             for bucket_i in range(self.buckets_num):
@@ -264,9 +363,10 @@ class Toric(Sim):
                     self.union_bucket(union_list)
                     self.place_bucket(place_list, bucket_i)
         else:
+            grow_bucket = self.grow_frontier if self.config["frontier_growth"] else self.grow_bucket
             bucket_i = 0
             while self.buckets[0]:
-                union_list, place_list = self.grow_bucket(self.buckets.pop(0), bucket_i)
+                union_list, place_list = grow_bucket(self.buckets.pop(0), bucket_i)
                 self.union_bucket(union_list)
                 self.place_bucket(place_list, bucket_i)
                 bucket_i += 1
@@ -290,10 +390,6 @@ class Toric(Sim):
         list
             List of odd-parity clusters to be placed in new buckets.
         """
-        if self.config["print_steps"]:
-            string = f"Growing bucket {bucket_i} of clusters:"
-            print("=" * len(string) + "\n" + string)
-
         union_list, place_list = [], []
         while bucket:  # Loop over all clusters in the current bucket\
             cluster = bucket.pop().find()
@@ -301,9 +397,6 @@ class Toric(Sim):
                 place_list.append(cluster)
                 self.grow_boundary(cluster, union_list)
 
-        if self.config["print_steps"]:
-            print("\n")
-
         return union_list, place_list
 
     def grow_boundary(self, cluster: Cluster, union_list: List[Tuple[AncillaQubit, Edge, AncillaQubit]], **kwargs):
@@ -332,8 +425,54 @@ class Toric(Sim):
                 else:
                     cluster.new_bound.append(boundary)
 
-        if self.config["print_steps"]:
-            print(f"{cluster}, ", end="")
+    def grow_frontier(self, bucket: List[Cluster], bucket_i: int, **kwargs) -> Tuple[List, List]:
+        """Grows the boundaries of all clusters in the current bucket in a single vectorized step.
+
+        The boundaries of all valid clusters in ``bucket`` are concatenated into a single frontier, and the edges of the frontier are converted to an array of indices of ``self.edge_index``. The growth states of the distinct edges are gathered from ``self.support``, and every edge that is not yet fully grown is grown at once by a half-edge, or by a single step of its length if ``edge_weights`` is enabled, for each time it occurs in the frontier. An edge that lies in the frontier of two clusters is thus grown from both sides within the same round, which results in the same growth states as growing the boundaries one by one with `grow_boundary`. The new growth states are written back to ``self.support``.
+
+        Edges that are fully grown in this round are added to ``union_list`` only once, such that a cluster union on some edge is not later mistaken for a cycle on the same edge. Edges that are not yet fully grown are kept in the new boundary of each of their clusters. The per-edge methods `_edge_grow` and `_edge_full` are not called.
+
+        See `grow_bucket` for the parameters and return values.
+        """
+        union_list, place_list = [], []
+        frontier, sizes = [], [0]
+        while bucket:
+            cluster = bucket.pop().find()
+            if cluster.bucket == bucket_i and cluster.support == bucket_i % 2:
+                place_list.append(cluster)
+                cluster.support = 1 - cluster.support
+                frontier.extend(cluster.new_bound)
+                sizes.append(len(cluster.new_bound))
+
+        if frontier:
+            # Gather the growth states of the distinct frontier edges
+            frontier_edges = list(map(itemgetter(1), frontier))
+            index = numpy.fromiter(map(self.edge_index.__getitem__, frontier_edges), dtype=numpy.intp, count=len(frontier))
+            _, first, inverse, steps = numpy.unique(index, return_index=True, return_inverse=True, return_counts=True)
+            edges = list(map(frontier_edges.__getitem__, first.tolist()))
+            states = numpy.fromiter(map(self.support.__getitem__, edges), dtype=numpy.intp, count=len(edges))
+            steps *= states != 2
+
+            # Grow all edges at once and scatter the new states
+            if self.config["edge_weights"]:
+                growth = numpy.fromiter(map(self.edge_growth.__getitem__, edges), dtype=numpy.intp, count=len(edges))
+                lengths = numpy.fromiter(map(self.edge_lengths.__getitem__, edges), dtype=numpy.intp, count=len(edges))
+                growth += steps
+                self.edge_growth.update(zip(edges, growth.tolist()))
+                new_states = numpy.where((growth >= lengths) | (states == 2), 2, 1)
+            else:
+                new_states = numpy.minimum(states + steps, 2)
+            self.support.update(zip(edges, new_states.tolist()))
+
+            # Split the frontier into the union list and the new boundaries
+            union_list.extend(map(frontier.__getitem__, first[(new_states == 2) & (states != 2)].tolist()))
+            keep = (new_states != 2)[inverse]
+            kept = list(compress(frontier, keep.tolist()))
+            ends = numpy.concatenate(([0], numpy.cumsum(keep)))[numpy.cumsum(sizes)].tolist()
+            for cluster, start, end in zip(place_list, ends, ends[1:]):
+                cluster.new_bound = kept[start:end]
+
+        return union_list, place_list
 
     """
     -------------------------------------------------------------------------------------------
@@ -344,7 +483,7 @@ class Toric(Sim):
     def union_bucket(self, union_list: List[Tuple[AncillaQubit, Edge, AncillaQubit]], **kwargs):
         """Merges clusters in ``union_list`` if checks are passed.
 
-        Items in ``union_list`` consists of ``[ancillaA, edge, ancillaB]`` of two ancillas that, at the time added to the list, were not part of the same cluster. The cluster of an ancilla is stored at ``ancilla.cluster``, but due to cluster mergers the cluster at ``ancilla_cluster`` may not be the root element in the cluster-tree, and thus the cluster must be requested by ``ancilla.cluster.`` `~.unionfind.elements.Cluster.find`. Since the clusters of ``ancillaA`` and ``ancillaB`` may have already merged, checks are performed in `union_check` after which the clusters are conditionally merged on ``edge`` by `union_edge`.
+        Items in ``union_list`` consists of ``[ancillaA, edge, ancillaB]`` of two ancillas that, at the time added to the list, were not part of the same cluster. The cluster of an ancilla is stored at ``ancilla.cluster``, but due to cluster mergers the cluster at ``ancilla_cluster`` may not be the root element in the cluster-tree, and thus the cluster must be requested by ``ancilla.cluster.`` `~.unionfind.elements.Cluster.find`. Since the clusters of ``ancillaA`` and ``ancillaB`` may have already merged, checks are performed in `union_check` after which the clusters are conditionally merged on ``edge`` by `union_clusters`.
 
         If ``weighted_union`` is enabled, the smaller cluster is always made a child of the bigger cluster in the cluster-tree. This ensures the that the depth of the tree is minimized and the future calls to `~.unionfind.elements.Cluster.find` is reduced.
 
@@ -355,24 +494,18 @@ class Toric(Sim):
         union_list
             List of potential mergers between two cluster-distinct ancillas.
         """
-        if union_list and self.config["print_steps"]:
-            print("Cluster unions.")
-
         for ancilla, edge, new_ancilla in union_list:
             cluster = self.get_cluster(ancilla)
             new_cluster = self.get_cluster(new_ancilla)
 
             if self.union_check(edge, ancilla, new_ancilla, cluster, new_cluster):
-                string = "{}∪{}=".format(cluster, new_cluster) if self.config["print_steps"] else ""
-
                 if self.config["weighted_union"] and cluster.size < new_cluster.size:
                     cluster, new_cluster = new_cluster, cluster
-                cluster.union(new_cluster)
-                if string:
-                    print(string, cluster)
+                self.union_clusters(cluster, new_cluster)
 
-        if union_list and self.config["print_steps"]:
-            print("")
+    def union_clusters(self, cluster: Cluster, new_cluster: Cluster):
+        """Merges ``new_cluster`` into ``cluster``, which becomes the root of the joined cluster-tree."""
+        cluster.union(new_cluster)
 
     def union_check(
         self,
@@ -404,7 +537,7 @@ class Toric(Sim):
     def place_bucket(self, clusters: List[Cluster], bucket_i: int):
         """Places all clusters in ``clusters`` in a bucket if parity is odd.
 
-        If ``weighted_growth`` is enabled. the cluster is placed in a new bucket based on its size, otherwise it is placed in ``self.buckets[0]``
+        If ``weighted_growth`` is enabled. the cluster is placed in a new bucket based on its size, otherwise it is placed in ``self.buckets[0]``. If ``edge_weights`` is enabled, a cluster may not have added any edge after two growth steps. Such a cluster is placed in the next bucket of the same parity. Without weighted growth, the growth state ``cluster.support`` is aligned with the next round, as the root of a cluster formed by union may not have been grown in the current round.
 
         Parameters
         ----------
@@ -420,12 +553,15 @@ class Toric(Sim):
             if cluster.parity % 2 == 1:
                 if self.config["weighted_growth"]:
                     cluster.bucket = 2 * (cluster.size - 1) + cluster.support
+                    if self.config["edge_weights"] and cluster.bucket <= bucket_i:
+                        cluster.bucket += 2 * ((bucket_i - cluster.bucket) // 2 + 1)
                     self.buckets[cluster.bucket].append(cluster)
                     if cluster.bucket > self.bucket_max_filled:
                         self.bucket_max_filled = cluster.bucket
                 else:
                     self.buckets[0].append(cluster)
                     cluster.bucket = bucket_i + 1
+                    cluster.support = cluster.bucket % 2
             else:
                 cluster.bucket = None
 
@@ -440,8 +576,6 @@ class Toric(Sim):
 
         To make sure that all cluster-trees are fully peeled, all ancillas are considered in the loop. If the ancilla has not been peeled before and belongs to a cluster of the current simulation, the ancilla is considered for peeling by `peel_leaf`.
         """
-        if self.config["print_steps"]:
-            print("================\nPeeling clusters")
         for layer in self.code.ancilla_qubits.values():
             for ancilla in layer.values():
                 if ancilla.peeled != self.code.instance and ancilla.cluster and ancilla.cluster.instance == self.code.instance:
@@ -497,8 +631,6 @@ class Toric(Sim):
         ancilla.syndrome = not ancilla.syndrome
         new_ancilla.syndrome = not new_ancilla.syndrome
         self.support[edge] = -2
-        if self.config["print_steps"]:
-            print(f"{edge} to matching")
 
     def static_forest(self, ancilla: AncillaQubit):
         """Constructs an acyclic forest in the cluster of ``ancilla``.
@@ -536,7 +668,7 @@ class Planar(Toric):
     ):
         """Recursively adds erased edges to ``cluster`` and finds the new boundary.
 
-        For a given ``ancilla``, this function finds the neighboring edges and ancillas that are in the the currunt cluster. If the newly found edge is erased, the edge and the corresponding ancilla will be added to the cluster, and the function applied recursively on the new ancilla. Otherwise, the neighbor is added to the new boundary ``self.new_bound``.
+        See `.unionfind.sim.Toric.cluster_add_ancilla`. An erased edge to a `~.codes.elements.PseudoQubit` is peeled if the cluster is already on the boundary, and otherwise adds the pseudo-qubit to the cluster, which is also passed to `_ancilla_joined`.
 
         Parameters
         ----------
@@ -544,8 +676,12 @@ class Planar(Toric):
             Current active cluster
         ancilla
             Ancilla from which the connected erased edges or boundary are searched.
+        parent
+            Ancilla from which ``ancilla`` is reached via an erased edge.
         """
         cluster.add_ancilla(ancilla)
+        if parent is not None:
+            self._ancilla_joined(cluster, ancilla, parent)
 
         for (new_ancilla, edge) in self.get_neighbors(ancilla).values():
             if (
@@ -560,6 +696,7 @@ class Planar(Toric):
                     else:
                         self._edge_full(ancilla, edge, new_ancilla)
                         cluster.add_ancilla(new_ancilla)
+                        self._ancilla_joined(cluster, new_ancilla, ancilla)
                 else:
                     if new_ancilla.cluster == cluster:
                         self._edge_peel(edge, variant="cycle")
@@ -569,7 +706,7 @@ class Planar(Toric):
             elif new_ancilla.cluster is not cluster and not (
                 isinstance(new_ancilla, PseudoQubit) and cluster.on_bound
             ):  # Make sure new bound does not lead to self
-                cluster.new_bound.append((ancilla, edge, new_ancilla))
+                self._add_boundary(cluster, ancilla, edge, new_ancilla)
 
     def union_check(
         self,
@@ -595,7 +732,7 @@ class Planar(Toric):
     def place_bucket(self, clusters: List[Cluster], bucket_i: int):
         """Places all clusters in ``clusters`` in a bucket if parity is odd.
 
-        If ``weighted_growth`` is enabled. the cluster is placed in a new bucket based on its size, otherwise it is placed in ``self.buckets[0]``
+        If ``weighted_growth`` is enabled. the cluster is placed in a new bucket based on its size, otherwise it is placed in ``self.buckets[0]``. If ``edge_weights`` is enabled, a cluster may not have added any edge after two growth steps. Such a cluster is placed in the next bucket of the same parity. Without weighted growth, the growth state ``cluster.support`` is aligned with the next round, as the root of a cluster formed by union may not have been grown in the current round.
 
         Parameters
         ----------
@@ -611,23 +748,31 @@ class Planar(Toric):
             if cluster.parity % 2 == 1 and not cluster.on_bound:
                 if self.config["weighted_growth"]:
                     cluster.bucket = 2 * (cluster.size - 1) + cluster.support
+                    if self.config["edge_weights"] and cluster.bucket <= bucket_i:
+                        cluster.bucket += 2 * ((bucket_i - cluster.bucket) // 2 + 1)
                     self.buckets[cluster.bucket].append(cluster)
                     if cluster.bucket > self.bucket_max_filled:
                         self.bucket_max_filled = cluster.bucket
                 else:
                     self.buckets[0].append(cluster)
                     cluster.bucket = bucket_i + 1
+                    cluster.support = cluster.bucket % 2
             else:
                 cluster.bucket = None
 
     def static_forest(self, ancilla: AncillaQubit, found_bound: str = False, **kwargs) -> bool:
-        # Inherited docsting
-        if not found_bound and ancilla.cluster.find().parity % 2 == 0:
-            found_bound = True
+        """Constructs an acyclic forest in the cluster of ``ancilla``.
+
+        See `.unionfind.sim.Toric.static_forest`. The boundary is considered as a single vertex, such that only the first edge to a `~.codes.elements.PseudoQubit` is kept in the forest and all others are removed as a cycle. A pseudo-qubit connected to multiple ancillas may be the only link between two parts of a cluster, thus one edge to the boundary is kept even if the cluster has even parity.
 
+        Parameters
+        ----------
+        ancilla
+        found_bound
+            Whether an edge to the boundary has already been added to the forest.
+        """
         ancilla.forest = self.code.instance
-        for key in ancilla.parity_qubits:
-            (new_ancilla, edge) = self.get_neighbor(ancilla, key)
+        for (new_ancilla, edge) in self.get_neighbors(ancilla).values():
 
             if self.support[edge] == 2:
 
@@ -647,20 +792,47 @@ class Planar(Toric):
                     found_bound = self.static_forest(new_ancilla, found_bound=found_bound)
         return found_bound
 
+    def peel_leaf(self, cluster, ancilla):
+        """Recursive function which peels a branch of the tree if the input ancilla is a pendant ancilla
+
+        See `.unionfind.sim.Toric.peel_leaf`. A `~.codes.elements.PseudoQubit` is never peeled as a pendant ancilla here. The boundary can absorb any parity and is thus kept as the root of the tree. Remaining edges to the boundary are peeled in `peel_clusters`.
+        """
+        if type(ancilla) is not PseudoQubit:
+            super().peel_leaf(cluster, ancilla)
+
+    def find_leaf(self, cluster: Cluster, ancilla: AncillaQubit, **kwargs):
+        """Finds the single fully grown edge of ``ancilla`` within ``cluster``, if it is a pendant ancilla.
+
+        A `~.codes.elements.PseudoQubit` may be connected to more than one ancilla, e.g. on the rotated lattice, such that ``pseudo.cluster`` may point to a different cluster. A fully grown edge to a pseudo-qubit is therefore always considered to be within ``cluster``.
+        """
+        num_connect, leaf = 0, ()
+        for key, neighbor in self.get_neighbors(ancilla).items():
+            (new_ancilla, edge) = neighbor
+            if self.support[edge] == 2:
+                if type(new_ancilla) is PseudoQubit or self.get_cluster(new_ancilla) is cluster:
+                    num_connect += 1
+                    leaf = (key, neighbor)
+            if num_connect > 1:
+                return
+        if num_connect == 1:
+            return leaf
+
     def peel_clusters(self, **kwargs):
-        # Inherited docstring
+        """Loops over all clusters to find pendant ancillas to peel.
+
+        See `.unionfind.sim.Toric.peel_clusters`. After all ancillas are considered, only the paths between multiple connections to the boundary remain in a cluster. Every remaining fully grown edge to a `~.codes.elements.PseudoQubit` is then treated as a separate pendant boundary vertex. The edge is peeled and the peel is continued from its ancilla, which resolves the path towards the next connection to the boundary.
+        """
         super().peel_clusters(**kwargs)
         for layer in self.code.pseudo_qubits.values():
             for ancilla in layer.values():
                 if ancilla.peeled != self.code.instance and ancilla.cluster and ancilla.cluster.instance == self.code.instance:
                     if not self.config["dynamic_forest"]:
                         self.static_forest(ancilla)
-                    cluster = self.get_cluster(ancilla)
-                    leaf = self.find_leaf(cluster, ancilla)
-                    if leaf:
-                        key, (new_ancilla, edge) = leaf
-                        self._edge_peel(edge, variant="peel")
-                        self.peel_leaf(cluster, new_ancilla)
+                    ancilla.peeled = self.code.instance
+                    for (new_ancilla, edge) in self.get_neighbors(ancilla).values():
+                        if self.support[edge] == 2:
+                            self._edge_peel(edge, variant="peel")
+                            self.peel_leaf(self.get_cluster(new_ancilla), new_ancilla)
 
 class Rotated(Planar):
     pass
\ No newline at end of file
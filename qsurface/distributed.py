@@ -0,0 +1,221 @@
+"""
+Distributed simulations over TCP. A `Coordinator` divides simulations into chunks of iterations, exactly as a `~.main.WorkerPool`, but serves the chunks over TCP connections to worker agents, which may run on the same host or on other hosts. An agent is started by `run_worker` or `run_workers`, or from the command line by::
+
+    python -m qsurface worker -a HOST:PORT -mp 8 -k AUTHKEY
+
+The connections use `multiprocessing.connection`, such that the coordinator and agents only require the standard library and qsurface itself. Every message is pickled, and the connections are authenticated by a shared ``authkey``. As a peer that knows the ``authkey`` can send arbitrary pickled objects, and thus execute arbitrary code, a secret ``authkey`` is required for any address that is not a loopback address, see `get_authkey`. Only on loopback addresses, the default key ``"qsurface"`` is used if no key is given.
+"""
+from __future__ import annotations
+from typing import Optional, Tuple
+from multiprocessing import Process, cpu_count
+from multiprocessing.connection import Client, Connection, Listener
+import queue
+import sys
+import threading
+from .main import WorkerPool, _pool_worker, module_or_name
+
+address_type = Tuple[str, int]
+LOOPBACK_HOSTS = ["localhost", "127.0.0.1", "::1"]
+
+
+def get_authkey(address: address_type, authkey: Optional[str] = None) -> bytes:
+    """Returns the key to authenticate connections on ``address``.
+
+    If no ``authkey`` is given, the default key ``"qsurface"`` is returned for loopback addresses, and a `ValueError` is raised for all other addresses, including the empty host that listens on all interfaces.
+    """
+    if authkey is None:
+        if address[0] not in LOOPBACK_HOSTS and not address[0].startswith("127."):
+            raise ValueError(f"A secret authkey is required for the non-loopback address {address[0]}.")
+        authkey = "qsurface"
+    return authkey.encode()
+
+
+class Coordinator(WorkerPool):
+    """Pool of worker agents that are connected over TCP.
+
+    The coordinator listens on ``address`` from its creation. Each agent that connects receives the ``Code``, ``Decoder`` and keyword arguments for `~.main.initialize`, such that it can initialize and cache the codes and decoders of all sizes itself, as the workers of a `~.main.WorkerPool` in `~.main.WorkerPool.run_size`. Simulations are started with `~.main.WorkerPool.run_size`, and are divided into chunks that are served to the agents one at a time. The outputs of the chunks are aggregated as they arrive, such that the output is equal to the output of a `~.main.WorkerPool` with the same seed and chunk size, independent of the number of agents. Agents can connect and disconnect at any time; a chunk of an agent that is lost, or that has not returned its output within ``timeout`` seconds, is put back into the queue for another agent. Simulations wait until at least one agent is connected.
+
+    The code and decoder instances of `~.main.run` cannot be sent to the agents, such that only `~.main.WorkerPool.run_size` is supported.
+
+    Parameters
+    ----------
+    Code
+        Any surface code module or module name from codes.
+    Decoder
+        Any decoder module or module name from decoders.
+    address
+        Host and port to listen on. Port 0 selects a free port, which is stored in ``address``.
+    authkey
+        Shared key to authenticate the agents, which is required if ``address`` is not a loopback address, see `get_authkey`.
+    timeout
+        Maximum duration in seconds of a single chunk before its agent is considered lost.
+    kwargs
+        Keyword arguments passed on to `~.main.initialize` by the agents, such as ``enabled_errors`` and ``faulty_measurements``. Must be picklable.
+
+    Attributes
+    ----------
+    address : tuple
+        Host and port that the coordinator listens on.
+    workers : list
+        Threads that serve the connected agents.
+    throughput : list
+        Number of chunks, iterations, the total duration and the number of iterations per second of each agent in the last simulation, in the order of connection.
+
+    Examples
+    --------
+    Run a series of simulations on agents that connect to port 5000 on all interfaces:
+
+        >>> coordinator = Coordinator("toric", "unionfind", address=("", 5000), authkey="secret", enabled_errors=["pauli"])
+        >>> data = run_many("toric", "unionfind", sizes=[8, 12], error_rates=error_rates, iterations=10000, pool=coordinator)
+        >>> coordinator.close()
+    """
+
+    def __init__(
+        self,
+        Code: module_or_name,
+        Decoder: module_or_name,
+        address: address_type = ("localhost", 0),
+        authkey: Optional[str] = None,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ):
+        self.init_kwargs = dict(Code=Code, Decoder=Decoder, **kwargs)
+        self.timeout = timeout
+        self.tasks = queue.Queue()
+        self.results = queue.Queue()
+        self.workers = []
+        self.code = None
+        self.decoder = None
+        self.template = None
+        self.job = 0
+        self.throughput = []
+        self.connections = 0
+        self.closing = False
+        self.authkey = get_authkey(address, authkey)
+        self.listener = Listener(address, authkey=self.authkey)
+        self.address = self.listener.address
+        self.accepting = threading.Thread(target=self._accept, daemon=True)
+        self.accepting.start()
+
+    def __repr__(self):
+        return f"Coordinator({self.address[0]}:{self.address[1]}, {len(self.workers)} agents)"
+
+    @property
+    def processes(self) -> int:
+        """Number of connected agents, which is at least 1 to determine the default chunk size."""
+        return max(1, len(self.workers))
+
+    def start(self, *args):
+        """Agents connect to the coordinator by themselves."""
+
+    def run(self, *args, **kwargs):
+        """Not supported, as code and decoder instances cannot be sent to the agents. Raises a `TypeError`."""
+        raise TypeError("Code and decoder instances cannot be sent to agents, use run_size instead.")
+
+    def _accept(self):
+        """Accepts agents and starts a thread to serve each agent."""
+        while True:
+            try:
+                connection = self.listener.accept()
+            except Exception:  # Failed authentication or handshake
+                continue
+            if self.closing:
+                connection.close()
+                break
+            worker = threading.Thread(target=self._serve, args=(connection, self.connections), daemon=True)
+            self.connections += 1
+            self.workers.append(worker)
+            worker.start()
+
+    def _serve(self, connection: Connection, index: int):
+        """Sends chunks to a single agent and receives their outputs until a ``None`` is taken from the queue.
+
+        If the connection is lost or the chunk exceeds the timeout, the chunk is put back into the queue.
+        """
+        task = None
+        try:
+            connection.send((index, self.init_kwargs))
+            while True:
+                task = self.tasks.get()
+                connection.send(task)
+                if task is None:
+                    break
+                if self.timeout is not None and not connection.poll(self.timeout):
+                    raise TimeoutError(f"Agent {index} exceeded the timeout.")
+                self.results.put(connection.recv())
+                task = None
+        except (EOFError, OSError):
+            if task is not None:
+                self.tasks.put(task)
+        finally:
+            connection.close()
+            self.workers.remove(threading.current_thread())
+
+    def close(self):
+        """Stops the connected agents and the listener."""
+        try:
+            while True:
+                self.tasks.get_nowait()
+        except queue.Empty:
+            pass
+        if not self.closing:
+            self.closing = True
+            Client(self.address, authkey=self.authkey).close()  # Wakes the listener
+            self.accepting.join()
+            self.listener.close()
+        workers = list(self.workers)
+        for _ in workers:
+            self.tasks.put(None)
+        for worker in workers:
+            worker.join()
+
+
+class _Channel(object):
+    """Connection to the coordinator as the task and result queues of `~.main._pool_worker`."""
+
+    def __init__(self, connection: Connection):
+        self.connection = connection
+
+    def get(self):
+        return self.connection.recv()
+
+    def put(self, result):
+        self.connection.send(result)
+
+
+def run_worker(address: address_type, authkey: Optional[str] = None, recursion_limit: int = 100000):
+    """Runs a single worker agent of a `Coordinator`.
+
+    The agent connects to the coordinator at ``address`` and simulates the chunks of the coordinator until the coordinator is closed or the connection is lost.
+
+    Parameters
+    ----------
+    address
+        Host and port of the coordinator.
+    authkey
+        Shared key to authenticate the agent, which is required if ``address`` is not a loopback address, see `get_authkey`.
+    recursion_limit
+        Recursion limit of the agent, see `~.threshold.run_many`.
+    """
+    sys.setrecursionlimit(recursion_limit)
+    with Client(address, authkey=get_authkey(address, authkey)) as connection:
+        index, init_kwargs = connection.recv()
+        channel = _Channel(connection)
+        try:
+            _pool_worker(index, None, None, channel, channel, init_kwargs)
+        except (EOFError, OSError):  # Lost connection to the coordinator
+            pass
+
+
+def run_workers(address: address_type, processes: Optional[int] = None, authkey: Optional[str] = None, **kwargs):
+    """Runs ``processes`` worker agents of a `Coordinator` in separate processes, see `run_worker`.
+
+    If ``processes`` is not set, the number of available threads is determined via `~multiprocessing.cpu_count`.
+    """
+    get_authkey(address, authkey)  # Fails before starting any process
+    processes = cpu_count() if processes is None else processes
+    workers = [Process(target=run_worker, args=(address, authkey), kwargs=kwargs) for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from ..codes.elements import Qubit
+from ..codes.elements import Qubit, Edge
 from matplotlib import pyplot as plt
 from functools import wraps
 
@@ -8,7 +8,7 @@ from functools import wraps
 class Sim(ABC):
     """Template simulation class for errors.
 
-    The template simulation error class can be used as a parent class for error modules for surface code classes that inherit from `.codes._template.sim.PerfectMeasurements` or `.codes._template.sim.FaultyMeasurements`. The error of the module must be applied to each qubit separately using the abstract method `random_error`.
+    The template simulation error class can be used as a parent class for error modules for surface code classes that inherit from `.codes._template.sim.PerfectMeasurements` or `.codes._template.sim.FaultyMeasurements`. The error of the module must be applied to each qubit separately using the abstract method `random_error`. Random numbers must be drawn from the generator of the code at ``self.code.rng``, such that simulations are reproducible by the seed of `~.main.run`.
 
     Parameters
     ----------
@@ -40,6 +40,18 @@ class Sim(ABC):
         """
         pass
 
+    def edge_probability(self, edge: Edge, **kwargs) -> float:
+        """Returns the probability that the state of ``edge`` is flipped by the current error type.
+
+        Used by decoders to derive weights for the edges of the decoding graph. Overriding error rates can be supplied as keyword arguments, similar to `random_error`. Error types that do not flip edge states unknowingly to the decoder return zero.
+
+        Parameters
+        ----------
+        edge : Edge
+            Edge of the decoding graph.
+        """
+        return 0
+
 
 class Plot(Sim):
     """Template plot class for errors.
@@ -58,7 +70,7 @@ class Plot(Sim):
             }
 
             def random_error(self, qubit):
-                if random.random < 0.5:
+                if self.code.rng.random() < 0.5:
                     self.error_method(qubit)
 
             def example_method(self, qubit):
@@ -90,7 +102,7 @@ class Plot(Sim):
             }
 
             def random_error(self, qubit):
-                if random.random < 0.5:
+                if self.code.rng.random() < 0.5:
                     self.error_method(qubit)
 
             def example_method(self, qubit):
@@ -121,7 +133,7 @@ class Plot(Sim):
             }
 
             def random_error(self, qubit):
-                if random.random < 0.5:
+                if self.code.rng.random() < 0.5:
                     self.error_method(qubit)
 
             @staticmethod
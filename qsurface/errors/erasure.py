@@ -1,7 +1,6 @@
 from ._template import Sim as TemplateSim, Plot as TemplatePlot
 from ..codes.elements import DataQubit
-from typing import Optional, Tuple
-import random
+from typing import List, Optional, Tuple
 
 
 class Sim(TemplateSim):
@@ -13,6 +12,13 @@ class Sim(TemplateSim):
         Default probability of erasure errors.
     initial_states
         Default state of the qubit after re-initialization.
+
+    Attributes
+    ----------
+    erased : list of `~.codes.elements.DataQubit`
+        Qubits that have been erased in the simulation instance ``erased_instance``, see `erased_qubits`.
+    erased_instance : float, optional
+        Simulation instance of the qubits in ``erased``.
     """
 
     def __init__(self, *args, p_erasure: float = 0, initial_states: Tuple[float, float] = (0, 0), **kwargs):
@@ -21,6 +27,8 @@ class Sim(TemplateSim):
         self.default_error_rates = {"p_erasure": p_erasure}
         self.code._DataQubit.erasure = None
         self.code._AncillaQubit.erasure = None
+        self.erased = []
+        self.erased_instance = None
         # TODO above line is required for unionfind/ufns decoder, but doesn't make sense
 
     def random_error(self, qubit, p_erasure: float = 0, initial_states: Optional[Tuple[float, float]] = None, **kwargs):
@@ -37,15 +45,32 @@ class Sim(TemplateSim):
         """
         if p_erasure is None:
             p_erasure = self.default_error_rates["p_erasure"]
-        if p_erasure != 0 and random.random() < p_erasure:
+        if p_erasure != 0 and self.code.rng.random() < p_erasure:
             if initial_states is None:
                 initial_states = self.initial_states
-            self.erasure(qubit, instance=getattr(self.code, "instance", 0), initial_states=initial_states, **kwargs)
+            self.erasure(
+                qubit,
+                instance=getattr(self.code, "instance", 0),
+                initial_states=initial_states,
+                rng=self.code.rng,
+                **kwargs,
+            )
+
+    def erased_qubits(self) -> List[DataQubit]:
+        """Returns the qubits that have been erased in the current simulation instance of the code, without a search over all qubits."""
+        return self.erased if self.erased_instance == self.code.instance else []
 
-    @staticmethod
-    def erasure(qubit: DataQubit, instance: float = 0, initial_states: Tuple[float, float] = (0, 0), **kwargs):
+    def load_erased(self, qubits: List[DataQubit]):
+        """Marks ``qubits`` as erased in the current simulation instance of the code without re-initializing them, as erasures that are loaded from a record."""
+        self.erased, self.erased_instance = qubits, self.code.instance
+        for qubit in qubits:
+            qubit.erasure = self.code.instance
+
+    def erasure(self, qubit: DataQubit, instance: float = 0, initial_states: Tuple[float, float] = (0, 0), **kwargs):
         """Erases the ``qubit`` by resetting its attributes.
 
+        The qubit is added to the erased qubits of ``instance``, which are returned by `erased_qubits`.
+
         Parameters
         ----------
         qubit
@@ -55,6 +80,10 @@ class Sim(TemplateSim):
         initial_states
             State of the qubit after re-initialization.
         """
+        if instance != self.erased_instance:
+            self.erased, self.erased_instance = [], instance
+        if qubit.erasure != instance:
+            self.erased.append(qubit)
         qubit.erasure = instance
         qubit._reinitialize(initial_states=initial_states, **kwargs)
 
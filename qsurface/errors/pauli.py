@@ -1,7 +1,6 @@
-from ..codes.elements import Qubit
+from ..codes.elements import Qubit, Edge
 from ._template import Sim as TemplateSim, Plot as TemplatePlot
 from typing import Optional
-import random
 
 
 class Sim(TemplateSim):
@@ -37,8 +36,8 @@ class Sim(TemplateSim):
         if p_phaseflip is None:
             p_phaseflip = self.default_error_rates["p_phaseflip"]
 
-        do_bitflip = p_bitflip != 0 and random.random() < p_bitflip
-        do_phaseflip = p_phaseflip != 0 and random.random() < p_phaseflip
+        do_bitflip = p_bitflip != 0 and self.code.rng.random() < p_bitflip
+        do_phaseflip = p_phaseflip != 0 and self.code.rng.random() < p_phaseflip
 
         if do_bitflip and do_phaseflip:
             self.bitphaseflip(qubit)
@@ -47,6 +46,24 @@ class Sim(TemplateSim):
         elif do_phaseflip:
             self.phaseflip(qubit)
 
+    def edge_probability(self, edge: Edge, p_bitflip: float = 0, p_phaseflip: float = 0, **kwargs) -> float:
+        """Returns the probability that the state of ``edge`` is flipped by a Pauli error.
+
+        The probabilities equal the error rates that `random_error` applies for the same keyword arguments, such that a rate that is not supplied, e.g. when it is not in ``code.error_rates``, is zero rather than the default rate of the module.
+
+        Parameters
+        ----------
+        edge
+            Edge of the decoding graph. Vertical edges between layers are not affected by Pauli errors.
+        p_bitflip
+            Probability of X-errors or bitflip errors.
+        p_phaseflip
+            Probability of Z-errors or phaseflip errors.
+        """
+        if edge.edge_type != "edge":
+            return 0
+        return p_bitflip if edge.state_type == "x" else p_phaseflip
+
     @staticmethod
     def bitflip(qubit: Qubit, **kwargs):
         """Applies a bitflip or Pauli X on ``qubit``."""
@@ -0,0 +1,153 @@
+"""
+Rare-event estimation of low logical error rates by sampling over error weights. Below the threshold, the logical error rate of a simulation with independent errors at rate ``p`` on ``n`` locations decomposes as
+
+.. math::
+
+    P_L(p) = \\sum_{w=0}^{n} \\binom{n}{w} p^w (1-p)^{n-w} f(w),
+
+where :math:`f(w)` is the probability that the decoder fails on ``w`` errors on uniformly random locations. The failure rates :math:`f(w)` do not depend on ``p``, and are large for the weights that dominate :math:`P_L` at low ``p``, such that they are estimated by direct sampling at fixed weight with few iterations. `sample_weights` estimates :math:`f(w)` for a range of weights, and `WeightSampling.logical_error_rate` combines these estimates into :math:`P_L(p)` and its variance for any ``p``, including rates of :math:`10^{-9}` and lower that are unreachable by `~.main.run`.
+"""
+from __future__ import annotations
+from typing import Iterable, List, Optional
+from dataclasses import dataclass
+import time
+from scipy import stats
+import numpy
+from .main import code_type, decoder_type, seed_type
+from .pipeline import ShotLayout
+
+
+@dataclass
+class WeightSampling:
+    """Failure rates of a decoder at fixed error weights, obtained by `sample_weights`.
+
+    Parameters
+    ----------
+    locations
+        Number of locations ``n`` of the errors.
+    weights
+        Sampled error weights.
+    iterations
+        Number of iterations of each weight.
+    failures
+        Number of logical errors of each weight.
+    seed
+        Entropy of the `~numpy.random.SeedSequence` of the sampling.
+    """
+
+    locations: int
+    weights: List[int]
+    iterations: List[int]
+    failures: List[int]
+    seed: Optional[seed_type] = None
+
+    def failure_rate(self, weight: int) -> float:
+        """Returns the estimated failure rate :math:`f(w)` of ``weight``."""
+        index = self.weights.index(weight)
+        return self.failures[index] / self.iterations[index]
+
+    def logical_error_rate(self, p: float) -> dict:
+        """Estimates the logical error rate at error rate ``p``.
+
+        The estimate is the sum of the estimated failure rates of the sampled weights, weighted by the binomial probabilities of the weights at ``p``. As the failure rates of different weights are estimated independently, the variance of the estimate is the sum of the binomial variances of the failure rates, weighted by the squared probabilities of the weights. The weights below the lowest sampled weight are assumed to be always corrected, which holds for weights below half the distance of the code. The failure rates of the other weights that are not sampled are taken to be zero, such that the estimate is a lower bound, and their total probability ``truncation`` is an upper bound on the error of the estimate due to these weights. The variance is zero for weights without any observed failures, such that the lowest weights where the decoder can fail must be sampled with enough iterations to observe failures.
+
+        Parameters
+        ----------
+        p
+            Error rate of each location.
+
+        Returns
+        -------
+        dict
+            The estimated logical error rate under ``"estimate"``, its standard deviation under ``"std"`` and the probability of the weights above the lowest sampled weight that are not sampled under ``"truncation"``.
+        """
+        weights = numpy.array(self.weights)
+        iterations = numpy.array(self.iterations)
+        rates = numpy.array(self.failures) / iterations
+        probabilities = stats.binom.pmf(weights, self.locations, p)
+        return {
+            "estimate": float(numpy.sum(probabilities * rates)),
+            "std": float(numpy.sqrt(numpy.sum(probabilities ** 2 * rates * (1 - rates) / iterations))),
+            "truncation": float(max(0.0, stats.binom.sf(weights.min() - 1, self.locations, p) - numpy.sum(probabilities))),
+        }
+
+
+def sample_weights(
+    code: code_type,
+    decoder: decoder_type,
+    weights: Iterable[int],
+    iterations: int = 1,
+    rate: str = "p_bitflip",
+    seed: Optional[seed_type] = None,
+    error_rates: dict = {},
+    **kwargs,
+) -> WeightSampling:
+    """Estimates the failure rates of a decoder at fixed error weights.
+
+    For every iteration of weight ``w``, the data-qubits are set to the zero state, and an error of the error module with the error rate ``rate`` is applied on ``w`` distinct data-qubits that are chosen uniformly at random, by calling `~.errors._template.Sim.random_error` of the module with ``rate`` set to 1. All other error rates are zero. The ancillas are measured, the syndrome is decoded, and the iteration fails if the logical state after decoding differs from the zero state. The random numbers of iteration ``i`` of weight ``w`` are drawn from the child of ``seed`` with spawn key ``(w, i)``, such that the failure rate of a weight does not depend on which other weights are sampled.
+
+    Only perfect measurements are supported, where the locations of the errors are the data-qubits of the single layer.
+
+    Parameters
+    ----------
+    code
+        A surface code instance with perfect measurements (see `~.main.initialize`).
+    decoder
+        A decoder instance (see `~.main.initialize`).
+    weights
+        Error weights to sample.
+    iterations
+        Number of iterations per weight.
+    rate
+        Name of the error rate of the error module, e.g. ``"p_bitflip"`` for bitflips of the ``pauli`` module or ``"p_erasure"`` for the ``erasure`` module.
+    seed
+        Entropy of the `~numpy.random.SeedSequence` of the sampling.
+    error_rates
+        Error rates that are set as ``code.error_rates``, from which decoders with weighted edges derive their edge weights.
+    kwargs
+        Keyword arguments are passed on to `~.decoders._template.Sim.decode`.
+
+    Examples
+    --------
+    The logical error rate of the distance 8 toric code at a bitflip rate of :math:`10^{-4}`:
+
+        >>> code, decoder = initialize((8,8), "toric", "mwpm", enabled_errors=["pauli"], initial_states=(0,0))
+        >>> sampling = sample_weights(code, decoder, range(4, 16), iterations=2000)
+        >>> sampling.logical_error_rate(1e-4)
+        {'estimate': 1.52e-11, 'std': 2.1e-13, 'truncation': 1.7e-37}
+    """
+    if code.layers > 1:
+        raise ValueError("Sampling by error weight is only supported for perfect measurements.")
+    error_class = next((error for error in code.errors.values() if rate in error.default_error_rates), None)
+    if error_class is None:
+        raise ValueError(f"No enabled error module has the error rate {rate}.")
+    if seed is None:
+        seed = numpy.random.SeedSequence().entropy
+
+    layout = ShotLayout(code)
+    locations = layout.data_qubits
+    weights = list(weights)
+    if any(weight < 0 or weight > len(locations) for weight in weights):
+        raise ValueError(f"Error weights must be between 0 and the {len(locations)} locations.")
+
+    failures = []
+    for weight in weights:
+        weight_failures = 0
+        for iteration in range(iterations):
+            print(f"Running weight {weight} iteration {iteration+1}/{iterations}", end="\r")
+            code.rng = numpy.random.default_rng(numpy.random.SeedSequence(seed, spawn_key=(weight, iteration)))
+            layout.reset(code)
+            code.instance = time.time()
+            code.error_rates = dict(error_rates)
+            code.prev_logical_state = {key: 0 for key in layout.logical_keys}
+            for index in code.rng.choice(len(locations), size=weight, replace=False):
+                error_class.random_error(locations[index], **{rate: 1})
+            for ancilla in layout.ancillas:
+                ancilla.measure()
+            decoder.decode(**kwargs)
+            code.logical_state
+            weight_failures += not code.no_error
+        failures.append(weight_failures)
+    print()  # for newline after /r
+
+    return WeightSampling(len(locations), weights, [iterations] * len(weights), failures, seed)
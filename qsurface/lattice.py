@@ -0,0 +1,255 @@
+"""
+Compact shared-memory templates of initialized surface codes. A `LatticeTemplate` stores the topology of a code -- its qubits, parity checks, vertical edges and logical operators -- as flat arrays in a single block of `multiprocessing.shared_memory`, and the classes and arguments to rebuild the code, its error modules and decoder in a small picklable header. Processes that are not forked from the process that owns the code, e.g. workers started by the ``spawn`` method, attach to the template and rebuild their own code and decoder by `LatticeTemplate.build` instead of receiving a pickled copy of the entire object graph.
+
+The templates use `multiprocessing.shared_memory`, which requires Python 3.8+. It is imported when a template is created or attached, such that the package itself can be imported on older versions.
+"""
+from __future__ import annotations
+from typing import List, Tuple
+import numpy
+from .main import code_type, decoder_type
+
+
+class LatticeTemplate(object):
+    """Shared-memory template of a surface code and decoder.
+
+    The qubits of ``code`` are stored in the order of the data-qubits, ancilla-qubits and pseudo-qubits of each layer, and are referred to by their index in this order. The entanglements of the parity checks are stored in the order of ``ancilla.parity_qubits`` of each ancilla, and in the order of the nodes of each edge, such that the rebuilt code is equal to ``code`` including the iteration orders that a decoder depends on. The current states of all edges of the data-qubits are copied to the rebuilt code.
+
+    Only the header of the template is pickled, such that a template can be sent to other processes at the cost of a few hundred bytes. The shared memory is released by `close` of the template object in the creating process.
+
+    Parameters
+    ----------
+    code
+        Surface code instance without plotting.
+    decoder
+        Decoder instance of ``code``. The decoder is rebuilt with its class and ``decoder.config``. Hooks are not copied.
+
+    Attributes
+    ----------
+    header : dict
+        Classes and arguments to rebuild the code, error modules and decoder, and the keys that are referred to by index in the arrays.
+    arrays : dict of `numpy.ndarray`
+        Topology arrays on the shared memory.
+
+    Examples
+    --------
+    Rebuild a code and decoder in a spawned process:
+
+        >>> code, decoder = initialize((6,6), "toric", "unionfind", enabled_errors=["pauli"], faulty_measurements=True)
+        >>> template = LatticeTemplate(code, decoder)
+        >>> template.nbytes
+        25456
+        >>> code, decoder = template.build()  # in any process while the template is not closed
+    """
+
+    def __init__(self, code: code_type, decoder: decoder_type):
+        if hasattr(code, "figure"):
+            raise TypeError("Cannot create a template of a surface code with plotting enabled.")
+
+        qubits = [
+            (kind, qubit)
+            for kind, group in enumerate([code.data_qubits, code.ancilla_qubits, code.pseudo_qubits])
+            for layer in group.values()
+            for qubit in layer.values()
+        ]
+        index = {id(qubit): i for i, (_, qubit) in enumerate(qubits)}
+        data_qubits = [qubit for kind, qubit in qubits if kind == 0]
+        ancillas = [qubit for kind, qubit in qubits if kind != 0]
+
+        state_types = sorted({qubit.state_type for qubit in ancillas} | {key for qubit in data_qubits for key in qubit.edges})
+        parity_keys = list({key: None for qubit in ancillas for key in qubit.parity_qubits})
+        logical_keys = list(code.logical_operators)
+        state_type_index = {state_type: i for i, state_type in enumerate(state_types)}
+        parity_key_index = {key: i for i, key in enumerate(parity_keys)}
+
+        vertical_index = {}
+        vertical, z_links = [], []
+        for ancilla in ancillas:
+            for neighbor, edge in ancilla.z_neighbors.items():
+                if id(edge) not in vertical_index:
+                    vertical_index[id(edge)] = len(vertical)
+                    upper, lower = edge.nodes
+                    vertical.append((index[id(upper)], index[id(lower)], state_type_index[edge.state_type]))
+                z_links.append((index[id(ancilla)], index[id(neighbor)], vertical_index[id(edge)]))
+
+        edge_index = {
+            id(edge): (index[id(qubit)], state_type_index[key]) for qubit in data_qubits for key, edge in qubit.edges.items()
+        }
+        arrays = {
+            "kinds": numpy.array([kind for kind, _ in qubits], dtype=numpy.int8),
+            "positions": numpy.array([(qubit.z, *qubit.loc) for _, qubit in qubits], dtype=numpy.float64),
+            "state_types": numpy.array(
+                [-1 if kind == 0 else state_type_index[qubit.state_type] for kind, qubit in qubits], dtype=numpy.int8
+            ),
+            "edge_states": numpy.array(
+                [[qubit.edges[key].state if key in qubit.edges else -1 for key in state_types] for qubit in data_qubits],
+                dtype=numpy.int8,
+            ),
+            "parity": numpy.array(
+                [
+                    (index[id(ancilla)], parity_key_index[key], index[id(data_qubit)])
+                    for ancilla in ancillas
+                    for key, data_qubit in ancilla.parity_qubits.items()
+                ],
+                dtype=numpy.int32,
+            ),
+            "nodes": numpy.array(
+                [
+                    (index[id(qubit)], state_type_index[key], index[id(node)])
+                    for qubit in data_qubits
+                    for key, edge in qubit.edges.items()
+                    for node in edge.nodes
+                ],
+                dtype=numpy.int32,
+            ),
+            "vertical": numpy.array(vertical, dtype=numpy.int32),
+            "z_links": numpy.array(z_links, dtype=numpy.int32),
+            "logicals": numpy.array(
+                [(i, *edge_index[id(edge)]) for i, key in enumerate(logical_keys) for edge in code.logical_operators[key]],
+                dtype=numpy.int32,
+            ),
+        }
+
+        specs, offset = {}, 0
+        for name, array in arrays.items():
+            specs[name] = (offset, array.shape, array.dtype.str)
+            offset += -(-array.nbytes // 8) * 8
+        from multiprocessing import shared_memory  # Python 3.8+
+
+        self.memory = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        self._owner = True
+        self.arrays = {}
+        for name, array in arrays.items():
+            self.arrays[name] = self._view(name, specs[name])
+            self.arrays[name][...] = array
+
+        code_kwargs = {}
+        if hasattr(code, "default_faulty_measurements"):
+            code_kwargs = dict(layers=code.layers, **code.default_faulty_measurements)
+        errors = [
+            (
+                type(error),
+                {
+                    **error.default_error_rates,
+                    **{key: value for key, value in vars(error).items() if key not in ("code", "type", "default_error_rates")},
+                },
+            )
+            for error in code.errors.values()
+        ]
+        self.header = dict(
+            Code=type(code),
+            size=code.size,
+            code_kwargs=code_kwargs,
+            errors=errors,
+            Decoder=type(decoder),
+            decoder_kwargs=dict(decoder.config),
+            prev_logical_state=getattr(code, "prev_logical_state", None),
+            state_types=state_types,
+            parity_keys=parity_keys,
+            logical_keys=logical_keys,
+            memory=self.memory.name,
+            specs=specs,
+        )
+
+    def __repr__(self):
+        return f"LatticeTemplate({self.header['Code'].__name__} {self.header['size']}, {self.nbytes} bytes)"
+
+    def __getstate__(self):
+        return {"header": self.header}
+
+    def __setstate__(self, state):
+        self.header = state["header"]
+        self._owner = False
+        self.memory = None
+        self.arrays = None
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the topology arrays in bytes."""
+        return sum(array.nbytes for array in self.attach().values())
+
+    def _view(self, name: str, spec: Tuple[int, tuple, str]) -> numpy.ndarray:
+        offset, shape, dtype = spec
+        return numpy.ndarray(shape, dtype=numpy.dtype(dtype), buffer=self.memory.buf, offset=offset)
+
+    def attach(self) -> dict:
+        """Attaches to the shared memory of the template and returns the topology arrays."""
+        if self.arrays is None:
+            from multiprocessing import shared_memory  # Python 3.8+
+
+            self.memory = shared_memory.SharedMemory(name=self.header["memory"])
+            self.arrays = {name: self._view(name, spec) for name, spec in self.header["specs"].items()}
+        return self.arrays
+
+    def build(self, **kwargs) -> Tuple[code_type, decoder_type]:
+        """Rebuilds the code and decoder of the template.
+
+        Parameters
+        ----------
+        kwargs
+            Keyword arguments are passed on to the code, error modules and decoder, and override the arguments of the template.
+
+        Returns
+        -------
+        code
+            Rebuilt surface code instance.
+        decoder
+            Rebuilt decoder instance.
+        """
+        header, arrays = self.header, self.attach()
+        state_types, parity_keys = header["state_types"], header["parity_keys"]
+        code = header["Code"](header["size"], **{**header["code_kwargs"], **kwargs})
+
+        qubits: List = []
+        edge_states = iter(arrays["edge_states"].tolist())
+        constructors = [code.add_data_qubit, code.add_ancilla_qubit, code.add_pseudo_qubit]
+        groups = [code.data_qubits, code.ancilla_qubits, code.pseudo_qubits]
+        for kind, (z, x, y), state_type in zip(
+            arrays["kinds"].tolist(), arrays["positions"].tolist(), arrays["state_types"].tolist()
+        ):
+            z, loc = _as_int(z), (_as_int(x), _as_int(y))
+            if z not in groups[kind]:
+                groups[kind][z] = {}
+            if kind == 0:
+                states = next(edge_states)
+                qubit = code.add_data_qubit(loc, z=z, initial_states=[bool(state) for state in states if state != -1])
+            else:
+                qubit = constructors[kind](loc, z=z, state_type=state_types[state_type])
+            qubits.append(qubit)
+
+        for ancilla, key, data_qubit in arrays["parity"].tolist():
+            qubits[ancilla].parity_qubits[parity_keys[key]] = qubits[data_qubit]
+        for data_qubit, state_type, node in arrays["nodes"].tolist():
+            qubits[data_qubit].edges[state_types[state_type]].add_node(qubits[node])
+
+        vertical = []
+        for upper, lower, state_type in arrays["vertical"].tolist():
+            pseudo_edge = code._PseudoEdge(qubits[upper], state_type=state_types[state_type])
+            pseudo_edge.nodes = [qubits[upper], qubits[lower]]
+            vertical.append(pseudo_edge)
+        for ancilla, neighbor, edge in arrays["z_links"].tolist():
+            qubits[ancilla].z_neighbors[qubits[neighbor]] = vertical[edge]
+
+        code.logical_operators = {key: [] for key in header["logical_keys"]}
+        for key, data_qubit, state_type in arrays["logicals"].tolist():
+            code.logical_operators[header["logical_keys"][key]].append(qubits[data_qubit].edges[state_types[state_type]])
+        if header["prev_logical_state"] is not None:
+            code.prev_logical_state = dict(header["prev_logical_state"])
+
+        for Error, error_kwargs in header["errors"]:
+            code.errors[Error.__module__.split(".")[-1]] = Error(code, **{**error_kwargs, **kwargs})
+        decoder = header["Decoder"](code, **{**header["decoder_kwargs"], **kwargs})
+        return code, decoder
+
+    def close(self):
+        """Detaches from the shared memory, which is released if the current object created the template."""
+        if self.memory is not None:
+            self.arrays = None
+            self.memory.close()
+            if self._owner:
+                self.memory.unlink()
+            self.memory = None
+
+
+def _as_int(value: float):
+    """Returns integral floats as integers, as the coordinates of the qubits in the codes."""
+    return int(value) if value.is_integer() else value
@@ -1,22 +1,28 @@
 """
-Contains functions and classes to run and benchmark surface code simulations and visualizations. Use `initialize` to prepare a surface code and a decoder instance, which can be passed on to `run` and `run_multiprocess` to simulate errors and to decode them with the decoder. 
+Contains functions and classes to run and benchmark surface code simulations and visualizations. Use `initialize` to prepare a surface code and a decoder instance, which can be passed on to `run` and `run_multiprocess` to simulate errors and to decode them with the decoder. A `WorkerPool` keeps worker processes alive between calls of `run_multiprocess`.
 """
 from __future__ import annotations
 from types import ModuleType
 from typing import List, Optional, Tuple, Union
 from collections import defaultdict
 from functools import wraps
-from multiprocessing import Process, Queue, cpu_count
+from multiprocessing import Queue, cpu_count, get_context
+from queue import Empty
+from statistics import NormalDist
+import os
+import pickle
+import traceback
 import timeit
-import random
 import numpy
 from . import decoders
 from . import codes
+from .records import ShotRecorder
 from .errors._template import Sim as Error
 
 
 module_or_name = Union[ModuleType, str]
 size_type = Union[Tuple[int, int], int]
+seed_type = Union[int, List[int]]
 errors_type = List[Union[str, Error]]
 code_type = codes._template.sim.PerfectMeasurements
 decoder_type = decoders._template.Sim
@@ -100,16 +106,30 @@ def run(
     error_rates: dict = {},
     iterations: int = 1,
     decode_initial: bool = True,
-    seed: Optional[float] = None,
+    seed: Optional[seed_type] = None,
     benchmark: Optional[BenchmarkDecoder] = None,
     mp_queue: Optional[Queue] = None,
-    mp_process: int = 0,
+    iteration_offset: int = 0,
+    target_failures: Optional[int] = None,
+    ci_width: Optional[float] = None,
+    confidence: float = 0.95,
+    checkpoint: Optional[str] = None,
+    checkpoint_interval: float = 60.0,
+    records: Optional[str] = None,
     **kwargs,
 ):
     """Runs surface code simulation.
 
     Single command function to run a surface code simulation for a number of iterations.
 
+    Every iteration draws its random numbers from an independent stream of the ``seed``, see `iteration_rng`, that is set as ``code.rng`` before the errors are applied. As the stream depends only on the seed and the index of the iteration, a simulation can be split into parts that are run in any order, on any number of processes, with ``iteration_offset`` set to the index of the first iteration of each part, and still reproduce the exact results of a single run.
+
+    If a stopping rule is set by ``target_failures`` or ``ci_width``, the simulation is stopped early once the rule is met, and ``iterations`` serves as the maximum number of iterations. The number of iterations that is actually run is added to the output. See `stopping_rule` for the rule.
+
+    If a ``checkpoint`` file is set, the state of the simulation is saved to the file every ``checkpoint_interval`` seconds and at the end of the simulation. The state consists of the seed, the number of completed iterations, the number of successful iterations and the data of the ``benchmark``. As the random numbers of every iteration only depend on the seed and the index of the iteration, this state suffices to continue the simulation exactly where it left off. If the file exists at the start of the simulation, the simulation is resumed from the saved state, and the seed of the checkpoint is used if no ``seed`` is supplied. A finished simulation is not run again, but returns its saved output. A `ValueError` is raised if the checkpoint is of another simulation.
+
+    If a ``records`` file is set, a record of every iteration with its index, syndrome weight, correction weight, logical outcome and decoding time is appended to the file by a `~.records.ShotRecorder`. Without ``records``, the loop over the iterations is unchanged.
+
     Parameters
     ----------
     code
@@ -123,9 +143,23 @@ def run(
     decode_initial
         Decode initial code configuration before applying loaded errors. If random states are used for the data-qubits of the ``code`` at class initialization (default behavior), an initial round of decoding is required and is enabled through the ``decode_initial`` flag (default is enabled).
     seed
-        Float to use as the seed for the random number generator.
+        Entropy of the `~numpy.random.SeedSequence` of the simulation, an integer or a list of integers. If not set, fresh entropy is drawn from the operating system.
     benchmark
         Benchmarks decoder performance and analytics if attached.
+    iteration_offset
+        Index of the first iteration in the streams of the ``seed``.
+    target_failures
+        Stops the simulation when this number of logical errors is reached.
+    ci_width
+        Stops the simulation when the confidence interval of the success rate is narrower than this width.
+    confidence
+        Confidence level of the interval for ``ci_width``.
+    checkpoint
+        File name to save and resume the state of the simulation.
+    checkpoint_interval
+        Minimal number of seconds between saves of the checkpoint.
+    records
+        File name to append the per-shot records to, see `~.records.ShotRecorder`.
     kwargs
         Keyword arguments are passed on to `~.decoders._template.Sim.decode`.
 
@@ -145,15 +179,27 @@ def run(
         {'no_error': 8,
         'benchmark': {'decoded': 10,
         'iterations': 10,
-        'seed': 12447.413636559,
+        'seed': 241654735167473412735617830170356441913,
         'durations': {'decode': {'mean': 0.00244155000000319,
         'std': 0.002170364089572033}}}}
+
+    To simulate until 100 logical errors have occurred, or the 95% confidence interval of the success rate is narrower than 0.01, with at most 100000 iterations:
+
+        >>> run(code, decoder, iterations=100000, error_rates={"p_bitflip": 0.05}, target_failures=100, ci_width=0.01)
+        {'no_error': 37771, 'iterations': 37871}
+
+    A long simulation that is interrupted continues from its last checkpoint if it is started again with the same arguments:
+
+        >>> run(code, decoder, iterations=10**7, error_rates={"p_bitflip": 0.1}, checkpoint="p01.ckpt")
     """
+    state = _load_checkpoint(
+        checkpoint, mode="run", seed=seed, iteration_offset=iteration_offset, iterations=iterations, error_rates=error_rates
+    )
     # Initialize lattice
-    if seed is None:
-        seed = timeit.default_timer()
-    seed = float(f"{seed}{mp_process}")
-    random.seed(seed)
+    if state is not None:
+        seed = state["seed"]
+    elif seed is None:
+        seed = numpy.random.SeedSequence().entropy
 
     if decode_initial:
         print(f"Running initial iteration", end="\r")
@@ -164,21 +210,72 @@ def run(
             code.show_corrected()
             
     if benchmark:
-        benchmark._set_decoder(decoder, seed=seed)
+        if benchmark.decoder is decoder:
+            benchmark.data.update(decoded=0, iterations=0, seed=seed)
+        else:
+            benchmark._set_decoder(decoder, seed=seed)
 
     output = {"no_error": 0}
-
-    for iteration in range(iterations):
-        print(f"Running iteration {iteration+1}/{iterations}", end="\r")
-        code.random_errors(**error_rates)
-        decoder.decode(**kwargs)
-        code.logical_state  # Must get logical state property to update code.no_error
-        output["no_error"] += code.no_error
-        if hasattr(code, "figure"):
-            code.show_corrected()
+    adaptive = target_failures is not None or ci_width is not None
+    completed, finished = 0, False
+    if state is not None:
+        output["no_error"], completed, finished = state["no_error"], state["completed"], state["finished"]
+        if benchmark and state["benchmark"] is not None:
+            benchmark.data.update(state["benchmark"]["data"])
+            benchmark.lists = defaultdict(list, state["benchmark"]["lists"])
+            benchmark.values = defaultdict(float, state["benchmark"]["values"])
+
+    def save_checkpoint(finished: bool):
+        if shots is not None:
+            shots.flush()  # Records of completed iterations are not run again after resuming
+        state = dict(
+            mode="run",
+            seed=seed,
+            iteration_offset=iteration_offset,
+            iterations=iterations,
+            error_rates=error_rates,
+            no_error=output["no_error"],
+            completed=completed,
+            finished=finished,
+            benchmark=None if not benchmark else dict(data=benchmark.data, lists=benchmark.lists, values=benchmark.values),
+        )
+        _save_checkpoint(checkpoint, state)
+
+    shots = None if records is None else ShotRecorder(records, code, decoder)
+    saved = timeit.default_timer()
+    try:
+        for iteration in range(completed, 0 if finished else iterations):
+            if checkpoint is not None and timeit.default_timer() - saved > checkpoint_interval:
+                save_checkpoint(False)
+                saved = timeit.default_timer()
+            print(f"Running iteration {iteration+1}/{iterations}", end="\r")
+            code.rng = iteration_rng(seed, iteration_offset + iteration)
+            code.random_errors(**error_rates)
+            if shots is None:
+                decoder.decode(**kwargs)
+            else:
+                shots.decode(**kwargs)
+            code.logical_state  # Must get logical state property to update code.no_error
+            output["no_error"] += code.no_error
+            if shots is not None:
+                shots.write(iteration_offset + iteration, code.no_error)
+            completed += 1
+            if hasattr(code, "figure"):
+                code.show_corrected()
+            if adaptive and stopping_rule(output["no_error"], completed, target_failures, ci_width, confidence):
+                break
+    finally:
+        if shots is not None:
+            shots.close()
 
     print()  # for newline after /r
 
+    if checkpoint is not None:
+        save_checkpoint(True)
+
+    if adaptive:
+        output["iterations"] = completed
+
     if hasattr(code, "figure"):
         code.figure.close()
 
@@ -195,22 +292,127 @@ def run(
         mp_queue.put(output)
 
 
+def binomial_interval(successes: int, trials: int, confidence: float = 0.95) -> Tuple[float, float]:
+    """Returns the Wilson score interval of a binomial success rate.
+
+    Parameters
+    ----------
+    successes
+        Number of successful trials.
+    trials
+        Total number of trials.
+    confidence
+        Confidence level of the interval.
+    """
+    if trials == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    rate = successes / trials
+    denominator = 1 + z ** 2 / trials
+    center = (rate + z ** 2 / (2 * trials)) / denominator
+    margin = z * (rate * (1 - rate) / trials + z ** 2 / (4 * trials ** 2)) ** 0.5 / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def stopping_rule(
+    no_error: int,
+    iterations: int,
+    target_failures: Optional[int] = None,
+    ci_width: Optional[float] = None,
+    confidence: float = 0.95,
+) -> bool:
+    """Returns whether a simulation can be stopped early.
+
+    The simulation is stopped if the number of logical errors ``iterations - no_error`` has reached ``target_failures``, or if the width of the `binomial_interval` of the success rate ``no_error / iterations`` is smaller than ``ci_width``. Rules that are not set are ignored.
+
+    Parameters
+    ----------
+    no_error
+        Number of iterations without logical errors.
+    iterations
+        Number of completed iterations.
+    target_failures
+        Number of logical errors to reach.
+    ci_width
+        Maximal width of the confidence interval of the success rate.
+    confidence
+        Confidence level of the interval.
+    """
+    if target_failures is not None and iterations - no_error >= target_failures:
+        return True
+    if ci_width is not None:
+        low, high = binomial_interval(no_error, iterations, confidence)
+        if high - low < ci_width:
+            return True
+    return False
+
+
+def iteration_rng(seed: seed_type, iteration: int) -> numpy.random.Generator:
+    """Returns the random number generator of an iteration of a simulation.
+
+    The generator is seeded by the child `~numpy.random.SeedSequence` of ``seed`` with spawn key ``(iteration,)``, which is equal to the child with index ``iteration`` of ``SeedSequence(seed).spawn``. The streams of different iterations are thus statistically independent, and the stream of an iteration does not depend on the process that runs it.
+
+    Parameters
+    ----------
+    seed
+        Entropy of the seed sequence of the simulation.
+    iteration
+        Index of the iteration in the simulation.
+    """
+    return numpy.random.default_rng(numpy.random.SeedSequence(seed, spawn_key=(iteration,)))
+
+
+def _load_checkpoint(checkpoint: Optional[str], **expected) -> Optional[dict]:
+    """Loads the state of a simulation from the file ``checkpoint`` if it exists.
+
+    A `ValueError` is raised if a value of ``expected`` that is not ``None`` differs from the value in the saved state.
+    """
+    if checkpoint is None or not os.path.exists(checkpoint):
+        return None
+    with open(checkpoint, "rb") as file:
+        state = pickle.load(file)
+    for key, value in expected.items():
+        if value is not None and state.get(key) != value:
+            raise ValueError(f"Checkpoint {checkpoint} is of another simulation with {key} {state.get(key)}.")
+    print(f"Resuming from checkpoint {checkpoint}.")
+    return state
+
+
+def _save_checkpoint(checkpoint: str, state: dict):
+    """Saves the state of a simulation to the file ``checkpoint``, which is replaced atomically."""
+    temporary = f"{checkpoint}.tmp"
+    with open(temporary, "wb") as file:
+        pickle.dump(state, file)
+    os.replace(temporary, checkpoint)
+
+
 def run_multiprocess(
     code: code_type,
     decoder: decoder_type,
     error_rates: dict = {},
     iterations: int = 1,
     decode_initial: bool = True,
-    seed: Optional[float] = None,
+    seed: Optional[seed_type] = None,
     processes: int = 1,
     benchmark: Optional[BenchmarkDecoder] = None,
+    chunk_size: Optional[int] = None,
+    iteration_offset: int = 0,
+    pool: Optional[WorkerPool] = None,
+    start_method: Optional[str] = None,
+    target_failures: Optional[int] = None,
+    ci_width: Optional[float] = None,
+    confidence: float = 0.95,
+    checkpoint: Optional[str] = None,
+    checkpoint_interval: float = 60.0,
     **kwargs,
 ):
     """Runs surface code simulation using multiple processes.
 
-    Using the standard module `.multiprocessing` and its `~multiprocessing.Process` class, several processes are created that each runs its on contained simulation using `run`. The ``code`` and ``decoder`` objects are copied such that each process has its own instance. The total number of ``iterations`` are divided for the number of ``processes`` indicated. If no ``processes`` parameter is supplied, the number of available threads is determined via `~multiprocessing.cpu_count` and all threads are utilized.
+    The simulation is run by the worker processes of a `WorkerPool`. The ``code`` and ``decoder`` objects are copied such that each process has its own instance. The total number of ``iterations`` is divided into chunks, which are handed out to the workers from a shared queue, such that a worker that finishes early takes over the remaining chunks. If no ``pool`` is supplied, a pool of ``processes`` workers is started for the current simulation and closed afterwards. If ``processes`` is set to none, the number of available threads is determined via `~multiprocessing.cpu_count` and all threads are utilized.
+
+    If a `.BenchmarkDecoder` object is attached to ``benchmark``, each worker has its own copy of the object. The results of the benchmark of all chunks are combined and added to the output.
 
-    If a `.BenchmarkDecoder` object is attached to ``benchmark``, `~multiprocessing.Process` copies the object for each separate thread. Each instance of the the decoder thus have its own benchmark object. The results of the benchmark are appended to a list and addded to the output.
+    If a stopping rule is set by ``target_failures`` or ``ci_width``, the rule is checked after every chunk and ``iterations`` is the maximum number of iterations, see `WorkerPool.run`. The number of iterations that is actually run is added to the output.
 
     See `run` for examples on running a simulation.
 
@@ -227,67 +429,83 @@ def run_multiprocess(
     decode_initial
         Decode initial code configuration before applying loaded errors.
     seed
-        Float to use as the seed for the random number generator.
+        Entropy of the `~numpy.random.SeedSequence` of the simulation. Every chunk is run with the index of its first iteration as ``iteration_offset`` of `run`, such that the results do not depend on the number of processes or the chunk size.
     processes
-        Number of processes to spawn.
+        Number of processes to spawn if no ``pool`` is supplied.
     benchmark
         Benchmarks decoder performance and analytics if attached.
+    chunk_size
+        Number of iterations per chunk. See `WorkerPool.run`.
+    iteration_offset
+        Index of the first iteration in the streams of the ``seed``, see `run`.
+    pool
+        Pool of running worker processes to reuse.
+    start_method
+        Start method of the worker processes if no ``pool`` is supplied, see `WorkerPool`.
+    target_failures
+        Stops the simulation when this number of logical errors is reached.
+    ci_width
+        Stops the simulation when the confidence interval of the success rate is narrower than this width.
+    confidence
+        Confidence level of the interval for ``ci_width``.
+    checkpoint
+        File name to save and resume the outputs of the completed chunks, see `WorkerPool.run`.
+    checkpoint_interval
+        Minimal number of seconds between saves of the checkpoint.
     kwargs
         Keyword arguments are passed on to every process of run.
+
+    Examples
+    --------
+    A pool can be reused for multiple simulations, and reports the throughput of each worker.
+
+        >>> code, decoder = initialize((6,6), "toric", "unionfind", enabled_errors=["pauli"])
+        >>> with WorkerPool(4) as pool:
+        ...     for p in [0.09, 0.1, 0.11]:
+        ...         run_multiprocess(code, decoder, iterations=1000, error_rates={"p_bitflip": p}, pool=pool)
+        ...     pool.throughput
+        [{'chunks': 9, 'iterations': 2250, 'duration': 2.01, 'throughput': 1119.4}, ...]
     """
     if hasattr(code, "figure"):
         raise TypeError("Cannot use surface code with plotting enabled for multiprocess.")
 
-    if processes is None:
-        processes = cpu_count()
-    process_iters = iterations // processes
-    if process_iters == 0:
-        print("Please select more iterations")
-        return
-
     if decode_initial:
         code.random_errors()
         decoder.decode(**kwargs)
         code.logical_state
 
-    # Initiate processes
-    mp_queue = Queue()
-    workers = []
-    for process in range(processes):
-        workers.append(
-            Process(
-                target=run,
-                args=(code, decoder),
-                kwargs={
-                    "iterations": process_iters,
-                    "decode_initial": False,
-                    "seed": seed,
-                    "mp_process": process,
-                    "mp_queue": mp_queue,
-                    "error_rates": error_rates,
-                    "benchmark": benchmark,
-                    **kwargs,
-                },
-            )
-        )
-    print("Starting", processes, "workers.")
+    run_kwargs = dict(
+        error_rates=error_rates,
+        iterations=iterations,
+        seed=seed,
+        benchmark=benchmark,
+        chunk_size=chunk_size,
+        iteration_offset=iteration_offset,
+        target_failures=target_failures,
+        ci_width=ci_width,
+        confidence=confidence,
+        checkpoint=checkpoint,
+        checkpoint_interval=checkpoint_interval,
+        **kwargs,
+    )
+    if pool is None:
+        with WorkerPool(processes, start_method=start_method) as pool:
+            return pool.run(code, decoder, **run_kwargs)
+    return pool.run(code, decoder, **run_kwargs)
 
-    # Start and join processes
-    for worker in workers:
-        worker.start()
 
-    outputs = []
-    for worker in workers:
-        outputs.append(mp_queue.get())
-        worker.join()
+def _combine_outputs(outputs: List[dict], seed: Optional[seed_type] = None) -> dict:
+    """Combines the outputs of multiple runs of the same simulation.
 
+    The numbers of successful iterations are summed. The benchmarks of the outputs are combined by summing all numerical values and combining the means and standard deviations by `_combine_mean_std`.
+    """
     output = {"no_error": 0}
 
     for partial_output in outputs:
         output["no_error"] += partial_output["no_error"]
-    if benchmark:
-        benchmarks = [partial_output["benchmark"] for partial_output in outputs]
 
+    benchmarks = [partial_output["benchmark"] for partial_output in outputs if "benchmark" in partial_output]
+    if benchmarks:
         if len(benchmarks) == 1:
             output["benchmark"] = benchmarks[0]
         else:
@@ -295,7 +513,6 @@ def run_multiprocess(
             stats = defaultdict(lambda: {"mean": [], "std": []})
             iterations = []
             for benchmark in benchmarks:
-                print(benchmark)
                 iterations.append(benchmark["iterations"])
                 for name, value in benchmark.items():
                     if name[-4:] == "mean":
@@ -317,6 +534,351 @@ def run_multiprocess(
     return output
 
 
+def _pool_worker(
+    index: int,
+    code: Optional[code_type],
+    decoder: Optional[decoder_type],
+    tasks: Queue,
+    results: Queue,
+    init_kwargs: Optional[dict] = None,
+    template=None,
+):
+    """Target of the worker processes of `WorkerPool`.
+
+    Chunks of iterations are taken from the shared ``tasks`` queue until a ``None`` is received. A chunk only describes the simulation by the lattice size, the index of its first iteration, error rates, seed, the methods to benchmark and the keyword arguments for `run`. If the size is ``None``, the ``code`` and ``decoder`` instances that are copied to the worker at its start are used, or that are rebuilt from the `~.lattice.LatticeTemplate` ``template`` at the first chunk. Otherwise, the code and decoder of this size are initialized by the worker itself with ``init_kwargs`` for `initialize`, and are cached for all subsequent chunks of the same size. A new benchmark object is attached to the decoder for every simulation, and is reused for all chunks of the same simulation.
+    """
+    lattices = {}
+    job, benchmark = None, None
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        task_job, chunk, size, offset, iterations, seed, error_rates, methods_to_benchmark, kwargs = task
+
+        start = timeit.default_timer()
+        try:
+            if size is None:
+                if code is None:
+                    code, decoder = template.build()
+                    template.close()
+                task_code, task_decoder = code, decoder
+            else:
+                if size not in lattices:
+                    lattices[size] = initialize(size, **init_kwargs)
+                    lattices[size][0].random_errors()
+                    lattices[size][1].decode()
+                    lattices[size][0].logical_state
+                task_code, task_decoder = lattices[size]
+
+            if task_job != job:
+                job = task_job
+                if benchmark:
+                    benchmark._unset_decoder()
+                benchmark = None if methods_to_benchmark is None else BenchmarkDecoder(methods_to_benchmark)
+
+            output = run(
+                task_code,
+                task_decoder,
+                error_rates=error_rates,
+                iterations=iterations,
+                decode_initial=False,
+                seed=seed,
+                iteration_offset=offset,
+                benchmark=benchmark,
+                **kwargs,
+            )
+        except Exception:
+            results.put((task_job, chunk, index, None, traceback.format_exc()))
+        else:
+            results.put((task_job, chunk, index, output, timeit.default_timer() - start))
+
+
+class WorkerPool(object):
+    """Pool of worker processes for simulations with `run_multiprocess`.
+
+    The worker processes are started at the first simulation, and each worker receives a copy of the code and decoder instances of this simulation. If the workers are forked, the instances are inherited by the workers. For other start methods, a `~.lattice.LatticeTemplate` of the instances is created in shared memory, from which each worker rebuilds its own instances, such that the object graph of the instances is never pickled. The workers are kept alive until `close` is called, such that they are reused for subsequent simulations on the same code and decoder instances, e.g. for a range of error rates. A simulation on other instances restarts the workers.
+
+    If the pool is created with the ``Code`` and ``Decoder`` arguments of `initialize`, simulations can also be started with `run_size` by only the size of the lattice. The workers then initialize the code and decoder of each size themselves, and keep them in a cache for all subsequent simulations, such that a pool that is started once can be used for a series of simulations of varying sizes and error rates, e.g. in `.threshold.run_many`. No code or decoder instances are copied to the workers in this case, and only a small description of each chunk of iterations is sent to the workers.
+
+    Every simulation is divided into chunks of iterations that are put in a single shared queue. Idle workers take the next chunk from this queue, such that the load is balanced over the workers even if the decoding time differs between iterations. The pool can be used as a context manager, which closes the pool on exit.
+
+    Parameters
+    ----------
+    processes
+        Number of worker processes. If set to none, the number of available threads is determined via `~multiprocessing.cpu_count`.
+    Code
+        Any surface code module or module name from codes, used by the workers to initialize the codes in `run_size`.
+    Decoder
+        Any decoder module or module name from decoders, used by the workers to initialize the decoders in `run_size`.
+    start_method
+        Start method of the worker processes, see `multiprocessing.get_context`. Defaults to the default start method of the platform.
+    kwargs
+        Keyword arguments passed on to `initialize` by the workers, such as ``enabled_errors`` and ``faulty_measurements``. Must be picklable if the workers are not forked.
+
+    Attributes
+    ----------
+    throughput : list
+        Number of chunks, iterations, the total duration and the number of iterations per second of each worker in the last simulation.
+
+    Examples
+    --------
+    To simulate a series of lattice sizes and error rates on 4 worker processes:
+
+        >>> with WorkerPool(4, "toric", "unionfind", enabled_errors=["pauli"]) as pool:
+        ...     for size in [8, 12]:
+        ...         for p in [0.09, 0.1]:
+        ...             pool.run_size(size, error_rates={"p_bitflip": p}, iterations=1000)
+    """
+
+    def __init__(
+        self,
+        processes: Optional[int] = None,
+        Code: Optional[module_or_name] = None,
+        Decoder: Optional[module_or_name] = None,
+        start_method: Optional[str] = None,
+        **kwargs,
+    ):
+        self.processes = cpu_count() if processes is None else processes
+        self.init_kwargs = None if Code is None or Decoder is None else dict(Code=Code, Decoder=Decoder, **kwargs)
+        self.context = get_context(start_method)
+        self.tasks = self.context.Queue()
+        self.results = self.context.Queue()
+        self.workers = []
+        self.code = None
+        self.decoder = None
+        self.template = None
+        self.job = 0
+        self.throughput = []
+
+    def __repr__(self):
+        return f"WorkerPool({self.processes})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def start(self, code: Optional[code_type] = None, decoder: Optional[decoder_type] = None):
+        """Starts the worker processes with copies of ``code`` and ``decoder``."""
+        self.close()
+        self.code, self.decoder = code, decoder
+        worker_code, worker_decoder = code, decoder
+        if code is not None and self.context.get_start_method() != "fork":
+            from .lattice import LatticeTemplate
+
+            self.template = LatticeTemplate(code, decoder)
+            worker_code, worker_decoder = None, None
+        self.workers = [
+            self.context.Process(
+                target=_pool_worker,
+                args=(index, worker_code, worker_decoder, self.tasks, self.results, self.init_kwargs, self.template),
+                daemon=True,
+            )
+            for index in range(self.processes)
+        ]
+        print("Starting", self.processes, "workers.")
+        for worker in self.workers:
+            worker.start()
+
+    def run(
+        self,
+        code: code_type,
+        decoder: decoder_type,
+        error_rates: dict = {},
+        iterations: int = 1,
+        seed: Optional[seed_type] = None,
+        benchmark: Optional[BenchmarkDecoder] = None,
+        chunk_size: Optional[int] = None,
+        iteration_offset: int = 0,
+        target_failures: Optional[int] = None,
+        ci_width: Optional[float] = None,
+        confidence: float = 0.95,
+        checkpoint: Optional[str] = None,
+        checkpoint_interval: float = 60.0,
+        **kwargs,
+    ) -> dict:
+        """Runs a simulation on the workers of the pool.
+
+        See `run_multiprocess` for the description of the parameters. The number of iterations is split into chunks of ``chunk_size`` iterations and a final chunk with the remainder, such that exactly ``iterations`` iterations are simulated. If no ``chunk_size`` is supplied, the iterations are split into approximately 4 chunks per worker. Every worker benchmarks its chunks with a new `.BenchmarkDecoder` object with the same methods to benchmark as ``benchmark``.
+
+        If a stopping rule is set by ``target_failures`` or ``ci_width`` (see `stopping_rule`), at most 2 chunks per worker are queued at any time, and the default chunk size is at most 25 iterations. The rule is checked on the combined outputs of the leading chunks whose outputs have all been received, and the simulation is stopped at the first chunk where the rule is met. The output thus only depends on the seed and the chunk size, and not on the order in which the workers finish their chunks. The outputs of the chunks that are still running are discarded.
+
+        If a ``checkpoint`` file is set, the division into chunks and the outputs of all completed chunks are saved to the file every ``checkpoint_interval`` seconds and at the end of the simulation. If the file exists at the start of the simulation, only the chunks without saved output are run, such that an interrupted simulation is resumed with the same division into chunks and the same output, independent of the number of workers. See `run` for the validation of the checkpoint.
+        """
+        if code is not self.code or decoder is not self.decoder or not self.workers:
+            self.start(code, decoder)
+        stop = dict(target_failures=target_failures, ci_width=ci_width, confidence=confidence)
+        save = dict(checkpoint=checkpoint, checkpoint_interval=checkpoint_interval)
+        return self._run(None, error_rates, iterations, seed, iteration_offset, benchmark, chunk_size, stop, save, **kwargs)
+
+    def run_size(
+        self,
+        size: size_type,
+        error_rates: dict = {},
+        iterations: int = 1,
+        seed: Optional[seed_type] = None,
+        benchmark: Optional[BenchmarkDecoder] = None,
+        chunk_size: Optional[int] = None,
+        iteration_offset: int = 0,
+        target_failures: Optional[int] = None,
+        ci_width: Optional[float] = None,
+        confidence: float = 0.95,
+        checkpoint: Optional[str] = None,
+        checkpoint_interval: float = 60.0,
+        **kwargs,
+    ) -> dict:
+        """Runs a simulation on a lattice of ``size`` that is initialized by the workers of the pool.
+
+        The code and decoder are initialized by each worker at the first simulation of ``size``, using the arguments of the pool for `initialize`, and reused for all subsequent simulations of the same size. The workers are only started if they are not yet running. See `run` for the description of the other parameters.
+        """
+        if self.init_kwargs is None:
+            raise ValueError("The Code and Decoder arguments of the pool are required to run a simulation by size.")
+        if isinstance(size, list):
+            size = tuple(size)
+        if not self.workers:
+            self.start()
+        stop = dict(target_failures=target_failures, ci_width=ci_width, confidence=confidence)
+        save = dict(checkpoint=checkpoint, checkpoint_interval=checkpoint_interval)
+        return self._run(size, error_rates, iterations, seed, iteration_offset, benchmark, chunk_size, stop, save, **kwargs)
+
+    def _run(
+        self,
+        size: Optional[size_type],
+        error_rates: dict,
+        iterations: int,
+        seed: Optional[seed_type],
+        iteration_offset: int,
+        benchmark: Optional[BenchmarkDecoder],
+        chunk_size: Optional[int],
+        stop: dict,
+        save: dict,
+        **kwargs,
+    ) -> dict:
+        """Divides a simulation into chunks for the workers and combines their outputs."""
+        adaptive = stop["target_failures"] is not None or stop["ci_width"] is not None
+        checkpoint = save["checkpoint"]
+        state = _load_checkpoint(
+            checkpoint,
+            mode="pool",
+            seed=seed,
+            size=size,
+            iteration_offset=iteration_offset,
+            iterations=iterations,
+            error_rates=error_rates,
+        )
+        if state is not None:
+            seed, chunks = state["seed"], state["chunks"]
+        else:
+            if seed is None:
+                seed = numpy.random.SeedSequence().entropy
+            if chunk_size is None:
+                chunk_size = -(-iterations // (4 * self.processes))
+                if adaptive:
+                    chunk_size = min(chunk_size, 25)
+            chunk_size = max(1, chunk_size)
+            chunks = [chunk_size] * (iterations // chunk_size)
+            if iterations % chunk_size:
+                chunks.append(iterations % chunk_size)
+
+        self.job += 1
+        methods_to_benchmark = benchmark.methods_to_benchmark if benchmark else None
+        offsets = [iteration_offset]
+        for chunk_iterations in chunks[:-1]:
+            offsets.append(offsets[-1] + chunk_iterations)
+
+        outputs = [None] * len(chunks) if state is None else state["outputs"]
+        pending = [chunk for chunk, output in enumerate(outputs) if output is None]
+
+        def put_chunk(chunk):
+            task = (self.job, chunk, size, offsets[chunk], chunks[chunk], seed, error_rates, methods_to_benchmark, kwargs)
+            self.tasks.put(task)
+
+        def save_checkpoint():
+            state = dict(
+                mode="pool",
+                seed=seed,
+                size=size,
+                iteration_offset=iteration_offset,
+                iterations=iterations,
+                error_rates=error_rates,
+                chunks=chunks,
+                outputs=outputs,
+            )
+            _save_checkpoint(checkpoint, state)
+
+        self.throughput = [dict(chunks=0, iterations=0, duration=0.0, throughput=0.0) for _ in self.workers]
+        completed, no_error, completed_iterations = 0, 0, 0
+        stopped = False
+        while completed < len(chunks) and outputs[completed] is not None and not stopped:
+            no_error += outputs[completed]["no_error"]
+            completed_iterations += chunks[completed]
+            completed += 1
+            stopped = adaptive and stopping_rule(no_error, completed_iterations, **stop)
+
+        queued = 0 if stopped else min(len(pending), 2 * self.processes) if adaptive else len(pending)
+        for chunk in pending[:queued]:
+            put_chunk(chunk)
+
+        saved = timeit.default_timer()
+        while completed < len(chunks) and not stopped:
+            job, chunk, index, output, duration = self.results.get()
+            if job != self.job:  # Remaining chunk of a failed or stopped simulation
+                continue
+            if output is None:
+                raise RuntimeError(f"Worker {index} failed on chunk {chunk}:\n{duration}")
+            if outputs[chunk] is not None:  # Chunk that was simulated twice after being requeued
+                continue
+            outputs[chunk] = output
+            while len(self.throughput) <= index:
+                self.throughput.append(dict(chunks=0, iterations=0, duration=0.0, throughput=0.0))
+            worker = self.throughput[index]
+            worker["chunks"] += 1
+            worker["iterations"] += chunks[chunk]
+            worker["duration"] += duration
+            while completed < len(chunks) and outputs[completed] is not None:
+                no_error += outputs[completed]["no_error"]
+                completed_iterations += chunks[completed]
+                completed += 1
+                if adaptive and stopping_rule(no_error, completed_iterations, **stop):
+                    stopped = True
+                    break
+            if not stopped and queued < len(pending):
+                put_chunk(pending[queued])
+                queued += 1
+            if checkpoint is not None and timeit.default_timer() - saved > save["checkpoint_interval"]:
+                save_checkpoint()
+                saved = timeit.default_timer()
+        if stopped:  # Remove queued chunks that are not yet taken by a worker
+            try:
+                while True:
+                    self.tasks.get_nowait()
+            except Empty:
+                pass
+        for worker in self.throughput:
+            if worker["duration"]:
+                worker["throughput"] = worker["iterations"] / worker["duration"]
+        if checkpoint is not None:
+            save_checkpoint()
+
+        output = _combine_outputs(outputs[:completed], seed)
+        if adaptive:
+            output["iterations"] = completed_iterations
+        return output
+
+    def close(self):
+        """Stops and joins all worker processes."""
+        for _ in self.workers:
+            self.tasks.put(None)
+        for worker in self.workers:
+            worker.join()
+        self.workers = []
+        self.code, self.decoder = None, None
+        if self.template is not None:
+            self.template.close()
+            self.template = None
+
+
 class BenchmarkDecoder(object):
     """Benchmarks a decoder during simulation.
 
@@ -361,7 +923,7 @@ class BenchmarkDecoder(object):
         >>> run(code, decoder, iterations=10, error_rates = {"p_bitflip": 0.1}, benchmark=benchmarker)
         {'no_error': 8,
         'benchmark': {'success_rate': [10, 10],
-        'seed': 12447.413636559,
+        'seed': 241654735167473412735617830170356441913,
         'durations': {'decode': {'mean': 0.00244155000000319,
             'std': 0.002170364089572033}}}}
 
@@ -374,7 +936,7 @@ class BenchmarkDecoder(object):
         >>> run(code, decoder, iterations=10, error_rates = {"p_bitflip": 0.1}, benchmark=benchmarker)
         {'no_error': 8,
         'benchmark': {'success_rate': [10, 10],
-        'seed': '12447.413636559',
+        'seed': 241654735167473412735617830170356441913,
         'duration': {'decode': {'mean': 0.001886229999945499,
             'std': 0.0007808582199605158}},
         'count_calls': {'correct_edge': {'mean': 6.7, 'std': 1.4177446878757827}}}}
@@ -410,13 +972,15 @@ class BenchmarkDecoder(object):
         self.data = {"decoded": 0, "iterations": 0, "seed": None}
         self.lists = defaultdict(list)
         self.values = defaultdict(float)
+        self._wrapped = []
         if decoder:
             self._set_decoder(self, decoder, **kwargs)
 
-    def _set_decoder(self, decoder: decoder_type, seed: Optional[float] = None, **kwargs):
+    def _set_decoder(self, decoder: decoder_type, seed: Optional[seed_type] = None, **kwargs):
         """Sets the benchmarked decoder and wraps its class methods."""
         self.decoder = decoder
         self.data["seed"] = seed
+        self._wrapped = [(decoder, "decode", decoder.__dict__.get("decode"))]
 
         # Wrap decoder.decode for check for ancillas after decoding
         decode = getattr(decoder, "decode")
@@ -451,8 +1015,19 @@ class BenchmarkDecoder(object):
                 wrapper = getattr(self, decorator)
                 handle = wrapper(handle)
 
+            self._wrapped.append((owner, attribute_name, owner.__dict__.get(attribute_name)))
             setattr(owner, attribute_name, handle)
 
+    def _unset_decoder(self):
+        """Removes the wrappers of `_set_decoder` from the decoder and its class methods."""
+        for owner, attribute_name, original in reversed(self._wrapped):
+            if original is None:
+                delattr(owner, attribute_name)
+            else:
+                setattr(owner, attribute_name, original)
+        self._wrapped = []
+        self.decoder = None
+
     def lists_mean_var(self, reset: bool = True):
         """Get mean and stand deviation of values in ``self.lists``.
 
@@ -508,7 +1083,7 @@ class BenchmarkDecoder(object):
 def _combine_mean_std(means: List[float], stds: List[float], iterations: List[int]) -> Tuple[float, float]:
     """Combines multiple groups of means and standard deviations.
 
-    The algorithm utilizes the algorithm as described by `Cochrane <https://training.cochrane.org/handbook/current/chapter-06#section-6-5-2>`_. The method is valid since the each subgroup is the result returned by a multiprocessing process that simulations the same group.
+    The algorithm utilizes the algorithm as described by `Cochrane <https://training.cochrane.org/handbook/current/chapter-06#section-6-5-2>`_. The method is valid since the each subgroup is the result of a chunk of iterations of the same simulation.
 
     Parameters
     ----------
@@ -525,7 +1100,7 @@ def _combine_mean_std(means: List[float], stds: List[float], iterations: List[in
 
         n3 = n1 + n2
         m3 = (n1 * m1 + n2 * m2) / n3
-        s3 = ((n1 - 1) * s1 ** 2 + (n2 - 1) * s2 ** 2 + n1 * n2 / n3 * (m1 ** 2 + m2 ** 2 - 2 * m1 * m2)) / (n3 - 1)
+        s3 = (((n1 - 1) * s1 ** 2 + (n2 - 1) * s2 ** 2 + n1 * n2 / n3 * (m1 ** 2 + m2 ** 2 - 2 * m1 * m2)) / (n3 - 1)) ** 0.5
         m1, s1, n1 = m3, s3, n3
 
     return m1, s1
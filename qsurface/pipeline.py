@@ -0,0 +1,294 @@
+"""
+Pipelined simulations that separate the sampling of errors from decoding. In `run` and `.main.run_multiprocess`, every process applies the errors, decodes and checks the logical state of each iteration in sequence. In `run_pipeline`, *sampler* processes apply the errors and write the resulting syndromes to a ring buffer in shared memory, from which *decoder* processes read and decode them. The numbers of samplers and decoders can be chosen independently, such that all processes are kept busy both for fast decoders, where sampling is the bottleneck, and for slow decoders such as MWPM.
+
+The ring buffer uses `multiprocessing.shared_memory`, which requires Python 3.8+. It is imported when a ring buffer is created, such that `ShotLayout` and the package itself can be imported on older versions.
+"""
+from __future__ import annotations
+from typing import List, Optional
+from multiprocessing import Process, Queue
+import time
+import timeit
+import traceback
+import numpy
+from .main import code_type, decoder_type, seed_type, iteration_rng
+
+
+class ShotLayout(object):
+    """Fixed layout of the record of a single iteration on a code.
+
+    A record is a ``numpy.uint8`` array that contains the syndrome of all ancilla-qubits of all layers, whether each data-qubit of all layers is erased, and the parity of the applied errors on each logical operator, in that order. The qubits are ordered as they are stored in the code, such that codes that are initialized with the same arguments share the same layout.
+
+    Parameters
+    ----------
+    code
+        Surface code instance.
+
+    Attributes
+    ----------
+    ancillas : list
+        All `~.codes.elements.AncillaQubit` objects of the code.
+    data_qubits : list
+        All `~.codes.elements.DataQubit` objects of the code.
+    logical_keys : list
+        Keys of the logical operators of the code.
+    size : int
+        Length of a record.
+    """
+
+    def __init__(self, code: code_type):
+        self.ancillas = [ancilla for layer in code.ancilla_qubits.values() for ancilla in layer.values()]
+        self.data_qubits = [qubit for layer in code.data_qubits.values() for qubit in layer.values()]
+        self.logical_keys = list(code.logical_operators)
+        self.erasures = slice(len(self.ancillas), len(self.ancillas) + len(self.data_qubits))
+        self.logicals = slice(self.erasures.stop, self.erasures.stop + len(self.logical_keys))
+        self.size = self.logicals.stop
+
+    def __repr__(self):
+        return f"ShotLayout({len(self.ancillas)} ancillas, {len(self.data_qubits)} data-qubits, {len(self.logical_keys)} logicals)"
+
+    def reset(self, code: code_type):
+        """Sets the states of all data-qubits of ``code`` to zero."""
+        for qubit in self.data_qubits:
+            for edge in qubit.edges.values():
+                edge.state = False
+
+    def sample(self, code: code_type, record: numpy.ndarray, error_rates: dict = {}):
+        """Applies random errors from the zero state of ``code`` and writes the result to ``record``."""
+        self.reset(code)
+        code.random_errors(**error_rates)
+        record[: self.erasures.start] = [ancilla.syndrome for ancilla in self.ancillas]
+        record[self.erasures] = [getattr(qubit, "erasure", None) == code.instance for qubit in self.data_qubits]
+        logical_state = code.logical_state
+        record[self.logicals] = [logical_state[key] for key in self.logical_keys]
+
+    def load(self, code: code_type, record: numpy.ndarray):
+        """Loads the syndrome and erasures of ``record`` onto the zero state of ``code`` as a new instance."""
+        self.reset(code)
+        code.instance = time.time()
+        for ancilla, syndrome in zip(self.ancillas, record[: self.erasures.start].tolist()):
+            ancilla.syndrome = bool(syndrome)
+        if "erasure" in code.errors:
+            erased = record[self.erasures].tolist()
+            for qubit in self.data_qubits:
+                qubit.erasure = None
+            code.errors["erasure"].load_erased([qubit for qubit, bit in zip(self.data_qubits, erased) if bit])
+
+    def no_error(self, code: code_type, record: numpy.ndarray) -> bool:
+        """Returns whether the correction on ``code`` is equivalent to the errors of ``record``."""
+        code.prev_logical_state = dict(zip(self.logical_keys, record[self.logicals].tolist()))
+        code.logical_state
+        return code.no_error
+
+
+class RingBuffer(object):
+    """Ring buffer of batches of records in shared memory.
+
+    The buffer consists of ``slots`` slots that each hold a batch of ``batch_size`` records of ``record_size`` bytes. Only the indices of the slots are passed between processes through the queues ``free`` and ``full``. A producer takes a slot from ``free``, writes a batch into the slot and puts the slot into ``full``, from which a consumer takes it and puts it back into ``free`` after reading.
+
+    Parameters
+    ----------
+    slots
+        Number of slots.
+    batch_size
+        Number of records per slot.
+    record_size
+        Size of a record in bytes.
+
+    Attributes
+    ----------
+    records : numpy.ndarray
+        Array of shape ``(slots, batch_size, record_size)`` on the shared memory.
+    """
+
+    def __init__(self, slots: int, batch_size: int, record_size: int):
+        from multiprocessing import shared_memory  # Python 3.8+
+
+        self.memory = shared_memory.SharedMemory(create=True, size=max(1, slots * batch_size * record_size))
+        self.records = numpy.ndarray((slots, batch_size, record_size), dtype=numpy.uint8, buffer=self.memory.buf)
+        self.free = Queue()
+        self.full = Queue()
+        for slot in range(slots):
+            self.free.put(slot)
+
+    def close(self):
+        """Releases the shared memory."""
+        del self.records
+        self.memory.close()
+        self.memory.unlink()
+
+
+def _sampler(
+    code: code_type,
+    layout: ShotLayout,
+    buffer: RingBuffer,
+    batches: Queue,
+    results: Queue,
+    error_rates: dict,
+    seed: seed_type,
+):
+    """Target of the sampler processes of `run_pipeline`.
+
+    Batches of iterations ``(first, count)`` are taken from ``batches`` until a ``None`` is received. The errors of every iteration are drawn from `~.main.iteration_rng`, such that the records do not depend on the number of samplers. Before the sampler reports on ``results``, all its batches are flushed to the full slots of ``buffer``, such that they precede the stop signals that are put on the same queue after the report.
+    """
+    duration = 0.0
+    try:
+        while True:
+            batch = batches.get()
+            if batch is None:
+                break
+            first, count = batch
+            slot = buffer.free.get()
+            start = timeit.default_timer()
+            for index in range(count):
+                code.rng = iteration_rng(seed, first + index)
+                layout.sample(code, buffer.records[slot, index], error_rates)
+            duration += timeit.default_timer() - start
+            buffer.full.put((slot, count))
+        buffer.full.close()
+        buffer.full.join_thread()
+    except Exception:
+        results.put(("sampler", None, traceback.format_exc()))
+    else:
+        results.put(("sampler", {"no_error": 0, "iterations": 0}, duration))
+
+
+def _decoder(
+    code: code_type,
+    decoder: decoder_type,
+    layout: ShotLayout,
+    buffer: RingBuffer,
+    results: Queue,
+    error_rates: dict,
+    kwargs: dict,
+):
+    """Target of the decoder processes of `run_pipeline`.
+
+    Batches are taken from the full slots of ``buffer`` until a ``None`` is received. Every record is loaded onto the code, decoded and compared with the logical parity of its errors. The number of decoded records is reported under ``"iterations"``.
+    """
+    output = {"no_error": 0, "iterations": 0}
+    duration = 0.0
+    try:
+        code.random_errors(**error_rates)  # Loads the error rates for the edge weights of the decoder
+        while True:
+            batch = buffer.full.get()
+            if batch is None:
+                break
+            slot, count = batch
+            start = timeit.default_timer()
+            for record in buffer.records[slot, :count]:
+                layout.load(code, record)
+                decoder.decode(**kwargs)
+                output["no_error"] += layout.no_error(code, record)
+            output["iterations"] += count
+            duration += timeit.default_timer() - start
+            buffer.free.put(slot)
+    except Exception:
+        results.put(("decoder", None, traceback.format_exc()))
+    else:
+        results.put(("decoder", output, duration))
+
+
+def run_pipeline(
+    code: code_type,
+    decoder: decoder_type,
+    error_rates: dict = {},
+    iterations: int = 1,
+    seed: Optional[seed_type] = None,
+    samplers: int = 1,
+    decoders: int = 1,
+    batch_size: int = 16,
+    slots: Optional[int] = None,
+    **kwargs,
+) -> dict:
+    """Runs a surface code simulation in a pipeline of sampler and decoder processes.
+
+    The ``iterations`` are divided into batches of ``batch_size`` iterations. The ``samplers`` sampler processes apply the errors of each batch from the zero state of their copy of ``code``, and write the syndromes, erasures and logical parities of the errors (see `ShotLayout`) to a free slot of a `RingBuffer`. The ``decoders`` decoder processes load each record onto their copy of ``code``, decode it with their copy of ``decoder``, and count the iterations where the correction is equivalent to the errors. As every iteration is sampled from `~.main.iteration_rng`, the results do not depend on the number of samplers and decoders, and are equal to the results of `~.main.run` with the same ``seed``. The only exception are erasures with random initial states, which replace the state of a qubit instead of flipping it, such that their outcome depends on the state left by the previous iteration in `~.main.run`.
+
+    Parameters
+    ----------
+    code
+        A surface code instance (see `~.main.initialize`).
+    decoder
+        A decoder instance (see `~.main.initialize`).
+    error_rates
+        Dictionary of error rates (see `~qsurface.errors`).
+    iterations
+        Number of iterations to run.
+    seed
+        Entropy of the `~numpy.random.SeedSequence` of the simulation.
+    samplers
+        Number of sampler processes.
+    decoders
+        Number of decoder processes.
+    batch_size
+        Number of iterations per slot of the ring buffer.
+    slots
+        Number of slots of the ring buffer. Defaults to 2 slots per process.
+    kwargs
+        Keyword arguments are passed on to `~.decoders._template.Sim.decode`.
+
+    Returns
+    -------
+    dict
+        The number of iterations without logical errors under ``"no_error"``, and the total durations of sampling and decoding over all processes under ``"pipeline"``, which indicate whether the samplers or decoders are the bottleneck.
+
+    Examples
+    --------
+    For the fast Union-Find decoder, more samplers than decoders may be required:
+
+        >>> code, decoder = initialize((12,12), "toric", "unionfind", enabled_errors=["pauli"])
+        >>> run_pipeline(code, decoder, iterations=10000, error_rates={"p_bitflip": 0.1}, samplers=3, decoders=1)
+        {'no_error': 7413, 'pipeline': {'sample': 13.12, 'decode': 4.45}}
+    """
+    if hasattr(code, "figure"):
+        raise TypeError("Cannot use surface code with plotting enabled for multiprocess.")
+    if seed is None:
+        seed = numpy.random.SeedSequence().entropy
+    if slots is None:
+        slots = 2 * (samplers + decoders)
+
+    layout = ShotLayout(code)
+    buffer = RingBuffer(slots, batch_size, layout.size)
+    batches, results = Queue(), Queue()
+    workers: List[Process] = [
+        Process(target=_sampler, args=(code, layout, buffer, batches, results, error_rates, seed), daemon=True)
+        for _ in range(samplers)
+    ] + [
+        Process(target=_decoder, args=(code, decoder, layout, buffer, results, error_rates, kwargs), daemon=True)
+        for _ in range(decoders)
+    ]
+    for worker in workers:
+        worker.start()
+
+    completed = False
+    try:
+        for first in range(0, iterations, batch_size):
+            batches.put((first, min(batch_size, iterations - first)))
+        for _ in range(samplers):
+            batches.put(None)
+
+        output = {"no_error": 0, "pipeline": {"sample": 0.0, "decode": 0.0}}
+        finished = {"sampler": 0, "decoder": 0}
+        decoded = 0
+        while finished["decoder"] < decoders:
+            role, partial_output, duration = results.get()
+            if partial_output is None:
+                raise RuntimeError(f"A {role} process failed:\n{duration}")
+            finished[role] += 1
+            output["no_error"] += partial_output["no_error"]
+            decoded += partial_output["iterations"]
+            output["pipeline"]["sample" if role == "sampler" else "decode"] += duration
+            if role == "sampler" and finished["sampler"] == samplers:
+                for _ in range(decoders):
+                    buffer.full.put(None)
+        if decoded != iterations:
+            raise RuntimeError(f"The decoders decoded {decoded} of {iterations} iterations.")
+        completed = True
+    finally:
+        for worker in workers:
+            if not completed:
+                worker.terminate()
+            worker.join()
+        buffer.close()
+
+    return output
@@ -0,0 +1,151 @@
+"""
+Per-shot records of simulations. Where `~.main.run` only counts the successful iterations, a `ShotRecorder` writes a record of every iteration to a binary file for analysis afterwards. Each record is a single row of the structured data type `SHOT_DTYPE`:
+
+============================  =========  ==========================================================
+Field                         Type       Description
+============================  =========  ==========================================================
+``iteration``                 uint64     Index of the iteration in the streams of the seed, see `~.main.iteration_rng`.
+``syndrome_weight``           uint32     Number of nontrivial syndromes before decoding.
+``correction_weight``         uint32     Number of corrections applied by the decoder.
+``no_error``                  bool       Whether the logical state is unchanged after decoding.
+``duration``                  float32    Duration of decoding in seconds.
+============================  =========  ==========================================================
+
+The file is a plain sequence of packed records without a header, such that records are appended by a single write of a buffer of rows, and the file is read without copying by `read_records` as a `~numpy.memmap`.
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Union
+import os
+import timeit
+import numpy
+from .codes._template.sim import PerfectMeasurements
+from .decoders._template import Sim as Decoder
+
+
+SHOT_DTYPE = numpy.dtype(
+    [
+        ("iteration", "<u8"),
+        ("syndrome_weight", "<u4"),
+        ("correction_weight", "<u4"),
+        ("no_error", "?"),
+        ("duration", "<f4"),
+    ]
+)
+
+
+class ShotRecorder(object):
+    """Buffered writer of the per-shot records of a simulation.
+
+    The recorder decodes every iteration through `decode`, which counts the nontrivial syndromes of all ancilla-qubits of the code before decoding, counts the calls of `~.decoders._template.Sim.correct_edge` during decoding, and times the decoding. The record of the iteration is completed by `write` and stored in a preallocated buffer, which is appended to the file when it is full or when the recorder is closed. The file is opened in append mode, such that multiple processes, such as the workers of a `~.main.WorkerPool`, can write to the same file; every buffer is appended by a single system call in general, such that records of different processes are not interleaved, but their order in the file is arbitrary. Records of iterations that are run again after resuming from a checkpoint are appended again, and can be removed by their ``iteration`` field.
+
+    Parameters
+    ----------
+    file
+        Path of the record file.
+    code
+        Surface code instance.
+    decoder
+        Decoder instance of ``code``. Its `~.decoders._template.Sim.correct_edge` method is wrapped on the instance until the recorder is closed.
+    buffer_size
+        Number of records in the buffer.
+
+    Attributes
+    ----------
+    records : int
+        Number of records that have been written, including the records in the buffer.
+
+    Examples
+    --------
+        >>> code, decoder = initialize((6,6), "toric", "unionfind", enabled_errors=["pauli"])
+        >>> run(code, decoder, iterations=1000, error_rates={"p_bitflip": 0.1}, records="shots.bin")
+        >>> shots = read_records("shots.bin")
+        >>> shots["correction_weight"][~shots["no_error"]].mean()
+        5.8
+    """
+
+    def __init__(self, file: Union[str, Path], code: PerfectMeasurements, decoder: Decoder, buffer_size: int = 65536):
+        self.path = Path(file)
+        self.code = code
+        self.decoder = decoder
+        self.ancillas = [ancilla for layer in code.ancilla_qubits.values() for ancilla in layer.values()]
+        self.buffer = numpy.zeros(buffer_size, dtype=SHOT_DTYPE)
+        self.count = 0
+        self.records = 0
+        self.syndrome_weight = 0
+        self.corrections = 0
+        self.duration = 0.0
+        self.fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+        self.traced = decoder.__dict__.get("correct_edge")
+        correct_edge = decoder.correct_edge
+
+        def counted(*args, **kwargs):
+            self.corrections += 1
+            return correct_edge(*args, **kwargs)
+
+        decoder.correct_edge = counted
+
+    def __repr__(self):
+        return f"ShotRecorder({self.path}, {self.records} records)"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def decode(self, **kwargs):
+        """Decodes the current syndrome with the decoder and measures the syndrome weight, correction weight and duration."""
+        self.syndrome_weight = sum(ancilla.syndrome for ancilla in self.ancillas)
+        self.corrections = 0
+        start = timeit.default_timer()
+        self.decoder.decode(**kwargs)
+        self.duration = timeit.default_timer() - start
+
+    def write(self, iteration: int, no_error: bool):
+        """Adds the record of the last decoded iteration to the buffer."""
+        self.buffer[self.count] = (iteration, self.syndrome_weight, self.corrections, no_error, self.duration)
+        self.count += 1
+        self.records += 1
+        if self.count == len(self.buffer):
+            self.flush()
+
+    def flush(self):
+        """Appends the records in the buffer to the file."""
+        data = memoryview(self.buffer[: self.count].tobytes())
+        while data:
+            data = data[os.write(self.fd, data) :]
+        self.count = 0
+
+    def close(self):
+        """Flushes the buffer, closes the file and restores the decoder."""
+        if self.fd is not None:
+            self.flush()
+            os.close(self.fd)
+            self.fd = None
+            if self.traced is None:
+                del self.decoder.correct_edge
+            else:
+                self.decoder.correct_edge = self.traced
+
+
+def read_records(file: Union[str, Path]) -> numpy.ndarray:
+    """Reads a record file of a `ShotRecorder` as a read-only memory map.
+
+    An incomplete record at the end of the file, from a write that was interrupted, is ignored.
+
+    Parameters
+    ----------
+    file
+        Path of the record file.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of ``SHOT_DTYPE`` records, memory mapped if the file is not empty.
+    """
+    count = os.path.getsize(file) // SHOT_DTYPE.itemsize
+    if count == 0:
+        return numpy.zeros(0, dtype=SHOT_DTYPE)
+    return numpy.memmap(file, dtype=SHOT_DTYPE, mode="r", shape=(count,))
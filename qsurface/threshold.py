@@ -1,4 +1,4 @@
-from typing import Dict, List, Tuple, Union, Optional
+from typing import Dict, Iterator, List, Tuple, Union, Optional
 from types import ModuleType
 from dataclasses import dataclass
 import matplotlib.pyplot as plt
@@ -7,11 +7,18 @@ from matplotlib.figure import Figure
 from pathlib import Path
 from pprint import pprint
 from datetime import datetime
+from multiprocessing import Pool
 from scipy import optimize
 import pandas as pd
 import numpy as np
+import csv
+import hashlib
+import json
+import os
 import sys
-from .main import initialize, run, run_multiprocess, BenchmarkDecoder
+from . import codes, decoders
+from .main import initialize, run, BenchmarkDecoder, WorkerPool, _combine_outputs
+from .decoders._template import init_config
 from .errors._template import Sim as Error
 
 
@@ -33,11 +40,16 @@ def run_many(
     output: str = "",
     mp_processes: int = 1,
     recursion_limit: int = 100000,
+    pool: Optional[WorkerPool] = None,
+    checkpoint: Optional[str] = None,
+    store: Optional[str] = None,
+    coupled: bool = False,
+    seed: Optional[int] = None,
     **kwargs,
 ) -> Optional[pd.DataFrame]:
     """Runs a series of simulations of varying sizes and error rates.
 
-    A series of simulations are run without plotting for all combinations of ``sizes`` and ``error_rates``. The results are returned as a Pandas DataFrame and saved to the working directory as a csv file. If an existing csv file with the same file name is found, the existing file is loaded and new results are appended to the existing data. A `.main.BenchmarkDecoder` object is attached to each simulation to log the seed and other information.
+    A series of simulations are run without plotting for all combinations of ``sizes`` and ``error_rates``. The results are returned as a Pandas DataFrame and saved to the working directory as a csv file. The result of each configuration is appended to the file by a `ResultsWriter` as soon as it is available, such that the file is never rewritten and all finished configurations are safe on disk if the series is interrupted. If an existing csv file with the same file name is found, the existing file is loaded and new results are appended to the existing data. A `.main.BenchmarkDecoder` object is attached to each simulation to log the seed and other information.
 
     Parameters
     ----------
@@ -60,7 +72,17 @@ def run_many(
     output
         File name of outputted csv data. If set to "none", no file will be saved.
     mp_processses
-        Number of processes to spawn. For a single process, `~.main.run` is used. For multiple processes, `~main.run_multiprocess` is utilized.
+        Number of processes to spawn. For a single process, `~.main.run` is used. For multiple processes, a single `~.main.WorkerPool` is started for all configurations, whose workers initialize and cache the code and decoder of each size themselves, such that only the size, error rates, seed and number of iterations are sent to the workers for each configuration.
+    pool
+        A pool to run all simulations on by `~.main.WorkerPool.run_size`, such as a `~.distributed.Coordinator` with worker agents on other hosts. The pool must be created with the same ``Code``, ``Decoder`` and initialization arguments, and is not closed. Overrides ``mp_processes``.
+    checkpoint
+        File name of the checkpoint of the configuration in progress, see `~.main.run` and `~.main.WorkerPool.run`. If set, configurations whose results are already in the csv file are skipped, and an interrupted configuration is resumed from the checkpoint, such that an interrupted series continues where it left off if it is started again with the same arguments. The checkpoint is removed after the results of each configuration are added to the data.
+    store
+        Directory of a `ResultStore`. Configurations with at least ``iterations`` iterations in the store are not simulated again. Configurations with fewer iterations are topped up to ``iterations`` iterations, by continuing the seed of the stored result with the stored number of iterations as ``iteration_offset``, such that the combined result is equal to a single simulation of all iterations.
+    coupled
+        Couples the samples of all error rates of the same size by simulating them with the same seed. As the error modules draw a single uniform number ``u`` per qubit and per error type in a fixed order, and apply an error if ``u < p``, iteration ``i`` of all error rates uses the same uniform numbers, and the errors at a lower rate are a subset of the errors at a higher rate. The estimates of the success rates of different error rates are then positively correlated, such that the differences between error rates, and thus the crossing of the curves of different sizes at the threshold, are estimated with much fewer iterations. The coupling is exact if the same error rates are nonzero for all configurations, and erased qubits are re-initialized to fixed states.
+    seed
+        Entropy from which the seed of each size is derived if ``coupled`` is enabled. As the seed of a size only depends on ``seed`` and the size, a series that is resumed from a ``checkpoint`` or topped up from a ``store`` continues with the same seeds, which is why a ``seed`` is required for coupled series with a checkpoint or a store. Without a checkpoint or a store, fresh entropy is drawn if not set.
 
     Examples
     --------
@@ -92,8 +114,13 @@ def run_many(
     """
     sys.setrecursionlimit(recursion_limit)
 
+    if coupled and seed is None:
+        if checkpoint is not None or store is not None:
+            raise ValueError("A seed is required to resume or top up a coupled series.")
+        seed = np.random.SeedSequence().entropy
+
     code_name = Code.__name__.split(".")[-1] if isinstance(Code, ModuleType) else Code
-    decoder_name = Decoder.__name__.split(".")[-1] if isinstance(Decoder, ModuleType) else Code
+    decoder_name = Decoder.__name__.split(".")[-1] if isinstance(Decoder, ModuleType) else Decoder
     error_names = "/".join([error.__name__.split(".")[-1] if isinstance(error, Error) else error for error in enabled_errors])
 
     if output == "":
@@ -106,27 +133,80 @@ def run_many(
         data = read_csv(output_path)
     else:
         data = pd.DataFrame()
-
-    runner = run_multiprocess if mp_processes > 1 else run
+    writer = None if output == "none" else ResultsWriter(output_path)
+    rows = []
+    result_store = None if store is None else ResultStore(store)
+    description = dict(
+        Code=code_name,
+        Decoder=decoder_name,
+        faulty_measurements=faulty_measurements,
+        enabled_errors=[error.__name__.split(".")[-1] if isinstance(error, ModuleType) else error for error in enabled_errors],
+        methods_to_benchmark=methods_to_benchmark,
+        decoder_config=_decoder_config(Code, Decoder),
+        kwargs=kwargs,
+    )
+
+    own_pool = pool is None and mp_processes > 1
+    if own_pool:
+        pool = WorkerPool(
+            mp_processes,
+            Code,
+            Decoder,
+            enabled_errors=enabled_errors,
+            faulty_measurements=faulty_measurements,
+            **kwargs,
+        )
 
     # Simulate and save results to file
     for size in sizes:
 
-        code, decoder = initialize(size, Code, Decoder, enabled_errors, faulty_measurements, **kwargs)
+        if pool is None:
+            code, decoder = initialize(size, Code, Decoder, enabled_errors, faulty_measurements, **kwargs)
+        size_seed = _size_seed(seed, size) if coupled else None
 
         for error_rate in error_rates:
-            print(f"Running ({size}) lattice with error rates {error_rate}.")
-
-            benchmarker = BenchmarkDecoder(methods_to_benchmark)
-
-            result = runner(
-                code,
-                decoder,
-                iterations=iterations,
-                error_rates=error_rate,
-                benchmark=benchmarker,
-                mp_processes=mp_processes,
-            )
+            if checkpoint is not None and _has_result(data, size, error_rate):
+                print(f"Skipping ({size}) lattice with error rates {error_rate}, which is already in the data.")
+                continue
+
+            key, entry = None, None
+            if result_store is not None:
+                key = result_store.key(size=size, error_rates=error_rate, **description)
+                entry = result_store.get(key)
+            done = 0 if entry is None else entry["iterations"]
+
+            if done >= iterations:
+                print(f"Found ({size}) lattice with error rates {error_rate} in the store.")
+                result = entry["output"]
+            else:
+                print(f"Running ({size}) lattice with error rates {error_rate}.")
+
+                benchmarker = BenchmarkDecoder(methods_to_benchmark)
+                run_kwargs = dict(
+                    iterations=iterations - done,
+                    error_rates=error_rate,
+                    benchmark=benchmarker,
+                    checkpoint=checkpoint,
+                    seed=size_seed if entry is None else entry["seed"],
+                    iteration_offset=done,
+                )
+
+                if pool is None:
+                    result = run(code, decoder, **run_kwargs)
+                else:
+                    result = pool.run_size(size, **run_kwargs)
+
+                if result_store is not None:
+                    result_seed = result["benchmark"]["seed"]
+                    if entry is not None:
+                        result = _combine_outputs([entry["output"], result], result_seed)
+                    entry = dict(
+                        description=dict(size=size, error_rates=error_rate, **description),
+                        seed=result_seed,
+                        iterations=iterations,
+                        output=result,
+                    )
+                    result_store.put(key, entry)
 
             result.update(
                 {
@@ -139,22 +219,380 @@ def run_many(
 
             pprint(result)
 
-            data = data.append(result, ignore_index=True)
+            rows.append(result)
+
+            if checkpoint is not None and os.path.exists(checkpoint):
+                os.remove(checkpoint)
+
+            if writer is not None:
+                writer.write(result)
+
+    if own_pool:
+        pool.close()
+    if writer is not None:
+        writer.close()
+
+    return pd.concat([data, pd.DataFrame(rows)], ignore_index=True)
+
+
+def run_adaptive(
+    Code: module_or_name,
+    Decoder: module_or_name,
+    sizes: List[Union[int, Tuple[int, int]]] = [],
+    rate: str = "p_bitflip",
+    bracket: Tuple[float, float] = (0.05, 0.15),
+    points: int = 5,
+    iterations: int = 1000,
+    rounds: int = 4,
+    growth: float = 2,
+    tolerance: float = 0,
+    error_rates: Dict = {},
+    output: str = "",
+    **kwargs,
+) -> Tuple[pd.DataFrame, dict]:
+    """Runs a series of simulations with error rates that are adaptively placed near the threshold.
+
+    Instead of a fixed grid of error rates, the error rate ``rate`` is searched in rounds. The first round simulates ``points`` equally spaced error rates over ``bracket`` for all ``sizes``. After each round, the crossing of the success rates of the sizes is estimated by `estimate_crossing` from the data within the window of the round, and the window of the next round is centered on the crossing with a half-width of twice the standard deviation of the crossing. The window shrinks by at most a factor of 2 per round, such that the slope of the difference of the success rates remains resolved, and stays within ``bracket``. As the uncertainty of the crossing is dominated by the variance of the success rates at the crossing itself, the number of iterations per configuration is multiplied by ``growth`` every round, such that most of the iterations are spent close to the threshold. The search stops after ``rounds`` rounds, or as soon as the standard deviation of the crossing is below ``tolerance``.
+
+    Every round is a call to `run_many`, which appends its results to the same ``output`` file and accepts the same keyword arguments, such as ``store``, ``checkpoint``, ``coupled`` and ``mp_processes``. A ``pool`` can be passed to reuse the same workers in all rounds. As the file may contain the results of other series, the crossing is only estimated from the rows of ``sizes`` with the fixed ``error_rates`` and no other nonzero error rates. If no crossing can be estimated in a round, for example if the success rates do not differ yet, the window is widened by a factor of 2 around its center for the next round, and the last valid estimate is kept.
 
-            if output != "none":
-                data.to_csv(output_path)
+    Parameters
+    ----------
+    Code
+        Any surface code module or module name from codes.
+    Decoder
+        Any decoder module or module name from decoders
+    sizes
+        The sizes of the surface configurations.
+    rate
+        Name of the error rate to search, e.g. ``"p_bitflip"``.
+    bracket
+        Lowest and highest error rate of the search.
+    points
+        Number of error rates per round.
+    iterations
+        Number of iterations per configuration in the first round.
+    rounds
+        Maximum number of rounds.
+    growth
+        Factor of the number of iterations per configuration of each round compared to the previous round.
+    tolerance
+        Standard deviation of the crossing at which the search stops.
+    error_rates
+        Other error rates that are fixed for all configurations.
+    output
+        File name of outputted csv data. If set to "none", no file will be saved.
+    kwargs
+        Keyword arguments are passed on to `run_many`.
 
-    return data
+    Returns
+    -------
+    tuple
+        The data of the configurations of the search, and the last valid estimate of the crossing of `estimate_crossing` with the window of its round under ``"window"``, which is ``None`` if no crossing could be estimated in any round.
+
+    Examples
+    --------
+        >>> data, crossing = run_adaptive(
+        ...     "toric",
+        ...     "unionfind",
+        ...     sizes = [8, 12, 16],
+        ...     enabled_errors = ["pauli"],
+        ...     bracket = (0.05, 0.15),
+        ...     iterations = 1000,
+        ... )
+        >>> crossing["pth"], crossing["std"]
+        (0.0995, 0.0007)
+    """
+    if points < 2:
+        raise ValueError("At least 2 error rates per round are required.")
+
+    data, crossing = pd.DataFrame(), None
+    low, high = bracket
+    for step in range(rounds):
+        print(f"Round {step+1}/{rounds} with {iterations} iterations between {rate} {low:.6g} and {high:.6g}.")
+        round_rates = [{**error_rates, rate: float(f"{p:.6g}")} for p in np.linspace(low, high, points)]
+        round_data = run_many(Code, Decoder, iterations, sizes, error_rates=round_rates, output=output, **kwargs)
+        data = round_data if output != "none" else pd.concat([data, round_data], ignore_index=True)
+        data = _select_configurations(data, sizes, rate, error_rates)
+
+        try:
+            estimate = estimate_crossing(data, rate, (low, high))
+        except ValueError as error:
+            print(f"No crossing in round {step+1}: {error}")
+            center, half = (low + high) / 2, min((bracket[1] - bracket[0]) / 2, high - low)
+        else:
+            crossing = dict(estimate, window=(low, high))
+            print(f"Estimated crossing at {crossing['pth']}+-{crossing['std']}")
+            if crossing["std"] < tolerance:
+                break
+            center, half = crossing["pth"], min((high - low) / 2, max(2 * crossing["std"], (high - low) / 4))
+
+        center = min(max(center, bracket[0] + half), bracket[1] - half)
+        low, high = max(center - half, bracket[0]), min(center + half, bracket[1])  # Rounding may cross the bracket
+        iterations = int(iterations * growth)
+
+    return data, crossing
+
+
+def _select_configurations(data: pd.DataFrame, sizes: list, rate: str, error_rates: Dict) -> pd.DataFrame:
+    """Returns the rows of ``data`` of ``sizes`` with the fixed ``error_rates``, any value of ``rate``, and no other nonzero error rates."""
+    selected = data["size"].astype(str).isin([str(size) for size in sizes])
+    for column in data.columns:
+        if column == rate or not column.startswith("p_"):
+            continue
+        if column in error_rates:
+            selected &= data[column] == error_rates[column]
+        else:
+            selected &= data[column].isna() | (data[column] == 0)
+    return data[selected].reset_index(drop=True)
+
+
+def estimate_crossing(data: pd.DataFrame, column: str, window: Optional[Tuple[float, float]] = None) -> dict:
+    """Estimates the crossing of the success rates of consecutive sizes.
+
+    For every pair of consecutive sizes, the difference of the success rates of the sizes is fitted linearly in the error rate by weighted least squares on the error rates that both sizes share within ``window``, with the binomial variance of each difference as weight. The crossing of the pair is the root of the fit, and its standard deviation follows from the covariance of the fit. The crossings of all pairs are combined by their inverse variances, where the correlation between pairs that share a size is ignored. As the difference is only linear close to the threshold, ``window`` should be narrow around the threshold, such as the window of the last round of `run_adaptive`, after which `ThresholdFit` can be used on all data.
+
+    Parameters
+    ----------
+    data
+        Data obtained via `run_many`.
+    column
+        The column of the DataFrame with the error rate.
+    window
+        Lowest and highest error rate to include. All error rates are included if not set.
+
+    Returns
+    -------
+    dict
+        The combined crossing under ``"pth"``, its standard deviation under ``"std"``, and the crossing of each pair of sizes under ``"crossings"``.
+    """
+    grouped = data.groupby(["size", column])[["iterations", "no_error"]].sum()
+    sizes = sorted(set(data["size"]))
+
+    crossings = []
+    for small, large in zip(sizes[:-1], sizes[1:]):
+        rates = grouped.loc[small].index.intersection(grouped.loc[large].index)
+        if window is not None:
+            rates = rates[(rates >= window[0]) & (rates <= window[1])]
+        if len(rates) < 2:
+            continue
+        x = rates.to_numpy(dtype=float)
+        difference, variance = 0, 0
+        for size, sign in [(small, -1), (large, 1)]:
+            counts = grouped.loc[size].loc[rates]
+            iterations, no_error = counts["iterations"].to_numpy(float), counts["no_error"].to_numpy(float)
+            difference = difference + sign * no_error / iterations
+            smoothed = (no_error + 1) / (iterations + 2)  # Nonzero variance at success rates of 0 or 1
+            variance = variance + smoothed * (1 - smoothed) / iterations
+        weights = 1 / variance
+        center = np.sum(weights * x) / np.sum(weights)
+        intercept = np.sum(weights * difference) / np.sum(weights)
+        slope = np.sum(weights * (x - center) * difference) / np.sum(weights * (x - center) ** 2)
+        if slope == 0:
+            continue
+        intercept_var, slope_var = 1 / np.sum(weights), 1 / np.sum(weights * (x - center) ** 2)
+        crossings.append(
+            {
+                "sizes": (small, large),
+                "pth": float(center - intercept / slope),
+                "std": float(np.sqrt(intercept_var / slope ** 2 + intercept ** 2 * slope_var / slope ** 4)),
+            }
+        )
+
+    if not crossings:
+        raise ValueError("At least 2 sizes with 2 shared error rates are required to estimate a crossing.")
+    inverse_var = np.array([1 / crossing["std"] ** 2 for crossing in crossings])
+    pth = np.sum(inverse_var * np.array([crossing["pth"] for crossing in crossings])) / np.sum(inverse_var)
+    return {"pth": float(pth), "std": float(np.sqrt(1 / np.sum(inverse_var))), "crossings": crossings}
+
+
+def _size_seed(seed: int, size: Union[int, Tuple[int, int]]) -> int:
+    """Returns the seed of the coupled configurations of ``size``, derived from ``seed`` and the size."""
+    entropy = [seed, *size] if isinstance(size, tuple) else [seed, size]
+    return int.from_bytes(np.random.SeedSequence(entropy).generate_state(4).tobytes(), "little")
+
+
+class ResultStore(object):
+    """Content-addressed store of simulation results.
+
+    Each simulated configuration is described by a dictionary of the code, decoder, size, faulty measurements, enabled errors, error rates, decoder configuration and all other arguments that change the result, and is stored under a *key* that is the SHA-256 hash of this description. The seed, number of iterations and output of the configuration are saved as a JSON file named by the key in ``directory``, such that the same configuration is found by its key from any series of simulations, and stores of different machines can be merged by copying the files.
+
+    Parameters
+    ----------
+    directory
+        Directory of the stored results, which is created if it does not exist.
+
+    Examples
+    --------
+        >>> store = ResultStore("results")
+        >>> key = store.key(Code="toric", Decoder="mwpm", size=8, error_rates={"p_bitflip": 0.1})
+        >>> store.put(key, {"seed": 1, "iterations": 1000, "output": {"no_error": 743}})
+        >>> store.get(key)["iterations"]
+        1000
+    """
+
+    def __init__(self, directory: str):
+        self.path = Path(directory)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def __repr__(self):
+        return f"ResultStore({self.path})"
+
+    @staticmethod
+    def key(**description) -> str:
+        """Returns the key of the configuration of ``description``, which is independent of the order of the arguments."""
+        description = json.dumps(description, sort_keys=True, default=str)
+        return hashlib.sha256(description.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Returns the stored entry of ``key``, or ``None`` if the key is not in the store."""
+        path = self.path / f"{key}.json"
+        if not path.exists():
+            return None
+        with open(path) as file:
+            return json.load(file)
+
+    def put(self, key: str, entry: dict):
+        """Stores ``entry`` under ``key``, replacing the file of the key atomically."""
+        temporary = self.path / f"{key}.json.tmp"
+        with open(temporary, "w") as file:
+            json.dump(entry, file, default=_to_json)
+        os.replace(temporary, self.path / f"{key}.json")
+
+
+def _to_json(value):
+    """Converts NumPy scalars and other objects that are not supported by `json`."""
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def _decoder_config(Code: module_or_name, Decoder: module_or_name) -> dict:
+    """Returns the configuration of the decoder from the default and user defined ``decoders.ini`` files."""
+    if isinstance(Code, str):
+        Code = getattr(codes, Code)
+    if isinstance(Decoder, str):
+        Decoder = getattr(decoders, Decoder)
+    Decoder_class = getattr(Decoder.sim, Code.__name__.split(".")[-1].capitalize())
+    return dict(init_config(Path(decoders.__file__).resolve().parent / "decoders.ini")[Decoder_class.short])
+
+
+def _has_result(data: pd.DataFrame, size: Union[int, Tuple[int, int]], error_rate: Dict) -> bool:
+    """Returns whether ``data`` contains the results of the configuration of ``size`` and ``error_rate``."""
+    if data.empty or any(name not in data for name in ["size", *error_rate]):
+        return False
+    match = data["size"].astype(str) == str(size)
+    for name, rate in error_rate.items():
+        match &= np.isclose(data[name], rate)
+    return bool(match.any())
+
+
+class ResultsWriter(object):
+    """Append-only writer of results to a csv file.
+
+    Every row is appended to the file as a single line, which is flushed and synced to disk by `os.fsync` before `write` returns, such that the existing rows are never rewritten and at most the row that is being written is lost on a crash. A partially written last line of an interrupted writer is removed when the file is opened again.
+
+    The columns of a file are fixed by its header. If a row contains columns that are not in the header, the writer continues in a new *shard* of the file, ``data.1.csv``, ``data.2.csv`` and so on for the file ``data.csv``. All shards of a file are read and concatenated by `read_csv`.
+
+    Parameters
+    ----------
+    file
+        File name of the csv file.
+
+    Examples
+    --------
+        >>> with ResultsWriter("data.csv") as writer:
+        ...     writer.write({"no_error": 820, "size": 8, "p_bitflip": 0.09})
+        >>> read_csv("data.csv")
+           no_error  size  p_bitflip
+        0       820     8       0.09
+    """
+
+    def __init__(self, file: str):
+        self.path = Path(file)
+        self.shard = len(_shards(self.path)) - 1 if self.path.exists() else 0
+        self.file = None
+        self._read_header()
+
+    def __repr__(self):
+        return f"ResultsWriter({_shard_path(self.path, self.shard)}, {self.rows} rows)"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _read_header(self):
+        """Reads the header and number of rows of the current shard."""
+        path = _shard_path(self.path, self.shard)
+        self.columns, self.rows = [], 0
+        if path.exists():
+            with open(path, "rb+") as file:
+                content = file.read()
+                end = content.rfind(b"\n") + 1
+                if end < len(content):  # Partial line of an interrupted write
+                    file.truncate(end)
+            lines = content[:end].decode().splitlines()
+            if lines:
+                self.columns = next(csv.reader(lines[:1]))[1:]
+                self.rows = len(lines) - 1
+
+    def write(self, row: dict):
+        """Appends ``row`` to the file. Columns of the file that are not in ``row`` are left empty."""
+        if self.columns and any(name not in self.columns for name in row):
+            self.close()
+            self.shard += 1
+            self._read_header()
+        if self.file is None:
+            self.file = open(_shard_path(self.path, self.shard), "a", newline="")
+            self.writer = csv.writer(self.file)
+        if not self.columns:
+            self.columns = list(row)
+            self.writer.writerow(["", *self.columns])
+        self.writer.writerow([self.rows, *["" if row.get(name) is None else row[name] for name in self.columns]])
+        self.rows += 1
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        """Closes the file."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def _shard_path(path: Path, shard: int) -> Path:
+    """Returns the path of shard ``shard`` of the csv file ``path``."""
+    return path if shard == 0 else path.with_name(f"{path.stem}.{shard}{path.suffix}")
+
+
+def _shards(path: Path) -> List[Path]:
+    """Returns the paths of the existing shards of the csv file ``path``."""
+    shards = []
+    while _shard_path(path, len(shards)).exists():
+        shards.append(_shard_path(path, len(shards)))
+    return shards
+
+
+def iter_csv(file: str) -> Iterator[pd.DataFrame]:
+    """Lazily reads the shards of a csv file of `ResultsWriter` as Pandas DataFrames, one shard at a time."""
+    for shard in _shards(Path(file)):
+        if shard.stat().st_size:
+            yield pd.read_csv(shard, index_col=0)
 
 
 def read_csv(file: str) -> pd.DataFrame:
-    """Reads a CSV file parses it as a Pandas DataFrame."""
-    file_path = Path(file)
-    if file_path.exists():
-        data = pd.read_csv(file_path, index_col=0)
-    else:
+    """Reads a CSV file parses it as a Pandas DataFrame.
+
+    The shards of the file that are written by `ResultsWriter` are concatenated, where missing columns of a shard are filled with ``NaN``.
+    """
+    shards = list(iter_csv(file))
+    if not shards:
         raise FileNotFoundError
-    return data
+    if len(shards) == 1:
+        return shards[0]
+    return pd.concat(shards, ignore_index=True)
 
 
 @dataclass
@@ -208,9 +646,73 @@ class ThresholdFit:
 
         return func_modified if self.modified_ansatz else func
 
+    def _get_jacobian(self):
+        """Returns the Jacobian of the fitting function to the parameters."""
+
+        def jacobian(PL, pth, A, B, C, D, nu, mu):
+            p, L = np.asarray(PL[0], dtype=float), np.asarray(PL[1], dtype=float)
+            scale = L ** (1 / nu)
+            x = (p - pth) * scale
+            slope = B + 2 * C * x
+            jac = np.zeros((len(p), 7))
+            jac[:, 0] = -slope * scale
+            jac[:, 1] = 1
+            jac[:, 2] = x
+            jac[:, 3] = x ** 2
+            jac[:, 5] = -slope * x * np.log(L) / nu ** 2
+            if self.modified_ansatz:
+                correction = L ** (-1 / mu)
+                jac[:, 4] = correction
+                jac[:, 6] = D * correction * np.log(L) / mu ** 2
+            return jac
+
+        return jacobian
+
+    @staticmethod
+    def _aggregate_data(data: pd.DataFrame, column: str) -> tuple:
+        """Returns the sizes, error rates, iterations and number of successes of all configurations in ``data``."""
+        grouped = data.groupby(["size", column], sort=True)[["iterations", "no_error"]].sum().reset_index()
+        return tuple(grouped[key].to_numpy(dtype=float) for key in ["size", column, "iterations", "no_error"])
+
+    def _fit(
+        self, sizes: np.ndarray, rates: np.ndarray, iterations: np.ndarray, no_error: np.ndarray, p0: Optional[list] = None, **kwargs
+    ) -> tuple:
+        """Fits the success rates ``no_error / iterations`` and returns the parameters and their covariance.
+
+        Without the modified ansatz, the parameters ``D`` and ``mu`` do not affect the fitting function, and are fixed to their initial values with zero covariance.
+        """
+        parameters = np.array(self._get_param(1) if p0 is None else p0, dtype=float)
+        free = list(range(7)) if self.modified_ansatz else [0, 1, 2, 3, 5]
+        function, jacobian = self._get_fitting_function(), self._get_jacobian()
+
+        def fit(PL, *values):
+            parameters[free] = values
+            return function(PL, *parameters)
+
+        def fit_jacobian(PL, *values):
+            parameters[free] = values
+            return jacobian(PL, *parameters)[:, free]
+
+        values, free_covariance = optimize.curve_fit(
+            fit,
+            (rates, sizes),
+            no_error / iterations,
+            parameters[free],
+            bounds=[np.array(self._get_param(0))[free], np.array(self._get_param(2))[free]],
+            sigma=iterations.max() / iterations,
+            jac=fit_jacobian,
+            **kwargs,
+        )
+        parameters[free] = values
+        covariance = np.zeros((7, 7))
+        covariance[np.ix_(free, free)] = free_covariance
+        return parameters, covariance
+
     def fit_data(self, data: pd.DataFrame, column: str, **kwargs):
         """Fits for the code threshold.
 
+        The iterations and successes of rows with the same size and error rate are summed, and the success rates of the configurations are fitted with the analytic Jacobian of the fitting function.
+
         Parameters
         ----------
         data
@@ -220,34 +722,79 @@ class ThresholdFit:
         kwargs
             Keyword arguments are passed on the ``scipy.curve_fit``.
         """
-        sizes = sorted(list(set(data["size"])))
-        rates = sorted(list(set(data[column])))
-
-        simple_data = []
-        for size in sizes:
-            for rate in rates:
-                iters, no_error = 0, 0
-                for _, row in data.loc[(data["size"] == size) & (data[column] == rate)].iterrows():
-                    iters += row["iterations"]
-                    no_error += row["no_error"]
-                simple_data.append([size, rate, iters, no_error / iters])
-
-        sizes, rates, iterations, error_rate = tuple(map(list, zip(*simple_data)))
-
-        parameters, covariance = optimize.curve_fit(
-            self._get_fitting_function(),
-            (rates, sizes),
-            error_rate,
-            self._get_param(1),
-            bounds=[self._get_param(0), self._get_param(2)],
-            sigma=[max(iterations) / iters for iters in iterations],
-            **kwargs,
-        )
+        parameters, covariance = self._fit(*self._aggregate_data(data, column), **kwargs)
         error = np.sqrt(np.diag(covariance))
         print(f"Fitted threshold at {parameters[0]}+-{error[0]}")
 
         return list(parameters)
 
+    def bootstrap(
+        self,
+        data: pd.DataFrame,
+        column: str,
+        replicas: int = 200,
+        confidence: float = 0.95,
+        processes: int = 1,
+        seed: Optional[int] = None,
+        **kwargs,
+    ) -> dict:
+        """Estimates confidence intervals of the fitted parameters by a parametric bootstrap.
+
+        Each replica draws the number of successes of every configuration from the binomial distribution with the number of iterations and the success rate of the configuration in ``data``, and fits the replica with the parameters of the fit of ``data`` as initial guess. The confidence intervals are the percentiles of the fitted parameters of the replicas. The counts of replica ``i`` are drawn from the child of the `~numpy.random.SeedSequence` of ``seed`` with spawn key ``(i,)``, such that the replicas do not depend on the number of processes. Replicas whose fit does not converge are discarded, and a `RuntimeError` is raised if no replica converges.
+
+        Parameters
+        ----------
+        data
+            Data obtained via `~.threshold.run`.
+        column
+            The column of the DataFrame to fit for.
+        replicas
+            Number of bootstrap replicas.
+        confidence
+            Confidence level of the intervals.
+        processes
+            Number of processes that fit the replicas.
+        seed
+            Entropy of the `~numpy.random.SeedSequence` of the replicas.
+        kwargs
+            Keyword arguments are passed on the ``scipy.curve_fit``.
+
+        Returns
+        -------
+        dict
+            The parameters of the fit of ``data`` under ``"parameters"``, the confidence intervals of ``"pth"`` and ``"nu"``, and the parameters of all converged replicas under ``"replicas"``. With the modified ansatz, the confidence intervals of ``"D"`` and ``"mu"`` are included; otherwise these parameters are fixed and not reported.
+
+        Examples
+        --------
+            >>> fitter = ThresholdFit()
+            >>> interval = fitter.bootstrap(data, "p_bitflip", replicas=500, processes=4)
+            >>> interval["pth"]
+            (0.0981, 0.1013)
+        """
+        aggregated = self._aggregate_data(data, column)
+        parameters, _ = self._fit(*aggregated, **kwargs)
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+
+        bounds = np.linspace(0, replicas, max(1, min(processes, replicas)) + 1, dtype=int)
+        tasks = [(self, aggregated, parameters, seed, start, stop, kwargs) for start, stop in zip(bounds[:-1], bounds[1:])]
+        if len(tasks) == 1:
+            results = [_bootstrap_replicas(tasks[0])]
+        else:
+            with Pool(len(tasks)) as pool:
+                results = pool.map(_bootstrap_replicas, tasks)
+        fits = np.concatenate(results)
+        if len(fits) == 0:
+            raise RuntimeError(f"None of the {replicas} bootstrap replicas could be fitted.")
+
+        alpha = (1 - confidence) / 2 * 100
+        output = {"parameters": list(parameters), "replicas": fits}
+        names = [("pth", 0), ("nu", 5)] + ([("D", 4), ("mu", 6)] if self.modified_ansatz else [])
+        for name, index in names:
+            output[name] = tuple(float(value) for value in np.percentile(fits[:, index], [alpha, 100 - alpha]))
+        print(f"Threshold within ({output['pth'][0]}, {output['pth'][1]}) at {confidence} confidence")
+        return output
+
     def plot_data(
         self,
         data: pd.DataFrame,
@@ -333,3 +880,18 @@ class ThresholdFit:
             plt.show()
         else:
             return figure
+
+
+def _bootstrap_replicas(task: tuple) -> np.ndarray:
+    """Fits the bootstrap replicas ``start`` to ``stop`` of `ThresholdFit.bootstrap`."""
+    fitter, (sizes, rates, iterations, no_error), parameters, seed, start, stop, kwargs = task
+    fits = []
+    for replica in range(start, stop):
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(replica,)))
+        counts = rng.binomial(iterations.astype(int), no_error / iterations)
+        try:
+            fit, _ = fitter._fit(sizes, rates, iterations, counts, parameters, **kwargs)
+        except (RuntimeError, ValueError):
+            continue
+        fits.append(fit)
+    return np.array(fits).reshape(-1, 7)
@@ -36,3 +36,11 @@ def test_cli_threshold():
     args += ["--p_bitflip"] + [str(p) for p in [0.09, 0.1, 0.11]]
     args += ["-fc", "p_bitflip"]
     cli(args)
+
+
+def test_cli_threshold_adaptive():
+    args = ["-e", "pauli", "-D", "unionfind"]
+    args += ["threshold", "-l", "4", "6"]
+    args += ["-n", "20", "-o", "none", "-ad", "2"]
+    args += ["--p_bitflip", "0.05", "0.15"]
+    cli(args)
@@ -0,0 +1,40 @@
+from qsurface.main import initialize, run
+from qsurface.compare import compare_decoders, mcnemar_p
+import pytest
+from .variables import *
+
+SEED = 12345
+ITERS = 40
+
+
+@pytest.mark.parametrize(
+    "Decoders, faulty, size, error_rates",
+    [
+        (["unionfind", "mwpm"], False, SIZE_PM, {"p_bitflip": 0.1}),
+        (["unionfind", "ufns", "mwpm"], True, SIZE_FM, {"p_bitflip": 0.05, "p_bitflip_plaq": 0.05, "p_bitflip_star": 0.05}),
+    ],
+)
+def test_compare_decoders(Decoders, faulty, size, error_rates):
+    """Test that each decoder gets the results of run with the same seed, and that the paired outcomes add up."""
+    output = compare_decoders(size, "toric", Decoders, ["pauli"], faulty, error_rates=error_rates, iterations=ITERS, seed=SEED)
+    for Decoder in Decoders:
+        code, decoder = initialize(size, "toric", Decoder, enabled_errors=["pauli"], faulty_measurements=faulty)
+        expected = run(code, decoder, error_rates=error_rates, iterations=ITERS, seed=SEED)
+        assert output["no_error"][Decoder] == expected["no_error"]
+        assert output["duration"][Decoder]["mean"] > 0
+
+    assert len(output["paired"]) == len(Decoders) * (len(Decoders) - 1) // 2
+    a, b = Decoders[:2]
+    paired = output["paired"][f"{a}/{b}"]
+    assert paired["both_fail"] + paired[f"only_{a}"] + paired[f"only_{b}"] + paired["neither"] == ITERS
+    assert ITERS - output["no_error"][a] == paired["both_fail"] + paired[f"only_{a}"]
+
+
+def test_mcnemar_p():
+    """Test the exact McNemar test on known values."""
+    assert mcnemar_p(0, 0) == 1.0
+    assert mcnemar_p(5, 5) == 1.0
+    assert mcnemar_p(0, 6) == pytest.approx(2 / 64)
+    assert mcnemar_p(10, 0) == mcnemar_p(0, 10)
+    with pytest.raises(ValueError):
+        compare_decoders(SIZE_PM, "toric", ["mwpm", "mwpm"])
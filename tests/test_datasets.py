@@ -0,0 +1,58 @@
+from qsurface.main import initialize, run
+from qsurface.datasets import write_syndromes, decode_syndromes, dataset_bits, SyndromeDataset, FORMATS
+import numpy as np
+import pytest
+from .variables import *
+
+SEED = 12345
+ITERS = 30
+
+
+@pytest.mark.parametrize(
+    "faulty, size, error_rates",
+    [
+        (False, SIZE_PM, {"p_bitflip": 0.1}),
+        (True, SIZE_FM, {"p_bitflip": 0.08, "p_bitflip_plaq": 0.01, "p_bitflip_star": 0.01}),
+    ],
+)
+def test_syndrome_datasets(tmp_path, faulty, size, error_rates):
+    """Test that all formats store the same rows, and that decoding a dataset gives the results of run."""
+    code, decoder = initialize(size, "toric", "unionfind", enabled_errors=["pauli"], faulty_measurements=faulty)
+    expected = run(code, decoder, error_rates=error_rates, iterations=ITERS, seed=SEED)
+
+    datasets = []
+    for suffix in FORMATS:
+        file = tmp_path / f"data{suffix}"
+        write_syndromes(code, file, iterations=ITERS, error_rates=error_rates, seed=SEED, batch_size=7)
+        dataset = SyndromeDataset(file, dataset_bits(code))
+        assert isinstance(dataset.data, np.memmap) and len(dataset) == ITERS
+        datasets.append(np.concatenate(list(dataset.batches(8))))
+        output = decode_syndromes(code, decoder, file, error_rates=error_rates, batch_size=8)
+        assert output == {"no_error": expected["no_error"], "iterations": ITERS}
+    for rows in datasets[1:]:
+        assert np.array_equal(rows, datasets[0])
+    assert set(np.unique(datasets[0])) <= {0, 1}
+
+    for Decoder, decoder_kwargs in [("mwpm", {}), ("unionfind", {"edge_weights": True})]:
+        code, decoder = initialize(size, "toric", Decoder, ["pauli"], faulty, **decoder_kwargs)
+        expected = run(code, decoder, error_rates=error_rates, iterations=ITERS, seed=SEED)
+        code, decoder = initialize(size, "toric", Decoder, ["pauli"], faulty, **decoder_kwargs)
+        output = decode_syndromes(code, decoder, tmp_path / "data.b8", error_rates=error_rates)
+        assert output["no_error"] == expected["no_error"]
+
+
+def test_syndrome_dataset_errors(tmp_path):
+    """Test that unknown formats, mismatched rows and erasures are rejected."""
+    code, _ = initialize(SIZE_PM, "toric", "unionfind", enabled_errors=["pauli"])
+    with pytest.raises(ValueError):
+        write_syndromes(code, tmp_path / "data.csv")
+    write_syndromes(code, tmp_path / "data.01", iterations=3)
+    with pytest.raises(ValueError):
+        SyndromeDataset(tmp_path / "data.01", dataset_bits(code) + 1)
+    write_syndromes(code, tmp_path / "data.npy", iterations=3)
+    with pytest.raises(ValueError):
+        SyndromeDataset(tmp_path / "data.npy", dataset_bits(code) + 8)
+
+    code, _ = initialize(SIZE_PM, "toric", "unionfind", enabled_errors=["pauli", "erasure"])
+    with pytest.raises(ValueError):
+        write_syndromes(code, tmp_path / "erasure.b8")
@@ -0,0 +1,73 @@
+from qsurface.main import WorkerPool
+from qsurface.distributed import Coordinator, get_authkey, run_worker
+from multiprocessing import Process
+from multiprocessing.connection import Client
+import threading
+import pytest
+from .variables import *
+
+SEED = 12345
+ITERS = 25
+ERROR_RATES = {"p_bitflip": 0.1}
+
+
+def expected_output(**kwargs):
+    with WorkerPool(2, "toric", "unionfind", enabled_errors=["pauli"]) as pool:
+        return pool.run_size(SIZE_PM, error_rates=ERROR_RATES, iterations=ITERS, seed=SEED, chunk_size=4, **kwargs)
+
+
+def test_coordinator():
+    """Test that agents on localhost give the same results as a worker pool."""
+    coordinator = Coordinator("toric", "unionfind", enabled_errors=["pauli"])
+    agents = [Process(target=run_worker, args=(coordinator.address,)) for _ in range(3)]
+    for agent in agents:
+        agent.start()
+    try:
+        output = coordinator.run_size(SIZE_PM, error_rates=ERROR_RATES, iterations=ITERS, seed=SEED, chunk_size=4)
+        assert output == expected_output()
+        assert sum(agent["iterations"] for agent in coordinator.throughput) == ITERS
+        stop = {"target_failures": 2}
+        output = coordinator.run_size(SIZE_PM, error_rates=ERROR_RATES, iterations=ITERS, seed=SEED, chunk_size=4, **stop)
+        assert output == expected_output(**stop)
+    finally:
+        coordinator.close()
+    for agent in agents:
+        agent.join()
+        assert agent.exitcode == 0
+
+    with pytest.raises(TypeError):
+        coordinator.run(None, None)
+
+
+def test_coordinator_lost_agent():
+    """Test that the chunk of a lost agent is simulated by another agent."""
+    coordinator = Coordinator("toric", "unionfind", enabled_errors=["pauli"])
+    agents = []
+
+    def lost_agent():
+        with Client(coordinator.address, authkey=b"qsurface") as connection:
+            connection.recv()
+            connection.recv()  # Takes the first chunk and disconnects
+        agents.append(Process(target=run_worker, args=(coordinator.address,)))
+        agents[0].start()
+
+    thread = threading.Thread(target=lost_agent)
+    thread.start()
+    try:
+        output = coordinator.run_size(SIZE_PM, error_rates=ERROR_RATES, iterations=ITERS, seed=SEED, chunk_size=4)
+    finally:
+        thread.join()
+        coordinator.close()
+    agents[0].join()
+    assert output == expected_output()
+
+
+def test_authkey():
+    """Test that the default key is only used on loopback addresses."""
+    assert get_authkey(("localhost", 5000)) == get_authkey(("127.0.0.1", 5000)) == b"qsurface"
+    assert get_authkey(("0.0.0.0", 5000), "secret") == b"secret"
+    for host in ["", "0.0.0.0", "example.org"]:
+        with pytest.raises(ValueError):
+            get_authkey((host, 5000))
+    with pytest.raises(ValueError):
+        Coordinator("toric", "unionfind", address=("", 0))
@@ -0,0 +1,39 @@
+from qsurface.main import initialize, run
+from qsurface.importance import WeightSampling, sample_weights
+import pytest
+from .variables import *
+
+SEED = 12345
+
+
+def test_sample_weights():
+    """Test that the estimate over all error weights agrees with direct sampling."""
+    code, decoder = initialize(4, "toric", "unionfind", enabled_errors=["pauli"], initial_states=(0, 0))
+    sampling = sample_weights(code, decoder, range(0, 33), iterations=50, seed=SEED)
+    assert sampling.locations == 32
+    assert sampling.failure_rate(0) == sampling.failure_rate(1) == 0
+
+    p, iterations = 0.1, 1000
+    estimate = sampling.logical_error_rate(p)
+    assert estimate["truncation"] < 1e-12
+    direct = 1 - run(code, decoder, error_rates={"p_bitflip": p}, iterations=iterations, seed=SEED)["no_error"] / iterations
+    direct_std = (direct * (1 - direct) / iterations) ** 0.5
+    assert abs(estimate["estimate"] - direct) < 4 * (estimate["std"] ** 2 + direct_std ** 2) ** 0.5
+
+    partial = sample_weights(code, decoder, [2, 3], iterations=50, seed=SEED)
+    assert partial.failures == sampling.failures[2:4]
+    low = partial.logical_error_rate(1e-6)
+    assert 0 < low["estimate"] < 1e-9 and low["truncation"] < 1e-15
+
+
+def test_sample_weights_errors():
+    """Test the unsupported configurations of weight sampling."""
+    code, decoder = initialize(SIZE_FM, "toric", "unionfind", enabled_errors=["pauli"], faulty_measurements=True)
+    with pytest.raises(ValueError):
+        sample_weights(code, decoder, [1])
+    code, decoder = initialize(SIZE_PM, "toric", "unionfind", enabled_errors=["pauli"])
+    with pytest.raises(ValueError):
+        sample_weights(code, decoder, [1], rate="p_erasure")
+    with pytest.raises(ValueError):
+        sample_weights(code, decoder, [2 * SIZE_PM ** 2 + 1])
+    assert WeightSampling(4, [1], [10], [5]).logical_error_rate(0.5)["estimate"] == pytest.approx(4 * 0.5 ** 4 * 0.5)
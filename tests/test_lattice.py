@@ -0,0 +1,78 @@
+from qsurface.main import initialize, run, run_multiprocess
+from qsurface.lattice import LatticeTemplate
+import pickle
+import pytest
+import sys
+from .variables import *
+
+requires_shared_memory = pytest.mark.skipif(
+    sys.version_info < (3, 8), reason="Lattice templates require multiprocessing.shared_memory"
+)
+
+SEED = 12345
+ITERS = 24
+
+
+def structure(code):
+    """Returns the positions and connections of all qubits of ``code`` in their iteration order."""
+    data_qubits = [qubit for layer in code.data_qubits.values() for qubit in layer.values()]
+    ancillas = [ancilla for layer in code.ancilla_qubits.values() for ancilla in layer.values()]
+    return (
+        [
+            (qubit.z, qubit.loc, key, [node.loc for node in edge.nodes])
+            for qubit in data_qubits
+            for key, edge in qubit.edges.items()
+        ],
+        [
+            (
+                ancilla.z,
+                ancilla.loc,
+                ancilla.state_type,
+                [(key, qubit.loc) for key, qubit in ancilla.parity_qubits.items()],
+                [(neighbor.z, neighbor.loc) for neighbor in ancilla.z_neighbors],
+            )
+            for ancilla in ancillas
+        ],
+        [(key, [edge.qubit.loc for edge in edges]) for key, edges in code.logical_operators.items()],
+    )
+
+
+@requires_shared_memory
+@pytest.mark.parametrize(
+    "Code, Decoder, errors, faulty, size, error_rates",
+    [
+        ("toric", "unionfind", ["pauli"], False, SIZE_PM, {"p_bitflip": 0.1}),
+        ("planar", "mwpm", ["pauli"], False, SIZE_PM, {"p_bitflip": 0.1}),
+        ("planar", "ufns", ["pauli", "erasure"], True, SIZE_FM, {"p_bitflip": 0.05, "p_erasure": 0.05}),
+        ("rotated", "unionfind", ["pauli"], True, SIZE_FM, {"p_bitflip": 0.05, "p_bitflip_plaq": 0.05}),
+    ],
+)
+def test_template_build(Code, Decoder, errors, faulty, size, error_rates):
+    """Test that a rebuilt code has the same structure and gives the same results as the original code."""
+    code, decoder = initialize(size, Code, Decoder, enabled_errors=errors, faulty_measurements=faulty)
+    template = LatticeTemplate(code, decoder)
+    try:
+        header = pickle.loads(pickle.dumps(template))
+        assert len(pickle.dumps(template)) < template.nbytes + 4096
+        built_code, built_decoder = header.build()
+        header.close()
+        assert structure(built_code) == structure(code)
+        assert list(built_code.errors) == list(code.errors)
+        expected = run(code, decoder, error_rates=error_rates, iterations=ITERS, seed=SEED)
+        assert run(built_code, built_decoder, error_rates=error_rates, iterations=ITERS, seed=SEED) == expected
+    finally:
+        template.close()
+
+
+@requires_shared_memory
+def test_run_multiprocess_spawn():
+    """Test that spawned workers that rebuild the code from a template give the same results as forked workers."""
+    code, decoder = initialize(SIZE_PM, "toric", "unionfind", enabled_errors=["pauli"])
+    error_rates = {"p_bitflip": 0.1}
+    outputs = [
+        run_multiprocess(
+            code, decoder, error_rates=error_rates, iterations=ITERS, seed=SEED, processes=2, chunk_size=5, start_method=method
+        )
+        for method in ["fork", "spawn"]
+    ]
+    assert outputs[0] == outputs[1]
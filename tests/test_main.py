@@ -1,4 +1,5 @@
 from qsurface.main import *
+import pickle
 import pytest
 from .variables import *
 
@@ -60,7 +61,6 @@ def test_run(iterations, initial_states, decode_initial):
 @pytest.mark.parametrize("iterations", ITERS)
 def test_run_benchmark(iterations):
     """Test for run with benchmarking enabled."""
-    processed_seed = float(f"{str(SEED)}0")
     code, decoder = initialize(SIZE_PM, CODES[0], DECODERS[0])
     benchmark = BenchmarkDecoder({"decode": ["count_calls", "value_to_list"]})
     output = run(code, decoder, benchmark=benchmark, iterations=iterations, seed=SEED)
@@ -69,7 +69,7 @@ def test_run_benchmark(iterations):
         "benchmark": {
             "decoded": iterations,
             "iterations": iterations,
-            "seed": processed_seed,
+            "seed": SEED,
             "count_calls/decode/mean": 1.0,
             "count_calls/decode/std": 0.0,
         },
@@ -100,3 +100,141 @@ def test_run_multiprocess_benchmark():
         },
     }
     assert output == asserted_output
+
+
+def test_run_multiprocess_pool():
+    """Test that a reused worker pool runs the exact number of iterations and does not depend on the number of processes."""
+    code, decoder = initialize(SIZE_PM, "toric", "unionfind", enabled_errors=["pauli"])
+    error_rates = {"p_bitflip": 0.1}
+    iterations = MP_ITERS + 1
+
+    with WorkerPool(2) as pool:
+        outputs = []
+        for _ in range(2):
+            benchmark = BenchmarkDecoder({"decode": ["count_calls", "value_to_list"]})
+            output = run_multiprocess(
+                code, decoder, iterations=iterations, error_rates=error_rates, seed=SEED, chunk_size=4, benchmark=benchmark, pool=pool
+            )
+            assert output["benchmark"]["iterations"] == iterations
+            assert output["benchmark"]["count_calls/decode/mean"] == 1.0
+            assert sum(worker["iterations"] for worker in pool.throughput) == iterations
+            outputs.append(output["no_error"])
+        assert outputs[0] == outputs[1]
+
+    output = run_multiprocess(code, decoder, iterations=iterations, error_rates=error_rates, seed=SEED, chunk_size=4, processes=3)
+    assert output["no_error"] == outputs[0]
+
+
+def test_run_reproducible():
+    """Test that a seeded simulation does not depend on its division into parts, chunks or processes."""
+    code, decoder = initialize(SIZE_FM, "toric", "unionfind", enabled_errors=["pauli"], faulty_measurements=True)
+    error_rates = {"p_bitflip": 0.05, "p_bitflip_plaq": 0.05, "p_bitflip_star": 0.05}
+
+    def run_parts(*parts):
+        outputs, offset = [], 0
+        for iterations in parts:
+            outputs.append(run(code, decoder, error_rates=error_rates, iterations=iterations, seed=SEED, iteration_offset=offset))
+            offset += iterations
+        return sum(output["no_error"] for output in outputs)
+
+    single = run_parts(MP_ITERS)
+    assert single == run_parts(7, 1, MP_ITERS - 8)
+    for processes, chunk_size in [(2, 5), (3, 1)]:
+        output = run_multiprocess(
+            code, decoder, error_rates=error_rates, iterations=MP_ITERS, seed=SEED, processes=processes, chunk_size=chunk_size
+        )
+        assert output["no_error"] == single
+
+    rng = [iteration_rng(SEED, iteration).random() for iteration in range(2)]
+    assert rng[0] != rng[1] and rng[0] == iteration_rng(SEED, 0).random()
+
+
+def test_worker_pool_run_size():
+    """Test that lattices initialized by the workers give the same results as copied lattices."""
+    code, decoder = initialize(SIZE_PM, "toric", "unionfind", enabled_errors=["pauli"])
+    error_rates = {"p_bitflip": 0.1}
+    iterations = MP_ITERS + 1
+
+    with WorkerPool(2, "toric", "unionfind", enabled_errors=["pauli"]) as pool:
+        outputs = [
+            pool.run_size(SIZE_PM, iterations=iterations, error_rates=error_rates, seed=SEED, chunk_size=4)["no_error"]
+            for _ in range(2)
+        ]
+        outputs.append(
+            run_multiprocess(code, decoder, iterations=iterations, error_rates=error_rates, seed=SEED, chunk_size=4, pool=pool)[
+                "no_error"
+            ]
+        )
+        outputs.append(pool.run_size(SIZE_PM, iterations=iterations, error_rates=error_rates, seed=SEED, chunk_size=4)["no_error"])
+    assert len(set(outputs)) == 1
+
+    with pytest.raises(ValueError):
+        WorkerPool(2).run_size(SIZE_PM)
+
+
+def test_run_stopping_rule():
+    """Test that simulations stop at the target number of failures, the confidence width or the maximum iterations."""
+    code, decoder = initialize(SIZE_PM, "toric", "unionfind", enabled_errors=["pauli"])
+    error_rates = {"p_bitflip": 0.1}
+    max_iterations = 1000
+
+    output = run(code, decoder, error_rates=error_rates, iterations=max_iterations, seed=SEED, target_failures=3)
+    assert output["iterations"] - output["no_error"] == 3 and output["iterations"] < max_iterations
+
+    output = run(code, decoder, error_rates=error_rates, iterations=max_iterations, seed=SEED, ci_width=0.3)
+    low, high = binomial_interval(output["no_error"], output["iterations"])
+    assert high - low < 0.3 and output["iterations"] < max_iterations
+
+    output = run(code, decoder, iterations=MP_ITERS, seed=SEED, target_failures=1)
+    assert output == {"no_error": MP_ITERS, "iterations": MP_ITERS}
+
+    output = run_multiprocess(
+        code, decoder, error_rates=error_rates, iterations=max_iterations, seed=SEED, processes=2, chunk_size=2, target_failures=3
+    )
+    assert output["iterations"] < max_iterations and output["iterations"] % 2 == 0
+    assert output["iterations"] - output["no_error"] in [3, 4]
+    serial = run(code, decoder, error_rates=error_rates, iterations=output["iterations"], seed=SEED)
+    assert serial["no_error"] == output["no_error"]
+
+
+def test_run_checkpoint(tmp_path):
+    """Test that an interrupted simulation resumes from its checkpoint with the results of an uninterrupted simulation."""
+    code, decoder = initialize(SIZE_PM, "toric", "unionfind", enabled_errors=["pauli"])
+    error_rates = {"p_bitflip": 0.1}
+    checkpoint = str(tmp_path / "run.ckpt")
+
+    def run_benchmarked(**kwargs):
+        benchmark = BenchmarkDecoder({"decode": ["count_calls", "value_to_list"]})
+        output = run(code, decoder, error_rates=error_rates, iterations=MP_ITERS, seed=SEED, benchmark=benchmark, **kwargs)
+        benchmark._unset_decoder()
+        return output
+
+    expected = run_benchmarked()
+    random_errors, calls = code.random_errors, []
+
+    def interrupted(**kwargs):
+        calls.append(None)
+        if len(calls) > 10:
+            raise KeyboardInterrupt
+        random_errors(**kwargs)
+
+    code.random_errors = interrupted
+    with pytest.raises(KeyboardInterrupt):
+        run_benchmarked(checkpoint=checkpoint, checkpoint_interval=0)
+    del code.random_errors
+    assert run_benchmarked(checkpoint=checkpoint) == expected
+    assert run_benchmarked(checkpoint=checkpoint) == expected
+    with pytest.raises(ValueError):
+        run(code, decoder, error_rates=error_rates, iterations=MP_ITERS, seed=SEED + 1, checkpoint=checkpoint)
+
+    checkpoint = str(tmp_path / "pool.ckpt")
+    with WorkerPool(2) as pool:
+        kwargs = dict(error_rates=error_rates, iterations=MP_ITERS, seed=SEED, chunk_size=5, pool=pool, checkpoint=checkpoint)
+        expected = run_multiprocess(code, decoder, **kwargs)
+        with open(checkpoint, "rb") as file:
+            state = pickle.load(file)
+        state["outputs"][1] = state["outputs"][3] = None
+        with open(checkpoint, "wb") as file:
+            pickle.dump(state, file)
+        assert run_multiprocess(code, decoder, **kwargs) == expected
+        assert sum(worker["iterations"] for worker in pool.throughput) == 10
@@ -0,0 +1,47 @@
+from qsurface.main import *
+import pytest
+import random
+from .variables import *
+
+
+ITERS = 100
+
+
+@pytest.mark.parametrize("Code", CODES)
+@pytest.mark.parametrize(
+    "faulty, size",
+    [
+        (False, SIZE_PM),
+        (True, SIZE_FM),
+    ],
+)
+def test_peeling_sim(size, Code, faulty):
+    """Test the peeling decoder for erasure errors with random reinitialized states."""
+    code, decoder = initialize(
+        size, Code, "peeling", enabled_errors=["erasure"], faulty_measurements=faulty, initial_states=(0, 0)
+    )
+    trivial = 0
+    for _ in range(ITERS):
+        code.random_errors(p_erasure=random.random() * 0.5, initial_states=(None, None))
+        erased = [
+            qubit for layer in code.data_qubits.values() for qubit in layer.values() if qubit.erasure == code.instance
+        ]
+        assert sorted(decoder.find_erased_qubits(), key=id) == sorted(erased, key=id)
+        decoder.decode()
+        trivial += code.trivial_ancillas
+
+    assert trivial == ITERS
+
+
+@pytest.mark.parametrize("Code", CODES)
+def test_peeling_threshold(Code):
+    """Test that erasures well below the threshold of 50% are decoded without logical errors in almost all iterations."""
+    code, decoder = initialize(SIZE_PM, Code, "peeling", enabled_errors=["erasure"], initial_states=(0, 0))
+    output = run(
+        code,
+        decoder,
+        iterations=ITERS,
+        error_rates={"p_erasure": 0.2, "initial_states": (None, None)},
+        decode_initial=False,
+    )
+    assert output["no_error"] > 0.9 * ITERS
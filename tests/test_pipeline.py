@@ -0,0 +1,47 @@
+from qsurface.main import initialize, run
+from qsurface.pipeline import ShotLayout, run_pipeline
+import numpy
+import pytest
+import sys
+from .variables import *
+
+SEED = 12345
+ITERS = 50
+
+
+@pytest.mark.skipif(sys.version_info < (3, 8), reason="The ring buffer requires multiprocessing.shared_memory")
+@pytest.mark.parametrize(
+    "Decoder, faulty, size, error_rates",
+    [
+        ("unionfind", False, SIZE_PM, {"p_bitflip": 0.1}),
+        ("mwpm", False, SIZE_PM, {"p_bitflip": 0.1}),
+        ("ufns", True, SIZE_FM, {"p_bitflip": 0.05, "p_bitflip_plaq": 0.05, "p_bitflip_star": 0.05}),
+    ],
+)
+@pytest.mark.parametrize("samplers, decoders", [(1, 2), (2, 1)])
+def test_run_pipeline(Decoder, faulty, size, error_rates, samplers, decoders):
+    """Test that the pipeline gives the same results as run with the same seed."""
+    code, decoder = initialize(size, "toric", Decoder, enabled_errors=["pauli"], faulty_measurements=faulty)
+    expected = run(code, decoder, error_rates=error_rates, iterations=ITERS, seed=SEED)
+    output = run_pipeline(
+        code, decoder, error_rates=error_rates, iterations=ITERS, seed=SEED, samplers=samplers, decoders=decoders, batch_size=7
+    )
+    assert output["no_error"] == expected["no_error"]
+
+
+def test_shot_layout():
+    """Test that a loaded record reproduces the syndrome and the logical errors of the sampled errors, and that the correction of the loaded record matches its syndrome."""
+    code, decoder = initialize(SIZE_PM, "planar", "unionfind", enabled_errors=["pauli", "erasure"])
+    layout = ShotLayout(code)
+    record = numpy.zeros(layout.size, dtype=numpy.uint8)
+    layout.sample(code, record, {"p_bitflip": 0.1, "p_erasure": 0.1})
+    syndrome = [ancilla.syndrome for ancilla in layout.ancillas]
+    assert record[layout.erasures].any()
+
+    layout.load(code, record)
+    assert [ancilla.syndrome for ancilla in layout.ancillas] == syndrome
+    erased = [qubit for qubit, bit in zip(layout.data_qubits, record[layout.erasures]) if bit]
+    assert code.errors["erasure"].erased_qubits() == erased
+    assert not layout.no_error(code, numpy.concatenate([record[: layout.logicals.start], 1 - record[layout.logicals]]))
+    decoder.decode()
+    assert [ancilla.state for ancilla in layout.ancillas] == syndrome
@@ -0,0 +1,76 @@
+from qsurface.main import initialize, run, run_multiprocess
+from qsurface.records import ShotRecorder, read_records, SHOT_DTYPE
+import numpy as np
+import pytest
+from .variables import *
+
+SEED = 12345
+ITERS = 30
+ERROR_RATES = {"p_bitflip": 0.1}
+
+
+@pytest.mark.parametrize("faulty, size", [(False, SIZE_PM), (True, SIZE_FM)])
+def test_run_records(tmp_path, faulty, size):
+    """Test that every iteration is recorded, and that the records do not depend on the number of processes."""
+    code, decoder = initialize(size, "toric", "unionfind", enabled_errors=["pauli"], faulty_measurements=faulty)
+    output = run(code, decoder, error_rates=ERROR_RATES, iterations=ITERS, seed=SEED, records=tmp_path / "single.bin")
+    assert "correct_edge" not in decoder.__dict__
+
+    single = read_records(tmp_path / "single.bin")
+    assert isinstance(single, np.memmap) and single.dtype == SHOT_DTYPE
+    assert list(single["iteration"]) == list(range(ITERS))
+    assert single["no_error"].sum() == output["no_error"]
+    assert all(single["correction_weight"][single["syndrome_weight"] == 0] == 0)
+    assert single["duration"].min() > 0
+
+    run_multiprocess(
+        code, decoder, error_rates=ERROR_RATES, iterations=ITERS, seed=SEED, processes=2, chunk_size=7, records=tmp_path / "mp.bin"
+    )
+    multi = np.sort(read_records(tmp_path / "mp.bin"), order="iteration")
+    for field in ["iteration", "syndrome_weight", "correction_weight", "no_error"]:
+        assert np.array_equal(single[field], multi[field])
+
+
+def test_shot_recorder(tmp_path):
+    """Test that records are appended in buffers and that an incomplete record is ignored."""
+    code, decoder = initialize(SIZE_PM, "toric", "unionfind", enabled_errors=["pauli"])
+    file = tmp_path / "shots.bin"
+    with ShotRecorder(file, code, decoder, buffer_size=4) as recorder:
+        for iteration in range(6):
+            code.random_errors(p_bitflip=0.1)
+            recorder.decode()
+            code.logical_state
+            recorder.write(iteration, code.no_error)
+        assert len(read_records(file)) == 4
+    assert len(read_records(file)) == 6
+    with open(file, "ab") as partial:
+        partial.write(b"\x01\x02")
+    assert list(read_records(file)["iteration"]) == list(range(6))
+    (tmp_path / "empty.bin").touch()
+    assert len(read_records(tmp_path / "empty.bin")) == 0
+
+
+def test_run_records_checkpoint(tmp_path):
+    """Test that the records of an interrupted run are kept, and that the resumed run completes them."""
+    code, decoder = initialize(SIZE_PM, "toric", "unionfind", enabled_errors=["pauli"])
+    kwargs = dict(error_rates=ERROR_RATES, iterations=ITERS, seed=SEED, records=tmp_path / "shots.bin")
+    kwargs.update(checkpoint=str(tmp_path / "run.ckpt"), checkpoint_interval=0)
+    decode, calls = decoder.decode, []
+
+    def interrupted(**kwargs):
+        calls.append(None)
+        if len(calls) == 20:
+            raise KeyboardInterrupt
+        decode(**kwargs)
+
+    decoder.decode = interrupted
+    with pytest.raises(KeyboardInterrupt):
+        run(code, decoder, decode_initial=False, **kwargs)
+    assert "correct_edge" not in decoder.__dict__
+    assert len(read_records(tmp_path / "shots.bin")) == 19
+
+    del decoder.decode
+    output = run(code, decoder, decode_initial=False, **kwargs)
+    shots = read_records(tmp_path / "shots.bin")
+    assert np.array_equal(np.unique(shots["iteration"]), np.arange(ITERS))
+    assert shots["no_error"].sum() == output["no_error"]
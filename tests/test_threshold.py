@@ -2,6 +2,7 @@ from qsurface.threshold import *
 import qsurface as oss
 import pytest
 import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
 from .variables import *
 
@@ -137,3 +138,234 @@ def test_plot_data(example_pm_data, modified_ansatz):
     fitter = ThresholdFit(modified_ansatz=modified_ansatz)
     figure = plt.figure()
     fitter.plot_data(example_pm_data, "p_bitflip", figure=figure)
+
+
+def test_run_many_warm_pool(tmp_path):
+    """Test threshold runner on a single pool of workers that initialize lattices of each size."""
+    sizes = [4, 6]
+    error_rates = [{"p_bitflip": 0.05}, {"p_bitflip": 0.1}]
+    data = run_many(
+        "toric",
+        "unionfind",
+        iterations=12,
+        sizes=sizes,
+        enabled_errors=["pauli"],
+        error_rates=error_rates,
+        output=str(tmp_path / "data.csv"),
+        mp_processes=2,
+    )
+    assert list(data["size"]) == [4, 4, 6, 6]
+    assert list(data["p_bitflip"]) == [0.05, 0.1, 0.05, 0.1]
+    assert all(data["iterations"] == 12)
+    assert (tmp_path / "data.csv").exists()
+
+
+def test_run_many_checkpoint(tmp_path):
+    """Test that a resumed series skips the configurations that are already in the data."""
+    kwargs = dict(
+        iterations=12,
+        sizes=[4, 6],
+        enabled_errors=["pauli"],
+        error_rates=[{"p_bitflip": 0.05}, {"p_bitflip": 0.1}],
+        output=str(tmp_path / "data.csv"),
+        checkpoint=str(tmp_path / "run_many.ckpt"),
+    )
+    data = run_many("toric", "unionfind", **kwargs)
+    assert len(data) == 4 and not (tmp_path / "run_many.ckpt").exists()
+    data = run_many("toric", "unionfind", **{**kwargs, "sizes": [4, 8]})
+    assert list(data["size"]) == [4, 4, 6, 6, 8, 8]
+
+
+def test_results_writer(tmp_path):
+    """Test that rows are appended to shards of a file and that an interrupted write is discarded."""
+    file = tmp_path / "data.csv"
+    rows = [{"no_error": 8, "size": 4, "p_bitflip": 0.1}, {"no_error": 9, "size": (4, 4), "p_bitflip": 0.05}]
+    with ResultsWriter(file) as writer:
+        for row in rows:
+            writer.write(row)
+    with open(file, "a") as partial:
+        partial.write("2,7,4")
+    with ResultsWriter(file) as writer:
+        assert writer.rows == 2
+        writer.write({"no_error": 7, "size": 6})
+        writer.write({"no_error": 6, "size": 6, "p_bitflip": 0.1, "seed": 1})
+    assert (tmp_path / "data.1.csv").exists()
+    assert [len(shard) for shard in iter_csv(file)] == [3, 1]
+
+    data = read_csv(file)
+    assert list(data["no_error"]) == [8, 9, 7, 6]
+    assert list(data["size"].astype(str)) == ["4", "(4, 4)", "6", "6"]
+    assert np.isnan(data["p_bitflip"][2]) and np.isnan(data["seed"][0]) and data["seed"][3] == 1
+
+
+@pytest.mark.parametrize("mp_processes", [1, 2])
+def test_run_many_store(tmp_path, mp_processes):
+    """Test that stored configurations are skipped and that partial configurations are topped up."""
+    kwargs = dict(
+        sizes=[4],
+        enabled_errors=["pauli"],
+        error_rates=[{"p_bitflip": 0.1}],
+        methods_to_benchmark={"decode": ["count_calls", "value_to_list"]},
+        output="none",
+        mp_processes=mp_processes,
+        store=str(tmp_path / "store"),
+    )
+    partial = run_many("toric", "unionfind", iterations=10, **kwargs)
+    topped_up = run_many("toric", "unionfind", iterations=30, **kwargs)
+    assert len(list((tmp_path / "store").iterdir())) == 1
+    assert list(topped_up["iterations"]) == [30] and list(topped_up["seed"]) == list(partial["seed"])
+    assert topped_up["count_calls/decode/mean"][0] == 1.0
+
+    stored = run_many("toric", "unionfind", iterations=20, **kwargs)
+    assert stored.drop(columns="datetime").equals(topped_up.drop(columns="datetime"))
+
+    code, decoder = oss.main.initialize(4, "toric", "unionfind", enabled_errors=["pauli"])
+    single = oss.main.run(code, decoder, error_rates={"p_bitflip": 0.1}, iterations=30, seed=int(partial["seed"][0]))
+    assert single["no_error"] == topped_up["no_error"][0]
+
+    run_many("toric", "unionfind", iterations=10, **{**kwargs, "error_rates": [{"p_bitflip": 0.05}]})
+    assert len(list((tmp_path / "store").iterdir())) == 2
+
+
+def test_run_many_coupled():
+    """Test that coupled error rates share the seed of their size, such that lower rates apply a subset of the errors."""
+    error_rates = [{"p_bitflip": 0.05}, {"p_bitflip": 0.1}]
+    data = run_many(
+        "toric",
+        "unionfind",
+        iterations=10,
+        sizes=[4, 6],
+        enabled_errors=["pauli"],
+        error_rates=error_rates,
+        output="none",
+        coupled=True,
+    )
+    seeds = list(data["seed"])
+    assert seeds[0] == seeds[1] and seeds[2] == seeds[3] and seeds[0] != seeds[2]
+
+    code, decoder = oss.main.initialize(6, "toric", "unionfind", enabled_errors=["pauli"], initial_states=(0, 0))
+    for iteration in range(10):
+        errors = []
+        for error_rate in error_rates:
+            for qubit in code.data_qubits[0].values():
+                qubit.edges["x"].state = False
+            code.rng = oss.main.iteration_rng(seeds[0], iteration)
+            code.random_errors(**error_rate)
+            errors.append({loc for loc, qubit in code.data_qubits[0].items() if qubit.edges["x"].state})
+        assert errors[0] <= errors[1]
+
+
+def test_estimate_crossing(example_pm_data):
+    """Test that the crossing of example data is estimated between the sampled error rates."""
+    crossing = estimate_crossing(example_pm_data, "p_bitflip")
+    assert len(crossing["crossings"]) == 2
+    assert 0.09 < crossing["pth"] < 0.11 and 0 < crossing["std"] < 0.01
+    narrow = estimate_crossing(example_pm_data, "p_bitflip", window=(0.095, 0.105))
+    assert abs(narrow["pth"] - crossing["pth"]) < 2 * crossing["std"]
+    with pytest.raises(ValueError):
+        estimate_crossing(example_pm_data, "p_bitflip", window=(0.1, 0.1))
+
+
+def test_run_adaptive():
+    """Test that the error rates of later rounds are placed within the bracket around the crossing."""
+    bracket = (0.05, 0.15)
+    data, crossing = run_adaptive(
+        "toric",
+        "unionfind",
+        sizes=[4, 6],
+        enabled_errors=["pauli"],
+        bracket=bracket,
+        points=3,
+        iterations=20,
+        rounds=3,
+        output="none",
+        coupled=True,
+        seed=12345,
+    )
+    assert list(data["iterations"]) == [20] * 6 + [40] * 6 + [80] * 6
+    assert all(bracket[0] <= rate <= bracket[1] for rate in data["p_bitflip"])
+    low, high = crossing["window"]
+    assert bracket[0] <= low < high <= bracket[1]
+    assert min(data["p_bitflip"][-6:]) == pytest.approx(low, rel=1e-5) and max(data["p_bitflip"][-6:]) == pytest.approx(high, rel=1e-5)
+
+
+@pytest.mark.parametrize("modified_ansatz", [True, False])
+def test_fit_bootstrap(example_pm_data, modified_ansatz):
+    """Test that bootstrap intervals contain the fit and do not depend on the number of processes."""
+    fitter = ThresholdFit(modified_ansatz=modified_ansatz)
+    intervals = [fitter.bootstrap(example_pm_data, "p_bitflip", replicas=40, seed=1, processes=n) for n in [1, 2]]
+    assert np.array_equal(intervals[0]["replicas"], intervals[1]["replicas"])
+    low, high = intervals[0]["pth"]
+    assert low <= intervals[0]["parameters"][0] <= high
+    free = ["nu", "D", "mu"] if modified_ansatz else ["nu"]
+    assert all(intervals[0][name][0] <= intervals[0][name][1] for name in free)
+    assert modified_ansatz or ("mu" not in intervals[0] and "D" not in intervals[0])
+
+
+def test_fit_bootstrap_failed(example_pm_data, monkeypatch):
+    """Test that a bootstrap without any converged replica raises an error."""
+    monkeypatch.setattr(oss.threshold, "_bootstrap_replicas", lambda task: np.zeros((0, 7)))
+    with pytest.raises(RuntimeError):
+        ThresholdFit().bootstrap(example_pm_data, "p_bitflip", replicas=4)
+
+
+def test_run_many_coupled_resume(tmp_path):
+    """Test that a resumed coupled series keeps the seed of each size, also within an interrupted configuration."""
+    error_rates = [{"p_bitflip": 0.05}, {"p_bitflip": 0.1}]
+    kwargs = dict(
+        iterations=10,
+        sizes=[4],
+        enabled_errors=["pauli"],
+        output=str(tmp_path / "data.csv"),
+        checkpoint=str(tmp_path / "run_many.ckpt"),
+        coupled=True,
+        seed=12345,
+    )
+    with pytest.raises(ValueError):
+        run_many("toric", "unionfind", error_rates=error_rates, **{**kwargs, "seed": None})
+
+    run_many("toric", "unionfind", error_rates=error_rates[:1], **kwargs)
+    code, decoder = oss.main.initialize(4, "toric", "unionfind", enabled_errors=["pauli"])
+    size_seed = oss.threshold._size_seed(12345, 4)
+    interrupted = oss.main.run(code, decoder, error_rates=error_rates[1], iterations=10, seed=size_seed, checkpoint=kwargs["checkpoint"])
+
+    data = run_many("toric", "unionfind", error_rates=error_rates, **kwargs)
+    assert [int(seed) for seed in data["seed"]] == [size_seed, size_seed]
+    assert data["no_error"][1] == interrupted["no_error"]
+
+
+def test_run_many_coupled_store(tmp_path):
+    """Test that a coupled series with a store uses the seed derived from the seed argument for every size, both when it is run at once and when it is resumed from the store."""
+    kwargs = dict(
+        iterations=5, enabled_errors=["pauli"], error_rates=[{"p_bitflip": 0.1}], output="none", coupled=True, seed=12345
+    )
+    fresh = run_many("toric", "unionfind", sizes=[4, 6], store=str(tmp_path / "fresh"), **kwargs)
+    run_many("toric", "unionfind", sizes=[4], store=str(tmp_path / "resumed"), **kwargs)
+    resumed = run_many("toric", "unionfind", sizes=[4, 6], store=str(tmp_path / "resumed"), **kwargs)
+    expected = [oss.threshold._size_seed(12345, size) for size in [4, 6]]
+    assert [int(seed) for seed in fresh["seed"]] == expected
+    assert [int(seed) for seed in resumed["seed"]] == expected
+    assert list(fresh["no_error"]) == list(resumed["no_error"])
+
+
+def test_run_adaptive_other_series(tmp_path, monkeypatch):
+    """Test that other series in the output file are ignored, and that a round without a crossing does not end the search."""
+    output = str(tmp_path / "data.csv")
+    other = dict(enabled_errors=["pauli"], output=output, iterations=10)
+    run_many("toric", "unionfind", sizes=[4, 6], error_rates=[{"p_bitflip": 0.1, "p_phaseflip": 0.2}], **other)
+    run_many("toric", "unionfind", sizes=[8], error_rates=[{"p_bitflip": 0.1}], **other)
+
+    estimates = []
+
+    def fails_once(data, column, window=None):
+        assert set(data["size"]) == {4, 6} and not any(data["p_phaseflip"] > 0)
+        estimates.append(window)
+        if len(estimates) == 1:
+            raise ValueError("no crossing")
+        return {"pth": 0.1, "std": 0.01, "crossings": []}
+
+    monkeypatch.setattr(oss.threshold, "estimate_crossing", fails_once)
+    data, crossing = run_adaptive(
+        "toric", "unionfind", sizes=[4, 6], enabled_errors=["pauli"], points=2, iterations=10, rounds=2, output=output
+    )
+    assert len(data) == 8 and crossing["window"] == estimates[1] == pytest.approx((0.05, 0.15))
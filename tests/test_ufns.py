@@ -44,6 +44,48 @@ def test_ufns_sim(size, Code, errors, faulty, max_rate, extra_keys):
         assert True
 
 
+@pytest.mark.parametrize("Code", CODES)
+@pytest.mark.parametrize("faulty, size", [(False, SIZE_PM), (True, SIZE_FM)])
+def test_ufns_erasure(Code, faulty, size):
+    """Test the decoder on erasures that are not reinitialized and measurement errors."""
+    code, decoder = initialize(size, Code, "ufns", enabled_errors=["erasure", "pauli"], faulty_measurements=faulty)
+    error_rates = {"p_erasure": 0.1, "p_bitflip": 0.02, "p_bitflip_plaq": 0.02, "initial_states": (None, None)}
+
+    trivial = 0
+    for _ in range(ITERS):
+        code.random_errors(**error_rates)
+        decoder.decode()
+        trivial += code.trivial_ancillas
+
+    assert trivial == ITERS
+
+
+def test_ufns_node_tree():
+    """Test the parity and delay sweeps and the suspension of nodes of the flattened node-tree on a chain of syndrome-nodes."""
+    from qsurface.decoders.ufns.elements import NodeTree, Syndrome
+    from qsurface.codes.elements import AncillaQubit
+
+    nodes = [Syndrome(AncillaQubit((i, 0), 0)) for i in range(3)]
+    for node, child in zip(nodes, nodes[1:]):
+        node.neighbors.append((child, 1))
+        child.neighbors.append((node, 1))
+
+    node_tree = NodeTree(nodes[0])
+    node_tree.join(nodes[0], nodes[1], 1, pending=True)
+    assert node_tree.nodes == nodes
+    assert node_tree.parents == [-1, 0, 1]
+    assert node_tree.pending == 1
+
+    node_tree.ns_parity()
+    assert [node.parity for node in nodes] == [0, 1, 0]
+    assert node_tree.ns_delay() == 0
+    assert [node.delay for node in nodes] == [0, 1, 0]
+    assert node_tree.pending == len(node_tree)
+
+    assert node_tree.grow() == [nodes[0], nodes[2]]
+    assert node_tree.grow() == [nodes[0], nodes[2], nodes[1]]
+
+
 @pytest.mark.plotting
 @pytest.mark.parametrize(
     "faulty, size",
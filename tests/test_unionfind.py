@@ -65,6 +65,169 @@ def test_unionfind_options(weighted_growth, weighted_union, dynamic_forest):
     assert trivial == ITERS
 
 
+@pytest.mark.parametrize("Code", ["toric", "planar"])
+@pytest.mark.parametrize("errors", get_error_combinations())
+def test_unionfind_frontier_growth(Code, errors):
+    """Test synchronous frontier growth of the unionfind decoder."""
+    code, decoder = initialize(SIZE_PM, Code, "unionfind", enabled_errors=errors, frontier_growth=True)
+    error_keys = get_error_keys(errors)
+    trivial = 0
+    for _ in range(ITERS):
+        error_rates = {key: random.random() * 0.2 for key in error_keys}
+        code.random_errors(**error_rates)
+        decoder.decode()
+        trivial += code.trivial_ancillas
+
+    assert trivial == ITERS
+
+
+def test_unionfind_frontier_growth_round():
+    """Test that the first frontier growth round grows the same edges as growing each cluster separately."""
+    rounds = {}
+    for frontier_growth in [False, True]:
+        code, decoder = initialize(
+            SIZE_PM,
+            "toric",
+            "unionfind",
+            enabled_errors=["pauli"],
+            initial_states=(0, 0),
+            weighted_growth=False,
+            frontier_growth=frontier_growth,
+        )
+        grow = decoder.grow_frontier if frontier_growth else decoder.grow_bucket
+        key = lambda edge: (edge.qubit.loc, edge.state_type)
+        results = rounds[frontier_growth] = []
+
+        def grow_round(bucket, bucket_i, **kwargs):
+            union_list, place_list = grow(bucket, bucket_i, **kwargs)
+            if bucket_i == 0:
+                support = sorted((key(edge), state) for edge, state in decoder.support.items())
+                results.append((support, sorted(key(boundary[1]) for boundary in union_list)))
+            return union_list, place_list
+
+        setattr(decoder, grow.__name__, grow_round)
+        for iteration in range(ITERS):
+            for qubit in code.data_qubits[0].values():
+                qubit.edges["x"].state = qubit.edges["z"].state = False
+            code.rng = iteration_rng(1, iteration)
+            code.random_errors(p_bitflip=0.1)
+            decoder.decode()
+
+    assert rounds[False] == rounds[True]
+
+
+@pytest.mark.parametrize("Code", CODES)
+@pytest.mark.parametrize("errors", get_error_combinations())
+@pytest.mark.parametrize("frontier_growth", [False, True])
+def test_unionfind_edge_weights(Code, errors, frontier_growth):
+    """Test growth with edge lengths derived from space and time error rates."""
+    code, decoder = initialize(
+        SIZE_FM,
+        Code,
+        "unionfind",
+        enabled_errors=errors,
+        faulty_measurements=True,
+        edge_weights=True,
+        frontier_growth=frontier_growth,
+    )
+    error_keys = get_error_keys(errors) + ["p_bitflip_plaq", "p_bitflip_star"]
+    trivial = 0
+    for _ in range(ITERS):
+        error_rates = {key: random.random() * 0.05 for key in error_keys}
+        code.random_errors(**error_rates)
+        decoder.decode()
+        trivial += code.trivial_ancillas
+
+    assert trivial == ITERS
+
+    if "pauli" in errors:
+        decoder.set_edge_lengths(p_bitflip=0.01, p_phaseflip=0.01, p_bitflip_plaq=0.1, p_bitflip_star=0.1)
+        lengths = {edge.edge_type: length for edge, length in decoder.edge_lengths.items()}
+        assert lengths["edge"] > lengths["pseudo"] == decoder.config["edge_resolution"]
+
+
+def test_pauli_edge_probability():
+    """Test that edge probabilities equal the supplied Pauli rates, where rates that are not supplied are zero."""
+    code, _ = initialize(SIZE_PM, "toric", "unionfind", enabled_errors=["pauli"])
+    qubit = next(iter(code.data_qubits[0].values()))
+    assert code.edge_probability(qubit.edges["x"], p_bitflip=0.1) == 0.1
+    assert code.edge_probability(qubit.edges["z"], p_bitflip=0.1) == 0
+
+
+@pytest.mark.parametrize(
+    "Code, sizes",
+    [
+        ("toric", (4, 8)),
+        ("planar", (4, 8)),
+        ("rotated", (3, 7)),
+    ],
+)
+def test_unionfind_faulty_threshold(Code, sizes):
+    """Test the unionfind decoder against the phenomenological noise threshold of ~2.6%.
+
+    Well below the threshold all lattices should decode nearly all errors, well above it the larger lattice should fail more often than the smaller lattice.
+    """
+    iterations = 300
+    for rate, check in [
+        (0.01, lambda small, large: small > 0.9 * iterations and large > 0.9 * iterations),
+        (0.05, lambda small, large: large < small),
+    ]:
+        no_error = []
+        for size in sizes:
+            code, decoder = initialize(size, Code, "unionfind", enabled_errors=["pauli"], faulty_measurements=True)
+            output = run(code, decoder, iterations=iterations, error_rates={"p_bitflip": rate, "p_bitflip_plaq": rate})
+            no_error.append(output["no_error"])
+        assert check(*no_error)
+
+
+@pytest.mark.slow
+def test_unionfind_faulty_threshold_crossing():
+    """Test that the crossing of the success rates of the unionfind decoder under phenomenological noise lies within the known threshold of 2.6-2.9% on the toric lattice."""
+    from qsurface.threshold import run_many, estimate_crossing
+
+    rates = [0.022, 0.026, 0.030, 0.034]
+    data = run_many(
+        "toric",
+        "unionfind",
+        iterations=400,
+        sizes=[4, 8],
+        enabled_errors=["pauli"],
+        error_rates=[{"p_bitflip": rate, "p_bitflip_plaq": rate} for rate in rates],
+        faulty_measurements=True,
+        output="none",
+        coupled=True,
+        seed=12345,
+    )
+    crossing = estimate_crossing(data, "p_bitflip")
+    assert crossing["std"] < 0.003
+    assert 0.026 - 2 * crossing["std"] < crossing["pth"] < 0.029 + 2 * crossing["std"]
+
+
+@pytest.mark.parametrize("decoder_name", ["unionfind", "ufns"])
+def test_unionfind_hooks(decoder_name, tmp_path):
+    """Test that hooks receive the traced events and do not alter the decoding."""
+    from qsurface.decoders._template import TraceFile
+    import json
+
+    events = []
+    trace = TraceFile(tmp_path / "trace.jsonl")
+    code, decoder = initialize(SIZE_PM, "toric", decoder_name, enabled_errors=["pauli"], hooks=[trace])
+    decoder.add_hook(lambda event, *args, **kwargs: events.append(event))
+    assert "grow_bucket" not in initialize(SIZE_PM, "toric", decoder_name)[1].__dict__
+
+    trivial = 0
+    for _ in range(ITERS):
+        code.random_errors(p_bitflip=0.1)
+        decoder.decode()
+        trivial += code.trivial_ancillas
+    trace.close()
+
+    assert trivial == ITERS
+    assert {"grow", "union", "peel", "match"} <= set(events)
+    with open(tmp_path / "trace.jsonl") as file:
+        assert [json.loads(line)["event"] for line in file] == events
+
+
 @pytest.mark.plotting
 @pytest.mark.parametrize(
     "faulty, size",